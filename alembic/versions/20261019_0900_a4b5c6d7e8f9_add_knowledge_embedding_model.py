@@ -0,0 +1,66 @@
+"""add knowledge embedding model tracking
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from src.config import settings
+
+
+revision: str = "a4b5c6d7e8f9"
+down_revision: Union[str, None] = "f3a4b5c6d7e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("knowledge_base", sa.Column("embedding_model", sa.String(length=100), nullable=True))
+    op.add_column("knowledge_base", sa.Column("pending_embedding", Vector(dim=1536), nullable=True))
+    op.add_column("knowledge_base", sa.Column("pending_embedding_model", sa.String(length=100), nullable=True))
+    op.create_index("ix_knowledge_base_embedding_model", "knowledge_base", ["embedding_model"], unique=False)
+    # Existing vectors were indexed with the active prompt config model, or with the
+    # global default when the org never picked one.
+    op.execute(
+        sa.text(
+            """
+            UPDATE knowledge_base kb
+            SET embedding_model = CASE
+                WHEN position('/' in btrim(pc.embedding_model)) > 0 THEN btrim(pc.embedding_model)
+                ELSE 'openai/' || btrim(pc.embedding_model)
+            END
+            FROM prompt_configs pc
+            WHERE pc.org_id = kb.org_id
+              AND pc.is_active IS TRUE
+              AND NULLIF(btrim(pc.embedding_model), '') IS NOT NULL
+              AND kb.embedding IS NOT NULL;
+            """
+        )
+    )
+    default_model = (settings.openrouter_embedding_model or "").strip()
+    if default_model and "/" not in default_model:
+        default_model = f"openai/{default_model}"
+    if default_model:
+        op.execute(
+            sa.text(
+                """
+                UPDATE knowledge_base
+                SET embedding_model = :default_model
+                WHERE embedding_model IS NULL
+                  AND embedding IS NOT NULL;
+                """
+            ).bindparams(default_model=default_model)
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_knowledge_base_embedding_model", table_name="knowledge_base")
+    op.drop_column("knowledge_base", "pending_embedding_model")
+    op.drop_column("knowledge_base", "pending_embedding")
+    op.drop_column("knowledge_base", "embedding_model")
@@ -0,0 +1,94 @@
+"""background jobs partial indexes and archive
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "b5c6d7e8f9a0"
+down_revision: Union[str, None] = "a4b5c6d7e8f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_background_jobs_runnable",
+        "background_jobs",
+        ["run_at", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('queued', 'retry')"),
+    )
+    op.create_index(
+        "ix_background_jobs_running_locked_at",
+        "background_jobs",
+        ["locked_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'running'"),
+    )
+    op.create_index(
+        "ix_background_jobs_finished_at",
+        "background_jobs",
+        ["finished_at"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('done', 'failed')"),
+    )
+    op.drop_index("ix_background_jobs_status_locked_at", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_status_run_at_created_at", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_status", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_run_at", table_name="background_jobs")
+
+    op.create_table(
+        "background_jobs_archive",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("job_type", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_background_jobs_archive_id", "background_jobs_archive", ["id"], unique=True)
+    op.create_index(
+        "ix_background_jobs_archive_finished_at",
+        "background_jobs_archive",
+        ["finished_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_archive_finished_at", table_name="background_jobs_archive")
+    op.drop_index("ix_background_jobs_archive_id", table_name="background_jobs_archive")
+    op.drop_table("background_jobs_archive")
+
+    op.create_index("ix_background_jobs_run_at", "background_jobs", ["run_at"], unique=False)
+    op.create_index("ix_background_jobs_status", "background_jobs", ["status"], unique=False)
+    op.create_index(
+        "ix_background_jobs_status_run_at_created_at",
+        "background_jobs",
+        ["status", "run_at", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_background_jobs_status_locked_at",
+        "background_jobs",
+        ["status", "locked_at"],
+        unique=False,
+    )
+    op.drop_index("ix_background_jobs_finished_at", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_running_locked_at", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_runnable", table_name="background_jobs")
@@ -0,0 +1,35 @@
+"""add background job dedup key
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c6d7e8f9a0b1"
+down_revision: Union[str, None] = "b5c6d7e8f9a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("background_jobs", sa.Column("dedup_key", sa.String(length=255), nullable=True))
+    op.add_column("background_jobs_archive", sa.Column("dedup_key", sa.String(length=255), nullable=True))
+    op.create_index(
+        "ux_background_jobs_dedup_key",
+        "background_jobs",
+        ["dedup_key"],
+        unique=True,
+        postgresql_where=sa.text("dedup_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_background_jobs_dedup_key", table_name="background_jobs")
+    op.drop_column("background_jobs_archive", "dedup_key")
+    op.drop_column("background_jobs", "dedup_key")
@@ -0,0 +1,60 @@
+"""denormalize lead last message direction and sender
+
+Revision ID: e8f9a0b1c2d3
+Revises: d7e8f9a0b1c2
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "e8f9a0b1c2d3"
+down_revision: Union[str, None] = "d7e8f9a0b1c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "leads",
+        sa.Column(
+            "last_message_direction",
+            postgresql.ENUM("INBOUND", "OUTBOUND", name="message_direction", create_type=False),
+            nullable=True,
+        ),
+    )
+    op.add_column("leads", sa.Column("last_message_sender_name", sa.String(length=255), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE leads l
+            SET last_message_direction = m.direction,
+                last_message_sender_name = m.sender_name
+            FROM (
+                SELECT DISTINCT ON (lead_id) lead_id, direction, sender_name
+                FROM chat_messages
+                ORDER BY lead_id, created_at DESC, id DESC
+            ) m
+            WHERE m.lead_id = l.id;
+            """
+        )
+    )
+    op.create_index(
+        "ix_leads_followup_candidates",
+        "leads",
+        ["last_message_at"],
+        unique=False,
+        postgresql_where=sa.text(
+            "last_message_direction = 'OUTBOUND' AND telegram_id IS NOT NULL AND followup_count < 3"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_followup_candidates", table_name="leads")
+    op.drop_column("leads", "last_message_sender_name")
+    op.drop_column("leads", "last_message_direction")
@@ -0,0 +1,76 @@
+"""add keyset pagination indexes
+
+Revision ID: f9a0b1c2d3e4
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f9a0b1c2d3e4"
+down_revision: Union[str, None] = "e8f9a0b1c2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lead lists sort by last_message_at DESC NULLS LAST, id DESC. A backward scan of an
+    # ascending index yields NULLS FIRST, so the direction is spelled out.
+    op.create_index(
+        "ix_leads_org_last_message_at_id",
+        "leads",
+        ["org_id", sa.text("last_message_at DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_leads_org_status_last_message_at_id",
+        "leads",
+        ["org_id", "status", sa.text("last_message_at DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.drop_index("ix_leads_org_status_last_message_at", table_name="leads")
+
+    # created_at is never NULL, so plain ascending indexes serve the DESC keyset backwards.
+    op.create_index(
+        "ix_chat_messages_lead_created_at_id",
+        "chat_messages",
+        ["lead_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_chat_messages_lead_id_created_at", table_name="chat_messages")
+    op.create_index(
+        "ix_chat_messages_lead_transport_created_at_id",
+        "chat_messages",
+        ["lead_id", "transport", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_chat_messages_lead_transport_created_at", table_name="chat_messages")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_chat_messages_lead_transport_created_at",
+        "chat_messages",
+        ["lead_id", "transport", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_chat_messages_lead_transport_created_at_id", table_name="chat_messages")
+    op.create_index(
+        "ix_chat_messages_lead_id_created_at",
+        "chat_messages",
+        ["lead_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_chat_messages_lead_created_at_id", table_name="chat_messages")
+    op.create_index(
+        "ix_leads_org_status_last_message_at",
+        "leads",
+        ["org_id", "status", "last_message_at"],
+        unique=False,
+    )
+    op.drop_index("ix_leads_org_status_last_message_at_id", table_name="leads")
+    op.drop_index("ix_leads_org_last_message_at_id", table_name="leads")
@@ -0,0 +1,71 @@
+"""add lead phone digits
+
+Revision ID: a0b1c2d3e4f5
+Revises: f9a0b1c2d3e4
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a0b1c2d3e4f5"
+down_revision: Union[str, None] = "f9a0b1c2d3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same expression as src.models.lead.PHONE_DIGITS_SQL at the time of this revision.
+PHONE_DIGITS_SQL = r"""
+CASE
+    WHEN length(regexp_replace(phone, '\D', '', 'g')) = 11
+         AND left(regexp_replace(phone, '\D', '', 'g'), 1) = '8'
+        THEN '7' || substr(regexp_replace(phone, '\D', '', 'g'), 2)
+    WHEN length(regexp_replace(phone, '\D', '', 'g')) = 10
+        THEN '7' || regexp_replace(phone, '\D', '', 'g')
+    ELSE NULLIF(regexp_replace(phone, '\D', '', 'g'), '')
+END
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "leads",
+        sa.Column("phone_digits", sa.String(length=20), sa.Computed(PHONE_DIGITS_SQL, persisted=True), nullable=True),
+    )
+    op.create_index("ix_leads_org_phone_digits", "leads", ["org_id", "phone_digits"], unique=False)
+    op.create_index(
+        "ix_leads_org_phone_tail",
+        "leads",
+        ["org_id", sa.text("right(phone_digits, 10)")],
+        unique=False,
+    )
+    # Operator search matches digit fragments against phone_digits, so the trigram index
+    # moves off the formatted phone column.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_leads_phone_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_leads_phone_digits_trgm "
+        "ON leads USING gin (phone_digits gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_leads_full_name_trgm "
+        "ON leads USING gin (full_name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_leads_username_trgm "
+        "ON leads USING gin (username gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_leads_phone_digits_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_leads_phone_trgm "
+        "ON leads USING gin (phone gin_trgm_ops)"
+    )
+    op.drop_index("ix_leads_org_phone_tail", table_name="leads")
+    op.drop_index("ix_leads_org_phone_digits", table_name="leads")
+    op.drop_column("leads", "phone_digits")
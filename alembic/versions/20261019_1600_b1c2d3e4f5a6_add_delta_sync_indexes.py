@@ -0,0 +1,36 @@
+"""add delta sync indexes
+
+Revision ID: b1c2d3e4f5a6
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "b1c2d3e4f5a6"
+down_revision: Union[str, None] = "a0b1c2d3e4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_leads_org_updated_at_id",
+        "leads",
+        ["org_id", "updated_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_chat_messages_lead_updated_at_id",
+        "chat_messages",
+        ["lead_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_lead_updated_at_id", table_name="chat_messages")
+    op.drop_index("ix_leads_org_updated_at_id", table_name="leads")
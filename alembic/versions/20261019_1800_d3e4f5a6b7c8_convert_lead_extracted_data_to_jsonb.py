@@ -0,0 +1,126 @@
+"""convert lead extracted_data to jsonb
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "d3e4f5a6b7c8"
+down_revision: Union[str, None] = "c2d3e4f5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Kept in sync with the expressions in src/models/lead.py
+GENERATED_COLUMNS = (
+    ("do_not_contact", sa.Boolean(), "COALESCE(extracted_data -> 'do_not_contact' = 'true'::jsonb, false)"),
+    ("quiz_session_token", sa.Text(), "extracted_data #>> '{quiz_session_token}'"),
+    ("telegram_business_chat_id", sa.Text(), "extracted_data #>> '{telegram_business_chat,chat_id}'"),
+    ("measurement_start", sa.Text(), "extracted_data #>> '{measurement,start}'"),
+    ("measurement_booking_uid", sa.Text(), "extracted_data #>> '{measurement,booking_uid}'"),
+    ("estimate_requested_at", sa.Text(), "extracted_data #>> '{estimate_request,requested_at}'"),
+    (
+        "estimate_prepared_at",
+        sa.Text(),
+        "COALESCE(extracted_data #>> '{estimate_request,prepared_at}', "
+        "extracted_data #>> '{estimate_request,final_uploaded_at}')",
+    ),
+    (
+        "estimate_duration_minutes",
+        sa.Numeric(),
+        "CASE WHEN jsonb_typeof(extracted_data #> '{estimate_request,duration_minutes}') = 'number' "
+        "THEN (extracted_data #> '{estimate_request,duration_minutes}')::text::numeric END",
+    ),
+    (
+        "estimate_sla_hours",
+        sa.Numeric(),
+        "CASE WHEN jsonb_typeof(extracted_data #> '{estimate_request,sla_hours}') = 'number' "
+        "THEN (extracted_data #> '{estimate_request,sla_hours}')::text::numeric END",
+    ),
+    (
+        "estimate_sla_met",
+        sa.Boolean(),
+        "CASE WHEN jsonb_typeof(extracted_data #> '{estimate_request,sla_met}') = 'boolean' "
+        "THEN (extracted_data #>> '{estimate_request,sla_met}')::boolean END",
+    ),
+)
+
+
+def upgrade() -> None:
+    # Blank values become NULL; text that is not valid JSON is kept as a JSON string
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.extracted_data_to_jsonb(value text) RETURNS jsonb AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN to_jsonb(value);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+        """
+    )
+    op.alter_column(
+        "leads",
+        "extracted_data",
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        postgresql_using="pg_temp.extracted_data_to_jsonb(extracted_data)",
+    )
+    op.execute("DROP FUNCTION pg_temp.extracted_data_to_jsonb(text)")
+
+    for name, type_, expression in GENERATED_COLUMNS:
+        op.add_column("leads", sa.Column(name, type_, sa.Computed(expression, persisted=True)))
+
+    op.create_index(
+        "ix_leads_extracted_data_gin",
+        "leads",
+        ["extracted_data"],
+        postgresql_using="gin",
+        postgresql_ops={"extracted_data": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "ix_leads_org_quiz_session_token",
+        "leads",
+        ["org_id", "quiz_session_token"],
+        postgresql_where=sa.text("quiz_session_token IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_leads_org_telegram_business_chat_id",
+        "leads",
+        ["org_id", "telegram_business_chat_id"],
+        postgresql_where=sa.text("telegram_business_chat_id IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_leads_org_estimate_requested_at",
+        "leads",
+        ["org_id"],
+        postgresql_where=sa.text("estimate_requested_at IS NOT NULL OR estimate_duration_minutes IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_org_estimate_requested_at", table_name="leads")
+    op.drop_index("ix_leads_org_telegram_business_chat_id", table_name="leads")
+    op.drop_index("ix_leads_org_quiz_session_token", table_name="leads")
+    op.drop_index("ix_leads_extracted_data_gin", table_name="leads")
+    for name, _type, _expression in reversed(GENERATED_COLUMNS):
+        op.drop_column("leads", name)
+    op.alter_column(
+        "leads",
+        "extracted_data",
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="extracted_data::text",
+    )
@@ -0,0 +1,99 @@
+"""add funnel daily rollups
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "e4f5a6b7c8d9"
+down_revision: Union[str, None] = "d3e4f5a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "funnel_daily_sessions",
+        *_base_columns(),
+        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=True),
+        sa.Column("campaign", sa.String(length=255), nullable=True),
+        sa.Column("channel", sa.String(length=50), nullable=True),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("abandoned", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_funnel_daily_sessions_id", "funnel_daily_sessions", ["id"], unique=True)
+    op.create_index("ix_funnel_daily_sessions_day", "funnel_daily_sessions", ["day"], unique=False)
+    op.create_index("ix_funnel_daily_sessions_org_day", "funnel_daily_sessions", ["org_id", "day"], unique=False)
+
+    op.create_table(
+        "funnel_daily_metrics",
+        *_base_columns(),
+        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("session_day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=True),
+        sa.Column("campaign", sa.String(length=255), nullable=True),
+        sa.Column("channel", sa.String(length=50), nullable=True),
+        sa.Column("metric", sa.String(length=100), nullable=False),
+        sa.Column("step_id", sa.String(length=100), nullable=True),
+        sa.Column("value", sa.Text(), nullable=True),
+        sa.Column("label", sa.Text(), nullable=True),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.Column("events", sa.Integer(), nullable=False),
+        sa.Column("time_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("time_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_funnel_daily_metrics_id", "funnel_daily_metrics", ["id"], unique=True)
+    op.create_index("ix_funnel_daily_metrics_day", "funnel_daily_metrics", ["day"], unique=False)
+    op.create_index(
+        "ix_funnel_daily_metrics_org_day",
+        "funnel_daily_metrics",
+        ["org_id", "day", "session_day"],
+        unique=False,
+    )
+
+    op.create_table(
+        "funnel_rollup_days",
+        *_base_columns(),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("day"),
+    )
+    op.create_index("ix_funnel_rollup_days_id", "funnel_rollup_days", ["id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_funnel_rollup_days_id", table_name="funnel_rollup_days")
+    op.drop_table("funnel_rollup_days")
+
+    op.drop_index("ix_funnel_daily_metrics_org_day", table_name="funnel_daily_metrics")
+    op.drop_index("ix_funnel_daily_metrics_day", table_name="funnel_daily_metrics")
+    op.drop_index("ix_funnel_daily_metrics_id", table_name="funnel_daily_metrics")
+    op.drop_table("funnel_daily_metrics")
+
+    op.drop_index("ix_funnel_daily_sessions_org_day", table_name="funnel_daily_sessions")
+    op.drop_index("ix_funnel_daily_sessions_day", table_name="funnel_daily_sessions")
+    op.drop_index("ix_funnel_daily_sessions_id", table_name="funnel_daily_sessions")
+    op.drop_table("funnel_daily_sessions")
@@ -0,0 +1,130 @@
+"""Shared fakes for service tests that run without Postgres."""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import Function
+
+
+class FakeResult:
+    """Rows of one statement, behind the Result accessors the services use."""
+
+    def __init__(self, rows=(), rowcount=0):
+        self._rows = list(rows)
+        self.rowcount = rowcount
+
+    def scalars(self):
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def one(self):
+        return self._rows[0]
+
+    def scalar_one(self):
+        return self._rows[0]
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class RecordingSession:
+    """AsyncSession stand-in: records each statement as Postgres SQL and answers from a queue.
+
+    Queued items are row lists or FakeResults; once the queue is empty `respond(statement,
+    params)` answers, or an empty result.
+    """
+
+    Result = FakeResult
+
+    def __init__(self, *results, respond=None):
+        self.statements = []
+        self.executed = []
+        self.params = []
+        self.commits = 0
+        self._results = list(results)
+        self._respond = respond
+
+    async def execute(self, statement, params=None):
+        self.executed.append(statement)
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        self.params.append(params)
+        if self._results:
+            result = self._results.pop(0)
+        elif self._respond is not None:
+            result = self._respond(statement, params)
+        else:
+            result = []
+        return result if isinstance(result, FakeResult) else FakeResult(result)
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def recording_session():
+    """Factory: `recording_session(*results, respond=None)` builds a RecordingSession."""
+    return RecordingSession
+
+
+@compiles(Function, "sqlite")
+def _sqlite_function(element, compiler, **kw):
+    # LEFT is a keyword in SQLite
+    if element.name.lower() == "left":
+        return "substr(%s, 1, %s)" % tuple(compiler.process(arg, **kw) for arg in element.clauses)
+    return compiler.visit_function(element, **kw)
+
+
+class SqliteSession:
+    """Async facade over a synchronous SQLite ORM session, for running real list queries."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement, params=None):
+        if params is None:
+            return self.session.execute(statement)
+        return self.session.execute(statement, params)
+
+
+@pytest.fixture
+def leads_db():
+    """In-memory SQLite with an untyped `leads` table and a `insert_leads(*rows)` helper.
+
+    Keyset and board queries run on it as written, so tests can assert on the rows they
+    return rather than on SQL text.
+    """
+    from src.models import Lead
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE leads (%s)" % ", ".join(column.name for column in Lead.__table__.columns)))
+
+    with Session(engine) as session:
+        db = SqliteSession(session)
+
+        def insert_leads(*rows):
+            defaults = {"status": "NEW", "telegram_lookup_status": "not_checked", "unread_count": 0, "followup_count": 0}
+            ids = []
+            for row in rows:
+                values = {"id": uuid.uuid4(), **defaults, **row}
+                session.execute(Lead.__table__.insert().values(**values))
+                ids.append(values["id"])
+            return ids
+
+        db.insert_leads = insert_leads
+        yield db
+    engine.dispose()
@@ -1,4 +1,4 @@
-import { MessageDirection, MessageTransport, type ChatMessage, type Lead } from '@/types'
+import { MessageDirection, MessageTransport, type ChatMessage, type Lead, type LeadBoardCard } from '@/types'
 
 export type MessengerPresence = {
     telegram: boolean
@@ -15,9 +15,9 @@ export function getLeadExtractedData(lead: Lead): Record<string, any> {
     }
 }
 
-export function getMessengerPresence(lead: Lead): MessengerPresence {
-    const parsed = getLeadExtractedData(lead)
-    const messengers = parsed?.messengers || {}
+export function getMessengerPresence(lead: Lead | LeadBoardCard): MessengerPresence {
+    // Board cards carry the messenger flags instead of extracted_data
+    const messengers = 'messengers' in lead ? lead.messengers : (getLeadExtractedData(lead)?.messengers || {})
     return {
         telegram: Boolean(messengers.telegram),
         whatsapp: Boolean(messengers.whatsapp),
@@ -95,7 +95,7 @@ function normalizePhoneDigits(phone?: string | null): string | null {
     return digitsOnly.length >= 10 ? digitsOnly : null
 }
 
-export function getTelegramChatUrl(lead: Lead): string | null {
+export function getTelegramChatUrl(lead: Lead | LeadBoardCard): string | null {
     const username = String(lead.username || '').replace(/^@/, '').trim()
     if (username) return `https://t.me/${username}`
 
@@ -104,9 +104,9 @@ export function getTelegramChatUrl(lead: Lead): string | null {
     return null
 }
 
-export function getWhatsAppChatUrl(lead: Lead): string | null {
-    const extracted = getLeadExtractedData(lead)
-    const waId = String(extracted?.whatsapp_wa_id || '').replace(/\D/g, '')
+export function getWhatsAppChatUrl(lead: Lead | LeadBoardCard): string | null {
+    const rawWaId = 'messengers' in lead ? lead.whatsapp_wa_id : getLeadExtractedData(lead)?.whatsapp_wa_id
+    const waId = String(rawWaId || '').replace(/\D/g, '')
     const phoneDigits = normalizePhoneDigits(lead.phone)
     const target = waId || phoneDigits
     if (!target) return null
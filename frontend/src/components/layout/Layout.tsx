@@ -2,12 +2,15 @@ import React from 'react'
 import { Outlet } from 'react-router-dom'
 import { Sidebar } from './Sidebar'
 import { Header } from './Header'
+import { useCrmEvents } from '@/hooks/useCrmEvents'
 
 interface LayoutProps {
     title: string
 }
 
 export function Layout({ title }: LayoutProps) {
+    useCrmEvents()
+
     return (
         <div className="flex h-screen overflow-hidden">
             <Sidebar />
@@ -41,7 +41,9 @@ export function useAI() {
     const knowledge = useQuery({
         queryKey: ['ai', 'knowledge'],
         queryFn: async () => {
-            const { data } = await api.get<KnowledgeItemResponse[]>('/ai/knowledge')
+            const { data } = await api.get<KnowledgeItemResponse[]>('/ai/knowledge', {
+                params: { fields: 'title,category,content,created_at' },
+            })
             return data
         }
     })
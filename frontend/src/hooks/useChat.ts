@@ -1,13 +1,14 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { chatAPI } from '@/lib/api'
+import { pollInterval } from '@/hooks/useCrmEvents'
 import type { MessageTransport, SendChatMessagePayload } from '@/types'
 
 export function useChatHistory(leadId: string, page = 1, transport?: MessageTransport) {
     return useQuery({
         queryKey: ['chat', leadId, page, transport],
-        queryFn: () => chatAPI.getHistory(leadId, page, 50, transport),
+        queryFn: () => chatAPI.getHistory(leadId, page, 50, transport, undefined, false),
         enabled: !!leadId,
-        refetchInterval: 3000, // Poll every 3 seconds for real-time updates
+        refetchInterval: pollInterval(3000), // Pushed via /events/stream; polling is the fallback
     })
 }
 
@@ -50,6 +51,6 @@ export function useUnreadCount() {
     return useQuery({
         queryKey: ['unread-count'],
         queryFn: () => chatAPI.getUnreadCount(),
-        refetchInterval: 30000, // Refetch every 30 seconds
+        refetchInterval: pollInterval(30000),
     })
 }
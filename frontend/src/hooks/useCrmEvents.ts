@@ -0,0 +1,100 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { eventsAPI } from '@/lib/api'
+
+type CrmEvent = {
+    type: string
+    lead_id?: string
+}
+
+let streamConnected = false
+
+// Polling hooks slow down to a safety interval while the push stream is up
+export function pollInterval(fallbackMs: number, connectedMs = 60000) {
+    return () => (streamConnected ? connectedMs : fallbackMs)
+}
+
+function parseEvents(buffer: string): { events: CrmEvent[]; rest: string } {
+    const events: CrmEvent[] = []
+    const blocks = buffer.split('\n\n')
+    const rest = blocks.pop() ?? ''
+    for (const block of blocks) {
+        const data = block
+            .split('\n')
+            .filter((line) => line.startsWith('data:'))
+            .map((line) => line.slice(5).trim())
+            .join('\n')
+        if (!data) continue
+        try {
+            events.push(JSON.parse(data))
+        } catch {
+            // Ignore malformed frames; the next resync catches up
+        }
+    }
+    return { events, rest }
+}
+
+export function useCrmEvents() {
+    const queryClient = useQueryClient()
+
+    useEffect(() => {
+        const controller = new AbortController()
+        let retryMs = 1000
+
+        const handle = (event: CrmEvent) => {
+            switch (event.type) {
+                case 'message.created':
+                    queryClient.invalidateQueries({ queryKey: ['chat', event.lead_id] })
+                    queryClient.invalidateQueries({ queryKey: ['leads'] })
+                    queryClient.invalidateQueries({ queryKey: ['leads-infinite'] })
+                    break
+                case 'lead.updated':
+                case 'lead.deleted':
+                    queryClient.invalidateQueries({ queryKey: ['leads'] })
+                    queryClient.invalidateQueries({ queryKey: ['leads-infinite'] })
+                    queryClient.invalidateQueries({ queryKey: ['lead', event.lead_id] })
+                    break
+                case 'unread.changed':
+                    queryClient.invalidateQueries({ queryKey: ['unread-count'] })
+                    queryClient.invalidateQueries({ queryKey: ['leads'] })
+                    queryClient.invalidateQueries({ queryKey: ['leads-infinite'] })
+                    break
+                case 'resync':
+                    queryClient.invalidateQueries()
+                    break
+            }
+        }
+
+        const run = async () => {
+            while (!controller.signal.aborted) {
+                try {
+                    const response = await eventsAPI.openStream(controller.signal)
+                    if (!response.ok || !response.body) throw new Error(`stream status ${response.status}`)
+                    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+                    let buffer = ''
+                    streamConnected = true
+                    retryMs = 1000
+                    // Anything that changed while disconnected is refetched once
+                    queryClient.invalidateQueries()
+                    for (;;) {
+                        const { value, done } = await reader.read()
+                        if (done) break
+                        const parsed = parseEvents(buffer + value)
+                        buffer = parsed.rest
+                        parsed.events.forEach(handle)
+                    }
+                } catch {
+                    // Reconnect below unless the component unmounted
+                } finally {
+                    streamConnected = false
+                }
+                if (controller.signal.aborted) break
+                await new Promise((resolve) => setTimeout(resolve, retryMs))
+                retryMs = Math.min(retryMs * 2, 30000)
+            }
+        }
+
+        run()
+        return () => controller.abort()
+    }, [queryClient])
+}
@@ -1,8 +1,9 @@
 import { useQuery, useMutation, useQueryClient, useInfiniteQuery } from '@tanstack/react-query'
 import { leadsAPI } from '@/lib/api'
+import { pollInterval } from '@/hooks/useCrmEvents'
 import type { Lead, LeadStatus } from '@/types'
 
-type LeadsQueryParams = { status?: LeadStatus; source?: string; search?: string; created_since_hours?: number; page?: number; page_size?: number }
+type LeadsQueryParams = { status?: LeadStatus; source?: string; search?: string; created_since_hours?: number; page?: number; page_size?: number; cursor?: string; include_total?: boolean }
 
 function invalidateLeadQueries(queryClient: ReturnType<typeof useQueryClient>) {
     queryClient.invalidateQueries({ queryKey: ['leads'] })
@@ -13,26 +14,34 @@ export function useLeads(params?: LeadsQueryParams) {
     return useQuery({
         queryKey: ['leads', params],
         queryFn: () => leadsAPI.getAll(params),
-        refetchInterval: 10000, // Poll every 10 seconds for new leads/unread counts
+        refetchInterval: pollInterval(10000), // Pushed via /events/stream; polling is the fallback
     })
 }
 
-export function useLeadsInfinite(params?: Omit<LeadsQueryParams, 'page'>) {
+export function useLeadsInfinite(params?: Omit<LeadsQueryParams, 'page' | 'cursor' | 'include_total'>) {
     return useInfiniteQuery({
         queryKey: ['leads-infinite', params],
+        // Pages after the first continue from the previous page's cursor and skip the
+        // exact count, so polling deep pages costs the same as the first one.
         queryFn: ({ pageParam }) =>
             leadsAPI.getAll({
                 ...params,
-                page: Number(pageParam),
+                cursor: pageParam ?? undefined,
+                include_total: !pageParam,
                 page_size: params?.page_size,
             }),
-        refetchInterval: 5000, // Keep kanban in near real-time without manual refresh
-        initialPageParam: 1,
-        getNextPageParam: (lastPage) => {
-            const loaded = lastPage.page * lastPage.page_size
-            if (loaded >= lastPage.total) return undefined
-            return lastPage.page + 1
-        },
+        refetchInterval: pollInterval(5000), // Pushed via /events/stream; polling is the fallback
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    })
+}
+
+export function useLeadBoard(params?: { source?: string; search?: string; created_since_hours?: number; per_status?: number }) {
+    return useQuery({
+        // Under ['leads'] so every lead invalidation refreshes the board too
+        queryKey: ['leads', 'board', params],
+        queryFn: () => leadsAPI.getBoard(params),
+        refetchInterval: pollInterval(5000), // Pushed via /events/stream; polling is the fallback
     })
 }
 
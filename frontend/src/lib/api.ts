@@ -2,6 +2,7 @@ import axios, { type AxiosError, type InternalAxiosRequestConfig } from 'axios'
 import axiosRetry from 'axios-retry'
 import type {
     Lead,
+    LeadBoardResponse,
     ChatMessage,
     DashboardMetrics,
     TokenResponse,
@@ -170,8 +171,14 @@ export const authAPI = {
 }
 
 export const leadsAPI = {
-    getAll: async (params?: { status?: string; source?: string; search?: string; created_since_hours?: number; page?: number; page_size?: number }) => {
-        const response = await api.get<{ leads: Lead[]; total: number; page: number; page_size: number }>('/leads/', { params })
+    // `fields` (comma separated) returns only those lead fields plus id and last_message_at
+    getAll: async (params?: { status?: string; source?: string; search?: string; created_since_hours?: number; page?: number; page_size?: number; cursor?: string; include_total?: boolean; fields?: string }) => {
+        const response = await api.get<{ leads: Lead[]; total: number | null; page: number; page_size: number; next_cursor: string | null }>('/leads/', { params })
+        return response.data
+    },
+
+    getBoard: async (params?: { source?: string; search?: string; created_since_hours?: number; per_status?: number }): Promise<LeadBoardResponse> => {
+        const response = await api.get<LeadBoardResponse>('/leads/board', { params })
         return response.data
     },
 
@@ -237,10 +244,10 @@ export const leadsAPI = {
 }
 
 export const chatAPI = {
-    getHistory: async (leadId: string, page = 1, pageSize = 50, transport?: MessageTransport) => {
-        const response = await api.get<{ messages: ChatMessage[]; total: number; page: number; page_size: number }>(
+    getHistory: async (leadId: string, page = 1, pageSize = 50, transport?: MessageTransport, cursor?: string, includeTotal = true) => {
+        const response = await api.get<{ messages: ChatMessage[]; total: number | null; page: number; page_size: number; next_cursor: string | null }>(
             `/chat/${leadId}/history`,
-            { params: { page, page_size: pageSize, transport } }
+            { params: { page, page_size: pageSize, transport, cursor, include_total: includeTotal } }
         )
         return response.data
     },
@@ -284,4 +291,22 @@ export const analyticsAPI = {
     },
 }
 
+export const eventsAPI = {
+    // EventSource cannot send the Authorization header, so the SSE stream is read with fetch
+    openStream: async (signal: AbortSignal): Promise<Response> => {
+        const request = () =>
+            fetch(`${api.defaults.baseURL}/events/stream`, {
+                headers: {
+                    Accept: 'text/event-stream',
+                    Authorization: `Bearer ${localStorage.getItem('access_token') ?? ''}`,
+                },
+                signal,
+            })
+        const response = await request()
+        if (response.status !== 401) return response
+        await refreshStoredToken()
+        return request()
+    },
+}
+
 export default api
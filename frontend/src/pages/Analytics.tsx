@@ -27,6 +27,8 @@ export function Analytics() {
             } else {
                 from.setDate(from.getDate() - Number(period.replace('d', '')))
             }
+            // Whole minutes, so viewers share the server's cached summary
+            from.setSeconds(0, 0)
             next.date_from = from.toISOString()
         }
         if (source.trim()) next.source = source.trim()
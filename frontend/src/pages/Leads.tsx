@@ -1,9 +1,11 @@
 import React, { useState, useEffect, useRef, useMemo } from 'react'
-import { useLeadsInfinite, useLeadHistory, useUpdateLead, useDeleteLead, useCreateLead, useImportLeads, useBulkDeleteLeads, useUploadFinalEstimate, useSendFinalEstimate } from '@/hooks/useLeads'
+import { useLeadBoard, useLeadHistory, useUpdateLead, useDeleteLead, useCreateLead, useImportLeads, useBulkDeleteLeads, useUploadFinalEstimate, useSendFinalEstimate } from '@/hooks/useLeads'
 import { useChatHistory, useSendBusinessCard, useSendMessage, useUploadChatMedia } from '@/hooks/useChat'
 import { useCustomFields } from '@/hooks/useCustomFields'
 import { useConvertLeadToProject } from '@/hooks/useProjects'
-import { LeadStatus, MessageTransport, type Lead } from '@/types'
+import { useQueryClient } from '@tanstack/react-query'
+import { leadsAPI } from '@/lib/api'
+import { LeadStatus, MessageTransport, type Lead, type LeadBoardCard } from '@/types'
 import { ChatComposer } from '@/components/chat/ChatComposer'
 import { ChatMessageList } from '@/components/chat/ChatMessageList'
 import { formatTimeAgo } from '@/lib/utils'
@@ -94,31 +96,37 @@ function getTelegramLookupBadgeClass(status: string) {
     return 'bg-muted text-muted-foreground'
 }
 
-const LEADS_PAGE_SIZE = 100
+const BOARD_CARDS_PER_STATUS = 20
+const COLUMN_PAGE_SIZE = 50
+// Lead fields a card renders; column pages past the board request only these
+const CARD_FIELDS = 'status,full_name,username,phone,telegram_id,avatar_url,source,ai_summary,readiness_score,telegram_lookup_status,telegram_lookup_error,unread_count,extracted_data'
+
+type BoardLead = LeadBoardCard | Lead
+
+// Cards loaded past the board's first page; `after` is the board cursor they continue
+type ColumnPages = { after: string; leads: Lead[]; nextCursor: string | null }
 
 export function Leads() {
     const [search, setSearch] = useState('')
     const [source, setSource] = useState<string>('')
     const [createdSinceHours, setCreatedSinceHours] = useState<number | undefined>()
     const [visibleStages, setVisibleStages] = useState<LeadStatus[]>(columns.map(c => c.id))
-    const {
-        data,
-        hasNextPage,
-        isFetchingNextPage,
-        fetchNextPage,
-    } = useLeadsInfinite({
+    const boardFilters = {
         search: search || undefined,
         source: source || undefined,
         created_since_hours: createdSinceHours,
-        page_size: LEADS_PAGE_SIZE,
-    })
+    }
+    const { data: board } = useLeadBoard({ ...boardFilters, per_status: BOARD_CARDS_PER_STATUS })
+    const queryClient = useQueryClient()
+    const [columnPages, setColumnPages] = useState<Partial<Record<LeadStatus, ColumnPages>>>({})
+    const [loadingColumns, setLoadingColumns] = useState<LeadStatus[]>([])
     const { data: customFields } = useCustomFields(true)
     const updateLead = useUpdateLead()
     const createLead = useCreateLead()
     const importLeads = useImportLeads()
     const bulkDeleteLeads = useBulkDeleteLeads()
     const convertLead = useConvertLeadToProject()
-    const [draggedLead, setDraggedLead] = useState<Lead | null>(null)
+    const [draggedLead, setDraggedLead] = useState<BoardLead | null>(null)
     const [selectedLead, setSelectedLead] = useState<Lead | null>(null)
     const [showStageFilters, setShowStageFilters] = useState(false)
     const [showCreateModal, setShowCreateModal] = useState(false)
@@ -128,36 +136,95 @@ export function Leads() {
     const [draggedOverColumn, setDraggedOverColumn] = useState<LeadStatus | null>(null)
     const [notification, setNotification] = useState<{ message: string, type: 'success' | 'error' } | null>(null)
 
-    const allLoadedLeads = data?.pages.flatMap((pageData) => pageData.leads) || []
-    const leads = useMemo(() => {
-        const unique = new Map<string, Lead>()
-        for (const lead of allLoadedLeads) {
-            if (!unique.has(lead.id)) {
+    useEffect(() => {
+        setColumnPages({})
+    }, [search, source, createdSinceHours])
+
+    const boardColumns = useMemo(
+        () => new Map((board?.columns || []).map((column) => [column.status, column])),
+        [board],
+    )
+
+    // Extra pages only extend the board while it still ends where they started
+    const getColumnPages = (status: LeadStatus) => {
+        const pages = columnPages[status]
+        const boardCursor = boardColumns.get(status)?.next_cursor
+        return pages && boardCursor && pages.after === boardCursor ? pages : undefined
+    }
+
+    const getLeadsByStatus = (status: LeadStatus): BoardLead[] => {
+        const unique = new Map<string, BoardLead>()
+        const loaded = [...(boardColumns.get(status)?.leads || []), ...(getColumnPages(status)?.leads || [])]
+        for (const lead of loaded) {
+            if (!unique.has(lead.id) && lead.status === status) {
                 unique.set(lead.id, lead)
             }
         }
         return Array.from(unique.values())
-    }, [allLoadedLeads])
+    }
+
+    const leads = useMemo(
+        () => columns.flatMap((column) => getLeadsByStatus(column.id)),
+        [boardColumns, columnPages],
+    )
 
-    const totalLeads = data?.pages?.[0]?.total || 0
+    const totalLeads = board?.total || 0
     const loadedLeadsCount = leads.length
     const selectedCount = selectedLeadIds.length
     const isAllLoadedSelected = loadedLeadsCount > 0 && leads.every((lead) => selectedLeadIds.includes(lead.id))
 
-    const getLeadsByStatus = (status: LeadStatus) => {
-        return leads.filter((lead) => lead.status === status)
+    const getColumnNextCursor = (status: LeadStatus) => {
+        const pages = getColumnPages(status)
+        return pages ? pages.nextCursor : boardColumns.get(status)?.next_cursor || null
     }
 
-    const loadMoreLeads = () => {
-        if (!hasNextPage || isFetchingNextPage) return
-        fetchNextPage()
+    const loadMoreColumn = async (status: LeadStatus) => {
+        const after = boardColumns.get(status)?.next_cursor
+        const cursor = getColumnNextCursor(status)
+        if (!after || !cursor || loadingColumns.includes(status)) return
+        setLoadingColumns(prev => [...prev, status])
+        try {
+            const page = await leadsAPI.getAll({
+                ...boardFilters,
+                status,
+                cursor,
+                page_size: COLUMN_PAGE_SIZE,
+                include_total: false,
+                fields: CARD_FIELDS,
+            })
+            setColumnPages(prev => {
+                const current = prev[status]?.after === after ? prev[status] : undefined
+                return {
+                    ...prev,
+                    [status]: { after, leads: [...(current?.leads || []), ...page.leads], nextCursor: page.next_cursor },
+                }
+            })
+        } finally {
+            setLoadingColumns(prev => prev.filter(s => s !== status))
+        }
     }
 
-    const handleColumnScroll = (event: React.UIEvent<HTMLDivElement>) => {
+    const handleColumnScroll = (event: React.UIEvent<HTMLDivElement>, status: LeadStatus) => {
         const element = event.currentTarget
         const nearBottom = element.scrollTop + element.clientHeight >= element.scrollHeight - 200
         if (nearBottom) {
-            loadMoreLeads()
+            loadMoreColumn(status)
+        }
+    }
+
+    // Board cards are partial; the workspace needs the full lead
+    const openLead = async (lead: BoardLead) => {
+        if ('org_id' in lead) {
+            setSelectedLead(lead)
+            return
+        }
+        try {
+            setSelectedLead(await queryClient.fetchQuery({
+                queryKey: ['lead', lead.id],
+                queryFn: () => leadsAPI.getById(lead.id),
+            }))
+        } catch (err: any) {
+            toast.error('Не удалось открыть лида: ' + (err.response?.data?.detail || err.message))
         }
     }
 
@@ -169,7 +236,7 @@ export function Leads() {
         )
     }
 
-    const handleDragStart = (e: React.DragEvent, lead: Lead) => {
+    const handleDragStart = (e: React.DragEvent, lead: BoardLead) => {
         if (selectionMode) return
         e.dataTransfer.setData('leadId', lead.id)
         e.dataTransfer.setData('leadStatus', lead.status)
@@ -449,6 +516,7 @@ export function Leads() {
             <div className="flex h-[calc(100vh-12rem)] gap-4 overflow-x-auto pb-4 custom-scrollbar">
                 {filteredColumns.map((column) => {
                     const columnLeads = getLeadsByStatus(column.id)
+                    const columnTotal = boardColumns.get(column.id)?.total ?? 0
 
                     return (
                         <div
@@ -466,11 +534,11 @@ export function Leads() {
                                     <h3 className="font-semibold">{column.title}</h3>
                                 </div>
                                 <span className="rounded-full bg-muted px-2 py-0.5 text-xs font-medium">
-                                    {columnLeads.length}
+                                    {columnTotal}
                                 </span>
                             </div>
 
-                            <div className="flex-1 space-y-2 overflow-x-hidden overflow-y-auto p-4" onScroll={handleColumnScroll}>
+                            <div className="flex-1 space-y-2 overflow-x-hidden overflow-y-auto p-4" onScroll={(e) => handleColumnScroll(e, column.id)}>
                                 {columnLeads.map((lead) => (
                                     <LeadCard
                                         key={lead.id}
@@ -481,12 +549,21 @@ export function Leads() {
                                                 toggleLeadSelection(lead.id)
                                                 return
                                             }
-                                            setSelectedLead(lead)
+                                            openLead(lead)
                                         }}
                                         selectionMode={selectionMode}
                                         selected={selectedLeadIds.includes(lead.id)}
                                     />
                                 ))}
+                                {getColumnNextCursor(column.id) && (
+                                    <button
+                                        onClick={() => loadMoreColumn(column.id)}
+                                        disabled={loadingColumns.includes(column.id)}
+                                        className="w-full rounded-lg border px-3 py-1.5 text-xs text-muted-foreground disabled:opacity-50 hover:bg-accent transition-colors"
+                                    >
+                                        {loadingColumns.includes(column.id) ? 'Загрузка...' : `Показать ещё (${columnTotal - columnLeads.length})`}
+                                    </button>
+                                )}
                             </div>
                         </div>
                     )
@@ -500,15 +577,6 @@ export function Leads() {
                         <span> • Выбрано: <span className="font-semibold text-foreground">{selectedCount}</span></span>
                     )}
                 </div>
-                <div className="flex items-center gap-2">
-                    <button
-                        onClick={loadMoreLeads}
-                        disabled={!hasNextPage || isFetchingNextPage}
-                        className="rounded-lg border px-3 py-1.5 text-sm disabled:opacity-50 disabled:cursor-not-allowed hover:bg-accent transition-colors"
-                    >
-                        {isFetchingNextPage ? 'Загрузка...' : hasNextPage ? 'Загрузить ещё' : 'Загружено всё'}
-                    </button>
-                </div>
             </div>
 
             {/* Lead Workspace Overlay */}
@@ -1456,7 +1524,7 @@ function LeadCard({
     selectionMode = false,
     selected = false,
 }: {
-    lead: Lead
+    lead: BoardLead
     onDragStart: (e: React.DragEvent) => void
     onClick: () => void
     selectionMode?: boolean
@@ -60,6 +60,38 @@ export interface Lead {
     updated_at: string
 }
 
+// Kanban card: the lead fields a board card renders, see GET /leads/board
+export interface LeadBoardCard {
+    id: string
+    status: LeadStatus
+    full_name: string | null
+    username: string | null
+    phone: string | null
+    telegram_id: number | null
+    avatar_url?: string | null
+    source: string | null
+    ai_summary: string | null
+    readiness_score?: 'A' | 'B' | 'C' | null
+    telegram_lookup_status?: string | null
+    telegram_lookup_error?: string | null
+    unread_count: number
+    last_message_at?: string | null
+    messengers: { telegram?: boolean; whatsapp?: boolean }
+    whatsapp_wa_id?: string | null
+}
+
+export interface LeadBoardColumn {
+    status: LeadStatus
+    total: number
+    leads: LeadBoardCard[]
+    next_cursor: string | null
+}
+
+export interface LeadBoardResponse {
+    columns: LeadBoardColumn[]
+    total: number
+}
+
 export interface ChatMessage {
     id: string
     lead_id: string
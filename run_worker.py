@@ -2,9 +2,10 @@ import asyncio
 import logging
 import signal
 
+from src.config import settings
 from src.services.background_job_service import start_background_job_loop
-from src.services.followup_service import start_followup_loop
-from src.services.whatsapp.evolution_monitor_service import start_evolution_monitor_loop
+from src.services.cpu_executor import cpu_executor
+from src.services.periodic_scheduler import build_worker_scheduler
 
 
 logging.basicConfig(
@@ -28,19 +29,24 @@ async def main() -> None:
             pass
 
     logger.info("Starting CRM background worker")
-    followup_task = asyncio.create_task(start_followup_loop(stop_event=stop_event))
+    # Background jobs are claimed with SKIP LOCKED on every replica; periodic tasks run on
+    # whichever replica holds their advisory lock, so the worker can scale horizontally.
+    scheduler_task = asyncio.create_task(build_worker_scheduler().run(stop_event))
     background_jobs_task = asyncio.create_task(start_background_job_loop(stop_event=stop_event))
-    evolution_monitor_task = asyncio.create_task(start_evolution_monitor_loop(stop_event=stop_event))
 
     await stop_event.wait()
     logger.info("Stopping CRM background worker")
-    for task in (followup_task, background_jobs_task, evolution_monitor_task):
+    tasks = (scheduler_task, background_jobs_task)
+    # Loops exit on stop_event; the job loop needs the grace period to finish or release jobs
+    await asyncio.wait(tasks, timeout=settings.background_job_shutdown_grace_seconds + 10)
+    for task in tasks:
         task.cancel()
-    for task in (followup_task, background_jobs_task, evolution_monitor_task):
+    for task in tasks:
         try:
             await task
         except asyncio.CancelledError:
             pass
+    cpu_executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -7,10 +7,12 @@ from src.api import (
     ai_management,
     analytics,
     auth,
+    background_jobs,
     chat,
     custom_fields,
     dashboard,
     estimates,
+    events,
     leads,
     organizations,
     projects,
@@ -38,5 +40,7 @@ api_router.include_router(analytics.router)
 api_router.include_router(quiz.router)
 api_router.include_router(estimates.router)
 api_router.include_router(telegram_entry.router)
+api_router.include_router(background_jobs.router)
+api_router.include_router(events.router)
 
 __all__ = ["api_router"]
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional
 import uuid
 
 from src.database import get_db
@@ -10,14 +10,18 @@ from src.schemas.ai import (
     PromptConfigCreate, PromptConfigResponse,
     KnowledgeItemCreate, KnowledgeItemResponse,
     KnowledgeSearchRequest,
+    KnowledgeReembedStatusResponse,
     TelegramBusinessCardTemplateResponse,
     TelegramBusinessCardTemplateUpdate,
 )
 from src.schemas.company_fact import CompanyFactCreate, CompanyFactResponse, CompanyFactUpdate
 from src.models.company_fact import CompanyFact
+from src.models.knowledge import KnowledgeItem
 from src.services.company_fact_service import company_fact_service
 from src.services.prompt_service import prompt_service
 from src.services.knowledge_service import knowledge_service
+from src.services.knowledge_reembedding_service import knowledge_reembedding_service
+from src.services.field_projection import InvalidFieldsError, dump_json, parse_fields, schema_columns
 from src.dependencies.auth import require_role
 from src.config import settings
 
@@ -49,11 +53,15 @@ async def create_prompt(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new AI prompt configuration and optionally make it active"""
-    return await prompt_service.create_config(
+    config = await prompt_service.create_config(
         db=db,
         org_id=current_user.org_id,
         **data.model_dump()
     )
+    if config.is_active:
+        # A new embedding model makes stored vectors incomparable with queries
+        await knowledge_reembedding_service.start_if_needed(db, current_user.org_id)
+    return config
 
 @router.get("/prompts/active", response_model=PromptConfigResponse)
 async def get_active_prompt(
@@ -190,19 +198,23 @@ async def add_knowledge(
 
 @router.get("/knowledge", response_model=List[KnowledgeItemResponse])
 async def list_knowledge(
+    fields: Optional[str] = None,
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all Knowledge Base items for an organization"""
-    from sqlalchemy import select
-    from src.models.knowledge import KnowledgeItem
-    
-    result = await db.execute(
-        select(KnowledgeItem)
-        .where(KnowledgeItem.org_id == current_user.org_id)
-        .order_by(KnowledgeItem.created_at.desc())
+    """List all Knowledge Base items for an organization.
+    `fields=id,title,...` returns only those item fields (plus id)."""
+    try:
+        selected = parse_fields(fields, KnowledgeItemResponse)
+    except InvalidFieldsError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    rows = await knowledge_service.list_items(
+        db, current_user.org_id, schema_columns(KnowledgeItem, KnowledgeItemResponse, selected)
     )
-    return list(result.scalars().all())
+    if selected:
+        return Response(content=dump_json([dict(row._mapping) for row in rows]), media_type="application/json")
+    return [KnowledgeItemResponse.model_validate(row) for row in rows]
 
 @router.delete("/knowledge/{item_id}")
 async def delete_knowledge_item(
@@ -283,6 +295,24 @@ async def upload_knowledge_file(
             detail=f"Ошибка индексации файла: {str(e)}"
         )
 
+@router.get("/knowledge/reembed", response_model=KnowledgeReembedStatusResponse)
+async def get_knowledge_reembed_status(
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
+    db: AsyncSession = Depends(get_db)
+):
+    """Progress and ETA of re-embedding the knowledge base with the active model"""
+    progress = await knowledge_reembedding_service.get_progress(db, current_user.org_id)
+    return progress.as_dict()
+
+@router.post("/knowledge/reembed", response_model=KnowledgeReembedStatusResponse)
+async def start_knowledge_reembed(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_db)
+):
+    """Start re-embedding rows that were indexed with another embedding model"""
+    progress = await knowledge_reembedding_service.start_if_needed(db, current_user.org_id)
+    return progress.as_dict()
+
 @router.delete("/knowledge")
 async def clear_knowledge(
     current_user: User = Depends(require_role(UserRole.ADMIN)),
@@ -9,6 +9,7 @@ from src.dependencies.auth import require_role
 from src.models import User, UserRole
 from src.schemas.analytics import (
     AnalyticsSummary,
+    FunnelEventBatchCreate,
     FunnelEventCreate,
     FunnelEventResponse,
     FunnelSessionCreate,
@@ -16,6 +17,7 @@ from src.schemas.analytics import (
 )
 from src.services.analytics_service import analytics_service
 from src.services.analytics_request_enrichment import enrich_funnel_metadata
+from src.services.report_cache import report_cache
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -57,6 +59,27 @@ async def record_funnel_event(
     return event
 
 
+@router.post(
+    "/funnel/events/batch",
+    response_model=list[FunnelEventResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def record_funnel_events(
+    payload: FunnelEventBatchCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """Public endpoint for quizzes to append several buffered events of one session, in order."""
+    try:
+        events = await analytics_service.record_events(
+            db=db,
+            session_token=payload.session_token,
+            events=payload.events,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    return events
+
+
 @router.get("/summary", response_model=AnalyticsSummary)
 async def get_analytics_summary(
     date_from: datetime | None = Query(None),
@@ -66,11 +89,17 @@ async def get_analytics_summary(
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
     db: AsyncSession = Depends(get_db),
 ):
-    return await analytics_service.get_summary(
-        db=db,
-        org_id=current_user.org_id,
-        date_from=date_from,
-        date_to=date_to,
-        source=source,
-        campaign=campaign,
+    return await report_cache.get_or_compute(
+        "analytics_summary",
+        current_user.org_id,
+        {"date_from": date_from, "date_to": date_to, "source": source, "campaign": campaign},
+        AnalyticsSummary,
+        lambda: analytics_service.get_summary(
+            db=db,
+            org_id=current_user.org_id,
+            date_from=date_from,
+            date_to=date_to,
+            source=source,
+            campaign=campaign,
+        ),
     )
@@ -19,6 +19,7 @@ from src.models import (
 from src.models.user import UserRole
 from src.schemas.auth import RefreshTokenRequest, TokenResponse
 from src.services.auth import auth_service
+from src.services.principal_cache import principal_cache, revoke_principal
 from src.bot import bot as telegram_bot
 from src.config import settings
 from src.dependencies.auth import require_role
@@ -156,6 +157,10 @@ class OperatorAccessRejectRequest(BaseModel):
 MANAGEABLE_USER_ROLES = {UserRole.ADMIN, UserRole.MANAGER, UserRole.WORKER}
 
 
+def _token_claims(user: User) -> dict:
+    return {"sub": str(user.id), "ver": user.auth_version or 0}
+
+
 def _normalize_username(username: str | None) -> str | None:
     return (username or "").replace("@", "").strip() or None
 
@@ -487,8 +492,8 @@ async def telegram_bot_login_check(session_id: str, db: AsyncSession = Depends(g
                 await db.commit()
                 await db.refresh(user)
 
-    access_token = auth_service.create_access_token(data={"sub": str(user.id)})
-    refresh_token = auth_service.create_refresh_token(data={"sub": str(user.id)})
+    access_token = auth_service.create_access_token(data=_token_claims(user))
+    refresh_token = auth_service.create_refresh_token(data=_token_claims(user))
 
     await db.delete(session)
     await db.commit()
@@ -590,8 +595,8 @@ async def telegram_auth(
     )
     
     # Create tokens
-    access_token = auth_service.create_access_token(data={"sub": str(user.id)})
-    refresh_token = auth_service.create_refresh_token(data={"sub": str(user.id)})
+    access_token = auth_service.create_access_token(data=_token_claims(user))
+    refresh_token = auth_service.create_refresh_token(data=_token_claims(user))
     
     return TokenResponse(
         access_token=access_token,
@@ -634,8 +639,8 @@ async def refresh_token(
             detail="User not found",
         )
 
-    access_token = auth_service.create_access_token(data={"sub": str(user.id)})
-    rotated_refresh_token = auth_service.create_refresh_token(data={"sub": str(user.id)})
+    access_token = auth_service.create_access_token(data=_token_claims(user))
+    rotated_refresh_token = auth_service.create_refresh_token(data=_token_claims(user))
     return TokenResponse(
         access_token=access_token,
         refresh_token=rotated_refresh_token,
@@ -724,6 +729,8 @@ async def approve_operator_access_request(
         )
         db.add(operator)
     else:
+        if operator.role != payload.role:
+            revoke_principal(operator)
         operator.role = payload.role
         if normalized_full_name:
             operator.full_name = normalized_full_name
@@ -888,6 +895,8 @@ async def update_operator(
         raise HTTPException(status_code=400, detail="Доступны только роли ADMIN, MANAGER или WORKER.")
     if str(operator.id) == str(current_user.id) and "role" in payload and payload["role"] != current_user.role:
         raise HTTPException(status_code=400, detail="Нельзя изменить собственную роль.")
+    if "role" in payload and payload["role"] != operator.role:
+        revoke_principal(operator)
 
     for field_name in ("full_name", "phone", "email", "role"):
         if field_name in payload:
@@ -903,6 +912,8 @@ async def update_operator(
     except Exception as exc:
         await db.rollback()
         raise HTTPException(status_code=400, detail=f"Не удалось обновить оператора: {exc}")
+    # Profile fields are cached too
+    principal_cache.invalidate(operator.id)
 
     await db.refresh(operator)
     return operator
@@ -926,3 +937,4 @@ async def delete_operator(
 
     await db.delete(operator)
     await db.commit()
+    principal_cache.invalidate(user_id)
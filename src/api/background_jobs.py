@@ -0,0 +1,64 @@
+import hmac
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import get_db
+from src.dependencies.auth import require_role
+from src.models import User, UserRole
+from src.schemas.background_job import BackgroundJobQueueStats, PeriodicTaskStatus
+from src.services.background_job_service import background_job_service, render_queue_metrics
+from src.services.cpu_executor import cpu_executor, render_cpu_pool_metrics
+from src.services.periodic_scheduler import list_task_states, render_scheduler_metrics
+
+router = APIRouter(prefix="/background-jobs", tags=["Background Jobs"])
+
+
+@router.get("/stats", response_model=BackgroundJobQueueStats)
+async def get_background_job_stats(
+    window_minutes: int = Query(60, ge=1, le=1440),
+    recent_errors_limit: int = Query(20, ge=0, le=200),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue depth, per-type throughput, retries and recent errors of background jobs."""
+    return await background_job_service.get_queue_stats(
+        db,
+        window_minutes=window_minutes,
+        recent_errors_limit=recent_errors_limit,
+    )
+
+
+@router.get("/scheduler", response_model=List[PeriodicTaskStatus])
+async def get_scheduler_status(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_db),
+):
+    """Last run, current leader and run/failure/overrun counters of worker periodic tasks."""
+    return await list_task_states(db)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_background_job_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Prometheus scrape endpoint, enabled by setting METRICS_TOKEN."""
+    expected = (settings.metrics_token or "").strip()
+    if not expected:
+        raise HTTPException(status_code=404, detail="Metrics endpoint is disabled")
+    auth_header = request.headers.get("Authorization", "")
+    provided = auth_header.removeprefix("Bearer").strip() if auth_header else ""
+    if not hmac.compare_digest(provided.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    stats = await background_job_service.get_queue_stats(db, window_minutes=15, recent_errors_limit=0)
+    body = (
+        render_queue_metrics(stats)
+        + render_scheduler_metrics(await list_task_states(db))
+        + render_cpu_pool_metrics(cpu_executor.snapshot())
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
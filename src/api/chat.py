@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
@@ -7,10 +7,13 @@ import re
 import os
 
 from src.database import get_db
-from src.models import Lead, MessageDirection, MessageStatus, MessageTransport, Organization, User, UserRole
-from src.schemas.chat import ChatHistoryResponse, ChatMessageResponse, ChatMessageCreate, SendMessageRequest
+from src.models import ChatMessage, Lead, MessageDirection, MessageStatus, MessageTransport, Organization, User, UserRole
+from src.schemas.chat import ChatChangesResponse, ChatHistoryResponse, ChatMessageResponse, ChatMessageCreate, SendMessageRequest
 from src.services.chat_service import chat_service
+from src.services.delta_sync_service import delta_sync_service
 from src.services.lead_service import lead_service
+from src.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.services.field_projection import InvalidFieldsError, dump_json, parse_fields, schema_columns
 from src.services.telegram_delivery_service import TelegramDeliveryResult, telegram_delivery_service
 from src.services.whatsapp.media import media_type_from_mimetype, mimetype_for, public_media_url
 from src.services.whatsapp.transport_service import WhatsAppTransportError, whatsapp_transport_service
@@ -50,16 +53,33 @@ def _render_business_card_template(template: str, values: dict[str, str]) -> str
 @router.get("/{lead_id}/history", response_model=ChatHistoryResponse)
 async def get_chat_history(
     lead_id: uuid.UUID,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     transport: MessageTransport | None = Query(None),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get chat history for a specific lead.
+    Pass `next_cursor` from the previous response as `cursor` to load older messages
+    by keyset; `include_total=false` skips the exact count.
+    `fields=id,content,...` returns only those message fields (plus id and created_at).
+    Answers 304 when If-None-Match still matches the lead's messages.
     Requires ADMIN or MANAGER role.
     """
+    try:
+        keyset = decode_cursor(cursor) if cursor else None
+        if keyset and keyset[0] is None:
+            raise InvalidCursorError("Invalid pagination cursor")
+        selected = parse_fields(fields, ChatMessageResponse, always=("id", "created_at"))
+    except (InvalidCursorError, InvalidFieldsError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
     # Verify lead exists and belongs to user's organization
     lead = await lead_service.get_lead_by_id(db, lead_id)
     if not lead:
@@ -74,17 +94,91 @@ async def get_chat_history(
             detail="Access denied"
         )
     
+    # Mark messages as read first so the validator and the body see the same rows;
+    # a chat without unread messages is not written to
+    await chat_service.mark_messages_as_read(db, lead_id, unread_count=lead.unread_count)
+
+    etag = await delta_sync_service.messages_etag(
+        db, lead_id, transport, page, page_size, cursor, include_total, selected
+    )
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if delta_sync_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+
     # Get chat history
-    messages, total = await chat_service.get_chat_history(db, lead_id, page, page_size, transport=transport)
-    
-    # Mark messages as read
-    await chat_service.mark_messages_as_read(db, lead_id)
-    
+    messages, total = await chat_service.get_chat_history(
+        db,
+        lead_id,
+        page,
+        page_size,
+        transport=transport,
+        cursor=keyset,
+        include_total=include_total,
+        columns=schema_columns(ChatMessage, ChatMessageResponse, selected) if selected else None,
+    )
+    next_cursor = (
+        encode_cursor(messages[-1].created_at, messages[-1].id) if len(messages) == page_size else None
+    )
+
+    if selected:
+        payload = {
+            "messages": [dict(row._mapping) for row in messages],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+        }
+        return Response(content=dump_json(payload), media_type="application/json", headers=cache_headers)
+
     return ChatHistoryResponse(
         messages=[ChatMessageResponse.model_validate(msg) for msg in messages],
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{lead_id}/changes", response_model=ChatChangesResponse)
+async def get_chat_changes(
+    lead_id: uuid.UUID,
+    since: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=500),
+    transport: MessageTransport | None = Query(None),
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get messages created or updated (delivery status, read flag) after a sync token.
+    Call without `since` to get a starting token, then pass each `next_token` back.
+    Requires ADMIN or MANAGER role.
+    """
+    try:
+        token = decode_cursor(since) if since else None
+        if token and token[0] is None:
+            raise InvalidCursorError("Invalid sync token")
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    lead = await lead_service.get_lead_by_id(db, lead_id)
+    if not lead:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lead not found"
+        )
+
+    if str(lead.org_id) != str(current_user.org_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    batch = await delta_sync_service.message_changes(db, lead_id, token, limit, transport=transport)
+    return ChatChangesResponse(
+        messages=[ChatMessageResponse.model_validate(msg) for msg in batch.rows],
+        next_token=batch.next_token,
+        has_more=batch.has_more,
     )
 
 
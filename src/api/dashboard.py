@@ -6,6 +6,7 @@ from src.database import get_db
 from src.models import User, UserRole
 from src.schemas.dashboard import DashboardMetrics
 from src.services.dashboard_service import dashboard_service
+from src.services.report_cache import report_cache
 from src.dependencies.auth import require_role
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -19,4 +20,10 @@ async def get_dashboard_metrics(
     Get dashboard metrics and recent AI actions for the organization.
     Requires ADMIN or MANAGER role.
     """
-    return await dashboard_service.get_metrics(db, current_user.org_id)
+    return await report_cache.get_or_compute(
+        "dashboard_metrics",
+        current_user.org_id,
+        {},
+        DashboardMetrics,
+        lambda: dashboard_service.get_metrics(db, current_user.org_id),
+    )
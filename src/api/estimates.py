@@ -5,6 +5,7 @@ from starlette.background import BackgroundTask
 from src.dependencies.auth import get_current_user
 from src.models import User
 from src.schemas.estimate import EstimateFactsPayload, EstimateTotalsResponse
+from src.services.cpu_executor import run_cpu
 from src.services.estimates.service import build_estimate_from_payload, export_estimate_payload_xlsx
 
 router = APIRouter(prefix="/estimates", tags=["estimates"])
@@ -30,7 +31,7 @@ async def export_isaev_estimate(
     payload: EstimateFactsPayload,
     current_user: User = Depends(get_current_user),
 ) -> FileResponse:
-    output_path = export_estimate_payload_xlsx(payload.model_dump())
+    output_path = await run_cpu(export_estimate_payload_xlsx, payload.model_dump())
     filename = "smeta_isaev_group.xlsx"
     return FileResponse(
         path=output_path,
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import get_db
+from src.dependencies.auth import require_role
+from src.models import User, UserRole
+from src.services.crm_event_service import crm_event_hub
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def _sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_crm_events(
+    request: Request,
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Server-sent events for the user's organization:
+    message.created, lead.updated, lead.deleted, unread.changed and resync.
+    Requires ADMIN or MANAGER role.
+    """
+    org_id = current_user.org_id
+    # The stream lives for minutes; do not hold a pooled connection for it
+    await db.close()
+
+    async def event_stream():
+        queue = await crm_event_hub.subscribe(org_id)
+        try:
+            yield "retry: 3000\n\n"
+            yield _sse("ready", {"org_id": str(org_id)})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=max(1, settings.crm_events_keepalive_seconds)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(str(event.get("type") or "message"), event)
+        finally:
+            await crm_event_hub.unsubscribe(org_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
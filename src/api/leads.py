@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
 import uuid
 import json
 import os
+import time
 
 from src.database import get_db
-from src.models import User, UserRole, LeadStatus, LeadChangeLog
+from src.models import Lead, User, UserRole, LeadStatus, LeadChangeLog
 from src.schemas.lead import (
     LeadCreate,
     LeadResponse,
@@ -18,11 +19,18 @@ from src.schemas.lead import (
     LeadBulkDeleteResponse,
     LeadChangeLogItem,
     LeadChangeLogResponse,
+    LeadChangesResponse,
+    LeadBoardCard,
+    LeadBoardColumn,
+    LeadBoardResponse,
 )
 from src.services.lead_service import lead_service
 from src.services.lead_import_service import lead_import_service
 from src.services.lead_audit_service import lead_audit_service
 from src.services.estimate_request_service import estimate_request_service
+from src.services.delta_sync_service import delta_sync_service
+from src.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.services.field_projection import InvalidFieldsError, dump_json, parse_fields, schema_columns
 from src.dependencies.auth import require_role
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
@@ -34,20 +42,59 @@ DEFAULT_ESTIMATE_MESSAGE = (
 
 @router.get("/", response_model=LeadListResponse)
 async def get_leads(
+    request: Request,
+    response: Response,
     status: Optional[LeadStatus] = None,
     source: Optional[str] = None,
     search: Optional[str] = None,
     created_since_hours: Optional[int] = Query(None, ge=1, le=24 * 30),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get paginated list of leads for the organization.
     Supports filtering by status, source, and search query.
+    Pass `next_cursor` from the previous response as `cursor` to page by keyset;
+    `include_total=false` skips the exact count.
+    `fields=id,full_name,...` returns only those lead fields (plus id and last_message_at).
+    Answers 304 when If-None-Match still matches the org's leads.
     Requires ADMIN or MANAGER role.
     """
+    try:
+        keyset = decode_cursor(cursor) if cursor else None
+        selected = parse_fields(fields, LeadResponse, always=("id", "last_message_at"))
+    except (InvalidCursorError, InvalidFieldsError) as exc:
+        # `status` is the lead-status filter here, not fastapi.status
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    etag = await delta_sync_service.leads_etag(
+        db,
+        current_user.org_id,
+        status,
+        source,
+        search,
+        created_since_hours,
+        # The created_since window slides without any row changing
+        int(time.time() // 60) if created_since_hours else None,
+        page,
+        page_size,
+        cursor,
+        include_total,
+        selected,
+    )
+    # Without Redis there is no validator: answer in full and send no ETag
+    cache_headers = {}
+    if etag is not None:
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if delta_sync_service.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+
     leads, total = await lead_service.get_leads_by_org(
         db=db,
         org_id=current_user.org_id,
@@ -56,14 +103,123 @@ async def get_leads(
         search=search,
         created_since_hours=created_since_hours,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=keyset,
+        include_total=include_total,
+        columns=schema_columns(Lead, LeadResponse, selected) if selected else None,
     )
-    
+    next_cursor = encode_cursor(leads[-1].last_message_at, leads[-1].id) if len(leads) == page_size else None
+
+    if selected:
+        payload = {
+            "leads": [dict(row._mapping) for row in leads],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+        }
+        return Response(content=dump_json(payload), media_type="application/json", headers=cache_headers)
+
     return LeadListResponse(
         leads=[LeadResponse.model_validate(lead) for lead in leads],
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/board", response_model=LeadBoardResponse)
+async def get_lead_board(
+    request: Request,
+    response: Response,
+    per_status: int = Query(20, ge=1, le=100),
+    source: Optional[str] = None,
+    search: Optional[str] = None,
+    created_since_hours: Optional[int] = Query(None, ge=1, le=24 * 30),
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the kanban board: the exact lead count of every status plus its first
+    `per_status` cards, ordered like the lead list.
+    Continue a column with `GET /leads?status=...&cursor=<next_cursor>&include_total=false`.
+    Answers 304 when If-None-Match still matches the org's leads.
+    Requires ADMIN or MANAGER role.
+    """
+    etag = await delta_sync_service.leads_etag(
+        db,
+        current_user.org_id,
+        "board",
+        per_status,
+        source,
+        search,
+        created_since_hours,
+        int(time.time() // 60) if created_since_hours else None,
+    )
+    if etag is not None:
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if delta_sync_service.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+
+    counts, cards = await lead_service.get_board(
+        db=db,
+        org_id=current_user.org_id,
+        per_status=per_status,
+        source=source,
+        search=search,
+        created_since_hours=created_since_hours,
+    )
+    cards_by_status: dict[str, list[dict]] = {}
+    for card in cards:
+        cards_by_status.setdefault(str(card["status"]), []).append(card)
+
+    columns = []
+    for lead_status in LeadStatus:
+        column_cards = cards_by_status.get(lead_status.value, [])
+        total = counts.get(lead_status.value, 0)
+        last = column_cards[-1] if column_cards else None
+        columns.append(
+            LeadBoardColumn(
+                status=lead_status,
+                total=total,
+                leads=[LeadBoardCard.model_validate(card) for card in column_cards],
+                next_cursor=(
+                    encode_cursor(last["last_message_at"], last["id"])
+                    if last is not None and total > len(column_cards)
+                    else None
+                ),
+            )
+        )
+    return LeadBoardResponse(columns=columns, total=sum(counts.values()))
+
+
+@router.get("/changes", response_model=LeadChangesResponse)
+async def get_lead_changes(
+    since: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=500),
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.MANAGER)),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get leads created or updated after a sync token.
+    Call without `since` to get a starting token, then pass each `next_token` back.
+    Deleted leads are not reported.
+    Requires ADMIN or MANAGER role.
+    """
+    try:
+        token = decode_cursor(since) if since else None
+        if token and token[0] is None:
+            raise InvalidCursorError("Invalid sync token")
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    batch = await delta_sync_service.lead_changes(db, current_user.org_id, token, limit)
+    return LeadChangesResponse(
+        leads=[LeadResponse.model_validate(lead) for lead in batch.rows],
+        next_token=batch.next_token,
+        has_more=batch.has_more,
     )
 
 
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Lead
+from src.models.lead_data import lead_data
 from src.services.chat_service import chat_service
 from src.services.direct_qualification_service import (
     build_next_prompt,
@@ -19,14 +19,7 @@ from src.services.measurement_analytics_service import measurement_analytics_ser
 
 
 def _lead_data(lead: Lead) -> dict[str, Any]:
-    raw = getattr(lead, "extracted_data", None)
-    if not raw:
-        return {}
-    try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
-        return {}
-    return parsed if isinstance(parsed, dict) else {}
+    return lead_data(lead).copy()
 
 
 async def maybe_start_direct_qualification(
@@ -51,7 +44,7 @@ async def maybe_start_direct_qualification(
         field=prompt.field,
         source="telegram_direct_entry",
     )
-    lead.extracted_data = json.dumps(updated_data, ensure_ascii=False)
+    lead_data(lead).replace(updated_data)
     await db.commit()
 
     sent_message = await message.answer(prompt.text, reply_markup=prompt.keyboard)
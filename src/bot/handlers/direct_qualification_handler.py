@@ -1,6 +1,5 @@
 """Telegram callbacks for the direct lead inline qualification flow."""
 
-import json
 from datetime import datetime, timezone
 
 from aiogram import F, Router
@@ -13,6 +12,7 @@ from src.bot.measurement_slots import build_measurement_date_keyboard
 from src.database import AsyncSessionLocal
 from src.models import Lead
 from src.models.lead import LeadStatus
+from src.models.lead_data import lead_data
 from src.services.cal_pro_service import cal_pro_service
 from src.services.chat_service import chat_service
 from src.services.direct_qualification_service import apply_callback_answer
@@ -23,13 +23,7 @@ router = Router()
 
 
 def _lead_extracted_data(lead: Lead) -> dict:
-    if not getattr(lead, "extracted_data", None):
-        return {}
-    try:
-        data = json.loads(lead.extracted_data)
-    except json.JSONDecodeError:
-        return {}
-    return data if isinstance(data, dict) else {}
+    return lead_data(lead).copy()
 
 
 async def _find_lead_by_telegram(db: AsyncSession, telegram_id: int):
@@ -77,7 +71,7 @@ async def _build_completion_reply(db: AsyncSession, lead: Lead, extracted_data:
         measurement["status"] = "awaiting_manual_slot"
         measurement["requested_at"] = datetime.now(timezone.utc).isoformat()
         extracted_data["measurement"] = measurement
-        lead.extracted_data = json.dumps(extracted_data, ensure_ascii=False)
+        lead_data(lead).replace(extracted_data)
         lead.status = LeadStatus.MEASUREMENT_PENDING.value
         await db.commit()
         return (
@@ -94,7 +88,7 @@ async def _build_completion_reply(db: AsyncSession, lead: Lead, extracted_data:
     measurement["status"] = "awaiting_slot"
     measurement["requested_at"] = datetime.now(timezone.utc).isoformat()
     extracted_data["measurement"] = measurement
-    lead.extracted_data = json.dumps(extracted_data, ensure_ascii=False)
+    lead_data(lead).replace(extracted_data)
     lead.status = LeadStatus.MEASUREMENT_PENDING.value
     await db.commit()
 
@@ -126,7 +120,7 @@ async def direct_qualification_callback(query: CallbackQuery):
             await query.answer("Не удалось сохранить ответ", show_alert=True)
             return
 
-        lead.extracted_data = json.dumps(result.updated_data, ensure_ascii=False)
+        lead_data(lead).replace(result.updated_data)
         await db.commit()
 
         await chat_service.save_incoming_message(
@@ -3,7 +3,6 @@ Lead handler for processing messages from potential clients.
 Integrates AI-powered lead qualification using OpenRouter API.
 """
 import asyncio
-import json
 import logging
 import re
 from datetime import datetime, timedelta, timezone
@@ -20,12 +19,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.bot import dp, bot
 from src.database import AsyncSessionLocal
 from src.models.lead import LeadStatus
+from src.models.lead_data import lead_data
 from src.schemas.quiz import MeasurementBookingRequest, QuizContact
 from src.services.lead_service import lead_service
 from src.services.chat_service import chat_service
 from src.services.cal_pro_service import cal_pro_service
 from src.services.agent_tool_log_service import agent_tool_log_service
 from src.services.openrouter_service import openrouter_service
+from src.services.principal_cache import revoke_principal
 from src.services.prompt_service import prompt_service
 from src.services.knowledge_service import knowledge_service
 from src.services.measurement_analytics_service import measurement_analytics_service
@@ -683,7 +684,7 @@ async def _answer_measurement_question_if_possible(
 
     answer = _build_measurement_context_answer(lead, text)
     if not answer:
-        history, _ = await chat_service.get_chat_history(db, lead.id, page_size=12)
+        history, _ = await chat_service.get_chat_history(db, lead.id, page_size=12, include_total=False)
         for chat_message in history:
             if chat_message.direction != MessageDirection.OUTBOUND:
                 continue
@@ -708,14 +709,7 @@ async def _answer_measurement_question_if_possible(
 
 
 def _lead_measurement_data(lead) -> dict:
-    if not getattr(lead, "extracted_data", None):
-        return {}
-    try:
-        data = json.loads(lead.extracted_data)
-    except json.JSONDecodeError:
-        return {}
-    measurement = data.get("measurement") if isinstance(data, dict) else None
-    return measurement if isinstance(measurement, dict) else {}
+    return lead_data(lead).section("measurement")
 
 
 def _measurement_slots_recently_offered(lead, *, within_minutes: int = 30) -> bool:
@@ -738,7 +732,7 @@ def _mark_measurement_slots_offered(lead) -> None:
     measurement["status"] = measurement.get("status") or "awaiting_slot"
     measurement["slots_offered_at"] = datetime.now(timezone.utc).isoformat()
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
 
 
 def _mark_soft_decline(lead, *, source_text: str) -> tuple[dict, int]:
@@ -762,7 +756,7 @@ def _mark_soft_decline(lead, *, source_text: str) -> tuple[dict, int]:
     data["conversation_mode"] = "soft_decline"
     data["conversation_mode_reason"] = source_text[:300]
     data["conversation_mode_updated_at"] = now
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     return data, count
 
 
@@ -781,14 +775,7 @@ def _soft_decline_reply(count: int) -> str:
 
 
 def _lead_quiz_data(lead) -> dict:
-    if not getattr(lead, "extracted_data", None):
-        return {}
-    try:
-        data = json.loads(lead.extracted_data)
-    except json.JSONDecodeError:
-        return {}
-    quiz = data.get("quiz") if isinstance(data, dict) else None
-    return quiz if isinstance(quiz, dict) else {}
+    return lead_data(lead).section("quiz")
 
 
 def _lead_price_label(lead) -> str:
@@ -806,18 +793,12 @@ def _lead_quiz_answers(lead) -> dict:
 
 
 def _lead_extracted_data(lead) -> dict:
-    if not getattr(lead, "extracted_data", None):
-        return {}
-    try:
-        data = json.loads(lead.extracted_data)
-    except json.JSONDecodeError:
-        return {}
-    return data if isinstance(data, dict) else {}
+    """A private copy of the lead's data; store edits with lead_data(lead).replace(data)."""
+    return lead_data(lead).copy()
 
 
 def _lead_session_token(lead) -> str:
-    data = _lead_extracted_data(lead)
-    return str(data.get("quiz_session_token") or "").strip()
+    return str(lead_data(lead).get("quiz_session_token") or "").strip()
 
 
 def _lead_quiz_summary_lines(lead) -> list[str]:
@@ -1040,7 +1021,7 @@ async def _send_measurement_reschedule_slot_dates(message: Message, db: AsyncSes
     measurement["status"] = "awaiting_reschedule_slot"
     measurement["reschedule_requested_at"] = datetime.now(timezone.utc).isoformat()
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     await db.commit()
 
     text = "Да, конечно, перенесем. Выберите новый удобный день, чтобы инженеру было удобно приехать без спешки 📍"
@@ -1120,7 +1101,7 @@ async def _store_pending_measurement_slot(db: AsyncSession, lead, start: str) ->
         }
     )
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     if lead.status in {
         LeadStatus.NEW.value,
         LeadStatus.QUIZ_COMPLETED.value,
@@ -1137,7 +1118,7 @@ async def _set_pending_measurement_update(db: AsyncSession, lead, field: str) ->
     measurement["status"] = f"awaiting_{field}_update"
     measurement["update_requested_at"] = datetime.now(timezone.utc).isoformat()
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     await db.commit()
 
 
@@ -1181,7 +1162,7 @@ async def _confirm_measurement_reschedule(
         "requested_at": measurement.get("reschedule_requested_at"),
     }
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     await db.commit()
 
     contact = QuizContact(
@@ -1228,7 +1209,7 @@ async def _confirm_measurement_reschedule(
                 }
             )
             data["measurement"] = measurement
-            lead.extracted_data = json.dumps(data, ensure_ascii=False)
+            lead_data(lead).replace(data)
             lead.status = LeadStatus.MEASUREMENT_BOOKED.value
             await db.commit()
             await quiz_service._enqueue_measurement_reminder(
@@ -1386,7 +1367,7 @@ async def _book_measurement_directly(
     data["measurement"] = measurement
     data["measurement_address"] = address
     data["address"] = address
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     lead.status = LeadStatus.MEASUREMENT_BOOKED.value if booking_uid else LeadStatus.MEASUREMENT_PENDING.value
     await db.commit()
     await db.refresh(lead)
@@ -1454,7 +1435,7 @@ async def _pop_pending_measurement_slot(db: AsyncSession, lead) -> str:
     measurement.pop("pending_start", None)
     measurement.pop("pending_slot_label", None)
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     await db.commit()
     return start
 
@@ -1491,7 +1472,7 @@ async def _try_handle_pending_measurement_update(
         data["measurement"] = measurement
         data["address"] = clean_address
         data["measurement_address"] = clean_address
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         await db.commit()
 
         date_text = _format_measurement_start(measurement.get("start"))
@@ -1542,7 +1523,7 @@ async def _try_handle_pending_measurement_update(
         measurement["status"] = "booked" if measurement.get("start") else "phone_updated"
         measurement["phone_updated_at"] = datetime.now(timezone.utc).isoformat()
         data["measurement"] = measurement
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         await db.commit()
 
         date_text = _format_measurement_start(measurement.get("start"))
@@ -1599,7 +1580,7 @@ async def _try_handle_pending_measurement_address(
         measurement["phone"] = normalized_phone
         measurement["status"] = "awaiting_address"
         data["measurement"] = measurement
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         await db.commit()
 
         text = "Спасибо, телефон сохранил. Теперь напишите адрес объекта: город, улицу, дом и квартиру/офис."
@@ -1765,7 +1746,7 @@ async def _handle_direct_measurement_address_correction(
     data["measurement"] = measurement
     data["address"] = address
     data["measurement_address"] = address
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     await db.commit()
 
     date_text = _format_measurement_start(measurement.get("start"))
@@ -1984,7 +1965,7 @@ def _set_lead_conversation_mode(lead, mode: str, reason: str) -> dict:
     data["conversation_mode_reason"] = reason
     data["conversation_mode_updated_at"] = datetime.now(timezone.utc).isoformat()
     data["do_not_contact"] = mode == "do_not_contact"
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     return data
 
 
@@ -2016,7 +1997,7 @@ async def _handle_measurement_cancel_request(
         measurement["cancel_requested_at"] = datetime.now(timezone.utc).isoformat()
         measurement["cancel_reason"] = reason
         data["measurement"] = measurement
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         if final_lost:
             lead.status = LeadStatus.LOST.value
             lead.ai_qualification_status = "not_interested"
@@ -2062,7 +2043,7 @@ async def _handle_measurement_cancel_request(
         measurement["cancel_requested_at"] = datetime.now(timezone.utc).isoformat()
         measurement["cancel_reason"] = reason
         data["measurement"] = measurement
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         lead.ai_qualification_status = "handoff_required"
         await db.commit()
 
@@ -2099,7 +2080,7 @@ async def _handle_measurement_cancel_request(
     measurement["cancel_reason"] = reason
     measurement["cancel_response"] = cancel_response.get("data") or cancel_response
     data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     if final_lost:
         lead.status = LeadStatus.LOST.value
         lead.ai_qualification_status = "not_interested"
@@ -2154,7 +2135,7 @@ async def _handle_not_interested(
         lead.ai_qualification_status = "in_progress"
 
     if decline_count >= SOFT_DECLINE_LIMIT and _measurement_has_active_booking(measurement):
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         await db.commit()
         return await _handle_measurement_cancel_request(
             db=db,
@@ -2194,7 +2175,7 @@ async def _handle_do_not_contact(
     lead.ai_qualification_status = "not_interested"
     measurement = data.get("measurement") if isinstance(data.get("measurement"), dict) else {}
     if _measurement_has_active_booking(measurement):
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         await db.commit()
         return await _handle_measurement_cancel_request(
             db=db,
@@ -2264,7 +2245,7 @@ async def _handle_reactivation(
         measurement["status"] = "reactivated"
         measurement["reactivated_at"] = datetime.now(timezone.utc).isoformat()
         data["measurement"] = measurement
-    lead.extracted_data = json.dumps(data, ensure_ascii=False)
+    lead_data(lead).replace(data)
     lead.status = LeadStatus.MEASUREMENT_PENDING.value
     lead.ai_qualification_status = "in_progress"
     await db.commit()
@@ -2709,22 +2690,11 @@ PROTECTED_EXTRACTED_DATA_KEYS = {
 }
 
 
-def _parse_extracted_data(value: str | None) -> dict:
-    if not value:
-        return {}
-    try:
-        parsed = json.loads(value)
-        return parsed if isinstance(parsed, dict) else {}
-    except json.JSONDecodeError:
-        return {}
-
-
-def _merge_ai_extracted_data(existing_value: str | None, ai_data: dict) -> str:
+def _merge_ai_extracted_data(existing: dict, ai_data: dict) -> dict:
     """
     Preserve durable CRM/quiz context while letting the AI update qualification fields.
     The quiz block is the source of truth for already answered quiz questions.
     """
-    existing = _parse_extracted_data(existing_value)
     merged = dict(existing)
     current_ai = merged.get("ai_extracted")
     if not isinstance(current_ai, dict):
@@ -2742,7 +2712,7 @@ def _merge_ai_extracted_data(existing_value: str | None, ai_data: dict) -> str:
             continue
         merged[key] = value
 
-    return json.dumps(merged, ensure_ascii=False)
+    return merged
 
 
 def _normalize_username(username: str | None) -> str | None:
@@ -3268,6 +3238,8 @@ async def operator_access_callback(query: CallbackQuery):
                 )
                 db.add(operator)
             else:
+                if operator.role != UserRole.MANAGER:
+                    revoke_principal(operator)
                 operator.role = UserRole.MANAGER
                 if not operator.full_name and access_request.full_name:
                     operator.full_name = (access_request.full_name or "").strip() or None
@@ -3337,7 +3309,7 @@ async def quiz_measure_change_callback(query: CallbackQuery):
             measurement["status"] = "awaiting_reschedule_slot"
             measurement["reschedule_requested_at"] = datetime.now(timezone.utc).isoformat()
             data["measurement"] = measurement
-            lead.extracted_data = json.dumps(data, ensure_ascii=False)
+            lead_data(lead).replace(data)
             await db.commit()
             if query.message:
                 await query.message.edit_text(
@@ -3626,7 +3598,7 @@ async def process_debounced_message(conversation_key: str):
                 "linked_at": datetime.now(timezone.utc).isoformat(),
             }
             data.setdefault("messengers", {})["telegram"] = True
-            lead.extracted_data = json.dumps(data, ensure_ascii=False)
+            lead_data(lead).replace(data)
             if not lead.source or lead.source == "telegram":
                 lead.source = "telegram_business"
             await db.commit()
@@ -3634,7 +3606,7 @@ async def process_debounced_message(conversation_key: str):
         request_facts = lead_request_fact_extractor.extract(combined_text)
         if request_facts:
             data = lead_request_fact_extractor.merge(_lead_extracted_data(lead), request_facts)
-            lead.extracted_data = json.dumps(data, ensure_ascii=False)
+            lead_data(lead).replace(data)
             await db.commit()
 
         session_token = quiz_service.extract_session_token(combined_text)
@@ -3730,11 +3702,12 @@ async def process_debounced_message(conversation_key: str):
 
         try:
             # Get conversation history
-            messages, total = await chat_service.get_chat_history(
+            messages, _ = await chat_service.get_chat_history(
                 db=db,
                 lead_id=lead.id,
                 page=1,
-                page_size=20  # Last 20 messages
+                page_size=20,  # Last 20 messages
+                include_total=False,
             )
             
             # Convert to OpenRouter format
@@ -3861,11 +3834,9 @@ async def process_debounced_message(conversation_key: str):
             )
             extracted_data = ai_response.get("extracted_data")
             direct_prompt = None
-            effective_extracted_data = _lead_extracted_data(lead)
+            effective_extracted_data = lead_data(lead).data
             if extracted_data:
-                effective_extracted_data = _parse_extracted_data(
-                    _merge_ai_extracted_data(lead.extracted_data, extracted_data)
-                )
+                effective_extracted_data = _merge_ai_extracted_data(lead_data(lead).data, extracted_data)
             if (
                 not sales_turn_plan
                 and stage_context.next_action == "direct_chat_qualification"
@@ -3969,17 +3940,16 @@ async def process_debounced_message(conversation_key: str):
                 if readiness_score in ["A", "B", "C"]:
                     update_fields["readiness_score"] = readiness_score
                 
-                # Save extracted data without erasing quiz answers and messenger links.
-                update_fields["extracted_data"] = _merge_ai_extracted_data(lead.extracted_data, extracted_data)
+                # Save extracted data without erasing quiz answers and messenger links;
+                # written back when the update below commits
+                lead_data(lead).replace(_merge_ai_extracted_data(lead_data(lead).data, extracted_data))
                 
                 # Execute update
-                updated_lead = lead
-                if update_fields:
-                    updated_lead = await lead_service.update_lead(
-                        db=db,
-                        lead_id=lead.id,
-                        **update_fields
-                    )
+                updated_lead = await lead_service.update_lead(
+                    db=db,
+                    lead_id=lead.id,
+                    **update_fields
+                )
                 
                 # Check if handoff is needed
                 if openrouter_service.should_handoff(extracted_data) and not direct_prompt:
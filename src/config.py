@@ -98,6 +98,7 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
     jwt_refresh_token_expire_days: int = 7
+    auth_principal_cache_ttl_seconds: int = 30  # 0 disables the per-process user cache
     
     # Telegram
     telegram_bot_token: str
@@ -114,6 +115,8 @@ class Settings(BaseSettings):
     manual_help_telegram_ids: str = ""  # Recipients for cases that need operator attention
     system_alert_telegram_ids: str = ""  # Recipients for technical alerts and delivery failures
     telegram_phone_lookup_max_per_minute: int = 20
+    telegram_bot_max_messages_per_second: int = 25
+    telegram_userbot_max_messages_per_minute: int = 20
     telegram_phone_lookup_cache_ttl_seconds: int = 3600
     whatsapp_lookup_url: str = ""
     whatsapp_lookup_token: str = ""
@@ -126,6 +129,7 @@ class Settings(BaseSettings):
     userbot_pending_message_batch_size: int = 100
     quiz_abandoned_telegram_followup_enabled: bool = True
     quiz_abandoned_telegram_followup_delay_minutes: int = 10
+    followup_reconcile_interval_seconds: int = 3600  # safety net for leads without a follow-up job
 
     # Cal.com / Cal Pro measurement scheduling
     cal_pro_enabled: bool = True
@@ -213,14 +217,38 @@ class Settings(BaseSettings):
     app_public_base_url: str = ""
     auto_create_tables: bool = False
     background_job_batch_size: int = 25
-    background_job_poll_interval_seconds: int = 5
+    background_job_poll_interval_seconds: int = 5  # used when LISTEN/NOTIFY is unavailable
+    background_job_safety_poll_interval_seconds: int = 60
     background_job_lock_timeout_seconds: int = 900
+    background_job_max_concurrency: int = 8
+    background_job_type_concurrency: str = "knowledge_index:2,knowledge_reembed:1,lead_followup:4"  # job_type:limit pairs
+    background_job_timeout_seconds: int = 300
+    background_job_type_timeouts: str = "knowledge_reembed:600"  # job_type:seconds pairs
+    background_job_shutdown_grace_seconds: int = 20
+    background_job_stale_check_interval_seconds: int = 60
+    background_job_retention_days: int = 7
+    background_job_retention_interval_seconds: int = 3600
+    background_job_archive_batch_size: int = 1000
+    background_job_archive_retention_days: int = 90
+    scheduler_lock_retry_seconds: int = 15  # how often a standby worker retries leadership
+    scheduler_jitter_seconds: int = 5
+    cpu_pool_workers: int = 2  # process pool for PDF/XLSX/image work; 0 runs it in a thread instead
+    metrics_token: str = ""  # Bearer token for Prometheus scrape endpoints; empty disables them
+    knowledge_reembed_batch_size: int = 32
+    knowledge_reembed_batch_delay_seconds: int = 5
+    delta_sync_settle_seconds: int = 5  # rows touched this recently are re-sent by the next changes poll
+    crm_events_keepalive_seconds: int = 20  # SSE comment interval that keeps proxies from closing the stream
+    crm_events_reconnect_seconds: int = 5
 
     # PostHog Cloud analytics
     posthog_enabled: bool = False
     posthog_host: str = "https://us.i.posthog.com"
     posthog_project_api_key: str = ""
     posthog_timeout_seconds: int = 3
+    analytics_rollup_interval_seconds: int = 900  # compaction of closed days into funnel rollups
+    analytics_rollup_lookback_days: int = 3  # closed days rebuilt on every run for late status changes
+    report_cache_ttl_seconds: int = 30  # Redis cache of analytics/dashboard results; 0 disables it
+    report_cache_timeout_seconds: float = 0.5  # Redis calls slower than this fall back to computing
     
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
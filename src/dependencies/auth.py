@@ -9,6 +9,7 @@ import logging
 from src.database import get_db
 from src.models import User, UserRole
 from src.services.auth import auth_service
+from src.services.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ async def get_current_user(
 ) -> User:
     """
     FastAPI dependency to get the current authenticated user from JWT token.
+    The user is served from the principal cache while its auth version matches
+    the token's, so authenticated polling skips the users query.
     
     Usage:
         @app.get("/me")
@@ -46,6 +49,11 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token_version = payload.get("ver", 0)
+    user = principal_cache.get(user_id, token_version)
+    if user is not None:
+        return user
+
     # Fetch user from database
     result = await db.execute(
         select(User).where(User.id == uuid.UUID(user_id))
@@ -58,7 +66,16 @@ async def get_current_user(
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    if token_version != (user.auth_version or 0):
+        # Issued before a permission change; the client refreshes for a current token
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is outdated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal_cache.set(user)
     return user
 
 
@@ -12,6 +12,8 @@ from src.config import settings
 from src.database import init_db, close_db, check_db_connection
 from src.api import api_router
 from src.bot import bot, dp
+from src.services.cpu_executor import cpu_executor
+from src.services.crm_event_service import crm_event_hub
 
 logger = logging.getLogger(__name__)
 telegram_polling_task: asyncio.Task | None = None
@@ -184,6 +186,8 @@ async def shutdown():
             await telegram_polling_task
     if bot:
         await bot.session.close()
+    cpu_executor.shutdown()
+    await crm_event_hub.close()
     await close_db()
 
 # Include API routes
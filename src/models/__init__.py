@@ -22,8 +22,15 @@ from src.models.telegram_user_bot import TelegramUserBot
 from src.models.auth_session import AuthSession
 from src.models.lead_change_log import LeadChangeLog
 from src.models.operator_access_request import OperatorAccessRequest, OperatorAccessRequestStatus
-from src.models.background_job import BackgroundJob
-from src.models.funnel import FunnelEvent, FunnelSession
+from src.models.background_job import BackgroundJob, BackgroundJobArchive
+from src.models.periodic_task import PeriodicTaskState
+from src.models.funnel import (
+    FunnelDailyMetric,
+    FunnelDailySessions,
+    FunnelEvent,
+    FunnelRollupDay,
+    FunnelSession,
+)
 
 __all__ = [
     "BaseModel",
@@ -56,6 +63,11 @@ __all__ = [
     "OperatorAccessRequest",
     "OperatorAccessRequestStatus",
     "BackgroundJob",
+    "BackgroundJobArchive",
+    "PeriodicTaskState",
     "FunnelEvent",
     "FunnelSession",
+    "FunnelDailySessions",
+    "FunnelDailyMetric",
+    "FunnelRollupDay",
 ]
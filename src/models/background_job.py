@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 from src.models.base import BaseModel
@@ -8,13 +8,57 @@ class BackgroundJob(BaseModel):
     """Durable background job for work that must survive API restarts."""
 
     __tablename__ = "background_jobs"
+    __table_args__ = (
+        # Claim scans only runnable rows, so its cost does not grow with finished history
+        Index(
+            "ix_background_jobs_runnable",
+            "run_at",
+            "created_at",
+            postgresql_where=text("status IN ('queued', 'retry')"),
+        ),
+        Index(
+            "ix_background_jobs_running_locked_at",
+            "locked_at",
+            postgresql_where=text("status = 'running'"),
+        ),
+        Index(
+            "ix_background_jobs_finished_at",
+            "finished_at",
+            postgresql_where=text("status IN ('done', 'failed')"),
+        ),
+        Index(
+            "ux_background_jobs_dedup_key",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text("dedup_key IS NOT NULL"),
+        ),
+    )
 
     job_type = Column(String(64), nullable=False, index=True)
-    status = Column(String(32), nullable=False, default="queued", index=True)
+    status = Column(String(32), nullable=False, default="queued")
     payload = Column(JSONB, nullable=False)
     attempts = Column(Integer, nullable=False, default=0)
     max_attempts = Column(Integer, nullable=False, default=3)
-    run_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    run_at = Column(DateTime(timezone=True), nullable=True)
     locked_at = Column(DateTime(timezone=True), nullable=True)
     finished_at = Column(DateTime(timezone=True), nullable=True)
     last_error = Column(Text, nullable=True)
+    # Identity of the logical job; a second enqueue with the same key is ignored or re-arms it
+    dedup_key = Column(String(255), nullable=True)
+
+
+class BackgroundJobArchive(BaseModel):
+    """Finished background jobs moved out of the hot queue table by the retention job."""
+
+    __tablename__ = "background_jobs_archive"
+
+    job_type = Column(String(64), nullable=False)
+    status = Column(String(32), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime(timezone=True), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    last_error = Column(Text, nullable=True)
+    dedup_key = Column(String(255), nullable=True)
@@ -32,7 +32,9 @@ class ChatMessage(BaseModel):
     
     __tablename__ = "chat_messages"
     __table_args__ = (
-        Index('ix_chat_messages_lead_id_created_at', 'lead_id', 'created_at'),
+        Index('ix_chat_messages_lead_created_at_id', 'lead_id', 'created_at', 'id'),
+        # Delta sync and ETag validators: rows changed after (updated_at, id)
+        Index('ix_chat_messages_lead_updated_at_id', 'lead_id', 'updated_at', 'id'),
         Index(
             'ux_chat_messages_external_provider_message_id',
             'external_provider',
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -60,3 +60,57 @@ class FunnelEvent(BaseModel):
     event_data = Column(JSONB, nullable=True)
 
     session = relationship("FunnelSession", back_populates="events")
+
+
+class FunnelDailySessions(BaseModel):
+    """Sessions created on one UTC day, per source/campaign/channel; rebuilt by compaction."""
+
+    __tablename__ = "funnel_daily_sessions"
+    __table_args__ = (Index("ix_funnel_daily_sessions_org_day", "org_id", "day"),)
+
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False, index=True)
+    source = Column(String(100), nullable=True)
+    campaign = Column(String(255), nullable=True)
+    channel = Column(String(50), nullable=True)
+
+    sessions = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    abandoned = Column(Integer, nullable=False, default=0)
+
+
+class FunnelDailyMetric(BaseModel):
+    """Funnel metrics attributed to one UTC day, per session day and source/campaign/channel.
+
+    Distinct-session metrics (funnel steps, messenger outcomes, quiz step event types) count
+    a session on the day of its first matching event, so days add up without double counting.
+    `answer_option` rows count answer events per option together with time-on-step sums.
+    """
+
+    __tablename__ = "funnel_daily_metrics"
+    __table_args__ = (Index("ix_funnel_daily_metrics_org_day", "org_id", "day", "session_day"),)
+
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False, index=True)
+    session_day = Column(Date, nullable=False)
+    source = Column(String(100), nullable=True)
+    campaign = Column(String(255), nullable=True)
+    channel = Column(String(50), nullable=True)
+
+    metric = Column(String(100), nullable=False)
+    step_id = Column(String(100), nullable=True)
+    value = Column(Text, nullable=True)
+    label = Column(Text, nullable=True)
+
+    sessions = Column(Integer, nullable=False, default=0)
+    events = Column(Integer, nullable=False, default=0)
+    time_sum_ms = Column(BigInteger, nullable=False, default=0)
+    time_count = Column(Integer, nullable=False, default=0)
+
+
+class FunnelRollupDay(BaseModel):
+    """A UTC day whose funnel rollups have been compacted; updated_at is the last rebuild."""
+
+    __tablename__ = "funnel_rollup_days"
+
+    day = Column(Date, nullable=False, unique=True)
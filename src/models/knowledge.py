@@ -23,6 +23,12 @@ class KnowledgeItem(BaseModel):
     
     # Vector embedding (1536 is standard for OpenAI/OpenRouter embeddings)
     embedding = Column(Vector(1536), nullable=True)
+    # Model that produced `embedding`; search only compares vectors of one model
+    embedding_model = Column(String(100), nullable=True, index=True)
+
+    # Shadow vector filled by the re-embedding backfill and swapped in at cut-over
+    pending_embedding = Column(Vector(1536), nullable=True)
+    pending_embedding_model = Column(String(100), nullable=True)
     
     metadata_json = Column(JSON, nullable=True) # Extra info like source URL, tags
     
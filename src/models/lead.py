@@ -1,9 +1,104 @@
-from sqlalchemy import Column, String, ForeignKey, BigInteger, Enum as SQLEnum, Text, DateTime, Integer, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, String, ForeignKey, BigInteger, Enum as SQLEnum, Text, DateTime, Integer, Numeric, UniqueConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship, synonym
+from sqlalchemy.types import TypeDecorator
 import enum
+import json
+import re
 
 from src.models.base import BaseModel
+from src.models.lead_data import VIEW_ATTR
+from src.models.chat_message import MessageDirection
+
+
+# Phone digits with Russian 8XXXXXXXXXX / 10-digit forms rewritten to 7XXXXXXXXXX.
+# Keep in sync with canonical_phone_digits below.
+PHONE_DIGITS_SQL = r"""
+CASE
+    WHEN length(regexp_replace(phone, '\D', '', 'g')) = 11
+         AND left(regexp_replace(phone, '\D', '', 'g'), 1) = '8'
+        THEN '7' || substr(regexp_replace(phone, '\D', '', 'g'), 2)
+    WHEN length(regexp_replace(phone, '\D', '', 'g')) = 10
+        THEN '7' || regexp_replace(phone, '\D', '', 'g')
+    ELSE NULLIF(regexp_replace(phone, '\D', '', 'g'), '')
+END
+"""
+
+
+def canonical_phone_digits(value: str | None) -> str | None:
+    """Python mirror of `leads.phone_digits`; lookups against the column go through it."""
+    if not value:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    if not digits:
+        return None
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    if len(digits) == 10:
+        digits = "7" + digits
+    return digits
+
+
+class JSONBText(TypeDecorator):
+    """JSONB in Postgres, a JSON string in Python.
+
+    `Lead.extracted_data` callers parse and dump JSON text themselves; this keeps that
+    contract while the column is stored as JSONB and feeds the generated columns below.
+    Dicts and lists are accepted on write as well.
+    """
+
+    impl = JSONB
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(none_as_null=True)
+
+    def process_bind_param(self, value, dialect):
+        if not isinstance(value, str):
+            return value
+        if not value.strip():
+            return None
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            # Not JSON: stored as a JSON string instead of failing the write
+            return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(value, ensure_ascii=False)
+
+
+def _extracted_text(*path: str) -> str:
+    """`extracted_data #>> '{a,b}'`: NULL when any step is missing or not an object."""
+    return f"extracted_data #>> '{{{','.join(path)}}}'"
+
+
+def _extracted_number(*path: str) -> str:
+    """Numeric value at `path`, NULL for anything that is not a JSON number."""
+    node = f"extracted_data #> '{{{','.join(path)}}}'"
+    return f"CASE WHEN jsonb_typeof({node}) = 'number' THEN ({node})::text::numeric END"
+
+
+# Generated columns over hot extracted_data fields, so filters and dashboards run in SQL.
+# Expressions must not raise for any stored document: casts are guarded by jsonb_typeof.
+EXTRACTED_DO_NOT_CONTACT_SQL = "COALESCE(extracted_data -> 'do_not_contact' = 'true'::jsonb, false)"
+EXTRACTED_QUIZ_SESSION_TOKEN_SQL = _extracted_text("quiz_session_token")
+EXTRACTED_TELEGRAM_BUSINESS_CHAT_ID_SQL = _extracted_text("telegram_business_chat", "chat_id")
+EXTRACTED_MEASUREMENT_START_SQL = _extracted_text("measurement", "start")
+EXTRACTED_MEASUREMENT_BOOKING_UID_SQL = _extracted_text("measurement", "booking_uid")
+EXTRACTED_ESTIMATE_REQUESTED_AT_SQL = _extracted_text("estimate_request", "requested_at")
+EXTRACTED_ESTIMATE_PREPARED_AT_SQL = (
+    f"COALESCE({_extracted_text('estimate_request', 'prepared_at')}, "
+    f"{_extracted_text('estimate_request', 'final_uploaded_at')})"
+)
+EXTRACTED_ESTIMATE_DURATION_MINUTES_SQL = _extracted_number("estimate_request", "duration_minutes")
+EXTRACTED_ESTIMATE_SLA_HOURS_SQL = _extracted_number("estimate_request", "sla_hours")
+EXTRACTED_ESTIMATE_SLA_MET_SQL = (
+    "CASE WHEN jsonb_typeof(extracted_data #> '{estimate_request,sla_met}') = 'boolean' "
+    "THEN (extracted_data #>> '{estimate_request,sla_met}')::boolean END"
+)
 
 
 class LeadStatus(str, enum.Enum):
@@ -50,6 +145,43 @@ class Lead(BaseModel):
     __tablename__ = "leads"
     __table_args__ = (
         UniqueConstraint('org_id', 'telegram_id', name='uq_org_telegram_id'),
+        # Follow-up sweep: leads waiting on a reply that can still receive follow-ups
+        Index(
+            'ix_leads_followup_candidates',
+            'last_message_at',
+            postgresql_where=text(
+                "last_message_direction = 'OUTBOUND' AND telegram_id IS NOT NULL AND followup_count < 3"
+            ),
+        ),
+        # Phone lookups (quiz dedup, WhatsApp chat ids): exact digits or the last 10 digits
+        Index('ix_leads_org_phone_digits', 'org_id', 'phone_digits'),
+        Index('ix_leads_org_phone_tail', 'org_id', text('right(phone_digits, 10)')),
+        # Delta sync and ETag validators: rows changed after (updated_at, id)
+        Index('ix_leads_org_updated_at_id', 'org_id', 'updated_at', 'id'),
+        # Containment queries on extracted_data (@>)
+        Index(
+            'ix_leads_extracted_data_gin',
+            'extracted_data',
+            postgresql_using='gin',
+            postgresql_ops={'extracted_data': 'jsonb_path_ops'},
+        ),
+        Index(
+            'ix_leads_org_quiz_session_token',
+            'org_id',
+            'quiz_session_token',
+            postgresql_where=text("quiz_session_token IS NOT NULL"),
+        ),
+        Index(
+            'ix_leads_org_telegram_business_chat_id',
+            'org_id',
+            'telegram_business_chat_id',
+            postgresql_where=text("telegram_business_chat_id IS NOT NULL"),
+        ),
+        Index(
+            'ix_leads_org_estimate_requested_at',
+            'org_id',
+            postgresql_where=text("estimate_requested_at IS NOT NULL OR estimate_duration_minutes IS NOT NULL"),
+        ),
     )
     
     # Organization (multi-tenant)
@@ -66,6 +198,7 @@ class Lead(BaseModel):
     # Lead details
     full_name = Column(String(255), nullable=True)
     phone = Column(String(20), nullable=True)
+    phone_digits = Column(String(20), Computed(PHONE_DIGITS_SQL, persisted=True), nullable=True)
     username = Column(String(255), nullable=True)  # Telegram username
     
     # Status
@@ -100,8 +233,21 @@ class Lead(BaseModel):
         nullable=True
     )
     
-    # Extracted data from AI conversation (JSON)
-    extracted_data = Column(Text, nullable=True)  # JSON string
+    # Extracted data from AI conversation (JSONB, read and written as a JSON string).
+    # Prefer lead_data(lead) for reads and edits; see src/models/lead_data.py
+    _extracted_data = Column("extracted_data", JSONBText(), nullable=True)
+
+    # Generated from extracted_data; written by Postgres only
+    do_not_contact = Column(Boolean, Computed(EXTRACTED_DO_NOT_CONTACT_SQL, persisted=True))
+    quiz_session_token = Column(Text, Computed(EXTRACTED_QUIZ_SESSION_TOKEN_SQL, persisted=True))
+    telegram_business_chat_id = Column(Text, Computed(EXTRACTED_TELEGRAM_BUSINESS_CHAT_ID_SQL, persisted=True))
+    measurement_start = Column(Text, Computed(EXTRACTED_MEASUREMENT_START_SQL, persisted=True))
+    measurement_booking_uid = Column(Text, Computed(EXTRACTED_MEASUREMENT_BOOKING_UID_SQL, persisted=True))
+    estimate_requested_at = Column(Text, Computed(EXTRACTED_ESTIMATE_REQUESTED_AT_SQL, persisted=True))
+    estimate_prepared_at = Column(Text, Computed(EXTRACTED_ESTIMATE_PREPARED_AT_SQL, persisted=True))
+    estimate_duration_minutes = Column(Numeric, Computed(EXTRACTED_ESTIMATE_DURATION_MINUTES_SQL, persisted=True))
+    estimate_sla_hours = Column(Numeric, Computed(EXTRACTED_ESTIMATE_SLA_HOURS_SQL, persisted=True))
+    estimate_sla_met = Column(Boolean, Computed(EXTRACTED_ESTIMATE_SLA_MET_SQL, persisted=True))
     
     # Source of the lead (e.g., "telegram", "website", "referral")
     source = Column(String(100), nullable=True)
@@ -111,6 +257,12 @@ class Lead(BaseModel):
     
     # Chat tracking
     last_message_at = Column(DateTime(timezone=True), nullable=True)
+    # Denormalized from the latest chat message, maintained by chat_service
+    last_message_direction = Column(
+        SQLEnum(MessageDirection, name="message_direction", create_type=False),
+        nullable=True
+    )
+    last_message_sender_name = Column(String(255), nullable=True)
     unread_count = Column(Integer, nullable=False, default=0)
     
     # Follow-up tracking
@@ -125,6 +277,21 @@ class Lead(BaseModel):
         nullable=True
     )
     
+    def _get_extracted_data(self):
+        view = self.__dict__.get(VIEW_ATTR)
+        if view is not None:
+            view.flush()
+        return self._extracted_data
+
+    def _set_extracted_data(self, value):
+        self.__dict__.pop(VIEW_ATTR, None)
+        self._extracted_data = value
+
+    extracted_data = synonym(
+        "_extracted_data",
+        descriptor=property(_get_extracted_data, _set_extracted_data),
+    )
+
     # Relationships
     organization = relationship("Organization", back_populates="leads")
     chat_messages = relationship("ChatMessage", back_populates="lead", cascade="all, delete-orphan")
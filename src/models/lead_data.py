@@ -0,0 +1,153 @@
+"""Parsed view of `Lead.extracted_data`, decoded once and serialized once per flush.
+
+A Telegram turn reads the document in many helpers and edits a few keys along the way.
+`lead_data(lead)` caches the parsed dict on the instance; edits mark keys dirty and the
+document is dumped back into the column once, before the session flushes. Reading
+`lead.extracted_data` directly writes pending edits back first, so code that still
+parses the raw column sees them.
+
+Objects that are not mapped leads (tests, detached stand-ins) are written through on
+every edit.
+"""
+import json
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+
+VIEW_ATTR = "_extracted_data_view"
+# Mapped attribute holding the raw column on Lead; plain objects use extracted_data
+RAW_ATTR = "_extracted_data"
+
+_UNSET = object()
+
+
+def parse_extracted_data(value: str | None) -> dict[str, Any]:
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _clone(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+class LeadDataView:
+    def __init__(self, lead: Any) -> None:
+        self._lead = lead
+        self._deferred = hasattr(type(lead), RAW_ATTR)
+        self._raw_attr = RAW_ATTR if self._deferred else "extracted_data"
+        self._raw: Any = _UNSET
+        self._data: dict[str, Any] = {}
+        self._dirty: set[str] = set()
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """The parsed document, shared by every reader of this lead: do not mutate it."""
+        self._sync()
+        return self._data
+
+    @property
+    def dirty_keys(self) -> frozenset[str]:
+        return frozenset(self._dirty)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def section(self, key: str) -> dict[str, Any]:
+        """A nested object of the document, or an empty dict when missing or not an object."""
+        value = self.data.get(key)
+        return value if isinstance(value, dict) else {}
+
+    def copy(self) -> dict[str, Any]:
+        """An independent copy to edit and pass back through `replace`."""
+        return _clone(self.data)
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, changes: Mapping[str, Any]) -> None:
+        data = self.data
+        changed = False
+        for key, value in changes.items():
+            # Containers may have been edited in place, so they always count as changed
+            if isinstance(value, (dict, list)) or key not in data or data[key] != value:
+                data[key] = value
+                self._dirty.add(key)
+                changed = True
+        if changed:
+            self._changed()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        data = self.data
+        if key not in data:
+            return default
+        value = data.pop(key)
+        self._dirty.add(key)
+        self._changed()
+        return value
+
+    def replace(self, document: Mapping[str, Any]) -> None:
+        """Make `document` the whole extracted_data, marking only the keys that differ."""
+        removed: Iterable[str] = [key for key in self.data if key not in document]
+        for key in removed:
+            self._data.pop(key)
+            self._dirty.add(key)
+        if removed:
+            self._changed()
+        self.update(document)
+
+    def flush(self) -> bool:
+        """Serialize pending edits into the column; False when there was nothing to write."""
+        if not self._dirty:
+            return False
+        raw = json.dumps(self._data, ensure_ascii=False)
+        setattr(self._lead, self._raw_attr, raw)
+        self._raw = raw
+        self._dirty.clear()
+        return True
+
+    def _sync(self) -> None:
+        raw = getattr(self._lead, self._raw_attr, None)
+        if raw is self._raw:
+            return
+        # Assigned or reloaded since the last parse; that value supersedes pending edits
+        self._raw = raw
+        self._data = parse_extracted_data(raw)
+        self._dirty.clear()
+
+    def _changed(self) -> None:
+        if not self._deferred:
+            self.flush()
+            return
+        state = inspect(self._lead, raiseerr=False)
+        # Puts a persistent lead into session.dirty so the flush (and write-back) happens;
+        # pending leads are flushed anyway
+        if state is not None and state.persistent and RAW_ATTR in state.dict:
+            flag_modified(self._lead, RAW_ATTR)
+
+
+def lead_data(lead: Any) -> LeadDataView:
+    """The lead's extracted_data view, created on first use and kept on the instance."""
+    view = lead.__dict__.get(VIEW_ATTR)
+    if view is None:
+        view = LeadDataView(lead)
+        lead.__dict__[VIEW_ATTR] = view
+    return view
+
+
+@event.listens_for(Session, "before_flush")
+def _write_back_lead_data(session: Session, _flush_context, _instances) -> None:
+    for instance in (*session.new, *session.dirty):
+        view = instance.__dict__.get(VIEW_ATTR)
+        if view is not None:
+            view.flush()
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from src.models.base import BaseModel
+
+
+class PeriodicTaskState(BaseModel):
+    """Last run and counters of a scheduler task, shared by all worker replicas."""
+
+    __tablename__ = "periodic_task_state"
+
+    name = Column(String(100), nullable=False, unique=True)
+    leader_id = Column(String(255), nullable=True)
+    last_status = Column(String(32), nullable=True)
+    last_started_at = Column(DateTime(timezone=True), nullable=True)
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_duration_ms = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    run_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+    overrun_count = Column(Integer, nullable=False, default=0)
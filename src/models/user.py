@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, BigInteger, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, BigInteger, Integer, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -51,6 +51,8 @@ class User(BaseModel):
     
     # Authentication (for admin/manager web login)
     password_hash = Column(String(255), nullable=True)
+    # Bumped on permission changes; access tokens carry it as the `ver` claim
+    auth_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     organization = relationship("Organization", back_populates="users", foreign_keys=[org_id])
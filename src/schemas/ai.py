@@ -39,6 +39,7 @@ class KnowledgeItemCreate(KnowledgeItemBase):
 class KnowledgeItemResponse(KnowledgeItemBase):
     id: UUID
     org_id: UUID
+    embedding_model: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -52,6 +53,18 @@ class KnowledgeSearchRequest(BaseModel):
     lead_id: Optional[UUID] = None
 
 
+class KnowledgeReembedStatusResponse(BaseModel):
+    target_model: str
+    serving_model: Optional[str] = None
+    total: int
+    migrated: int
+    remaining: int
+    in_progress: bool
+    started_at: Optional[datetime] = None
+    rate_per_minute: Optional[float] = None
+    eta_seconds: Optional[int] = None
+
+
 class TelegramBusinessCardTemplateResponse(BaseModel):
     template: str
     variables: List[str] = Field(default_factory=list)
@@ -36,6 +36,19 @@ class FunnelEventCreate(BaseModel):
     event_data: dict[str, Any] | None = None
 
 
+class FunnelEventBatchItem(BaseModel):
+    event_type: str = Field(min_length=1, max_length=100)
+    step_id: str | None = None
+    event_data: dict[str, Any] | None = None
+
+
+class FunnelEventBatchCreate(BaseModel):
+    """Events of one session in the order they happened, e.g. buffered by the quiz page."""
+
+    session_token: str
+    events: list[FunnelEventBatchItem] = Field(min_length=1, max_length=100)
+
+
 class FunnelEventResponse(BaseModel):
     id: uuid.UUID
     event_type: str
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class JobQueueDepth(BaseModel):
+    job_type: str
+    status: str
+    count: int
+    due: int = 0
+    oldest_run_at: Optional[datetime] = None
+
+
+class JobTypeThroughput(BaseModel):
+    job_type: str
+    done: int
+    failed: int
+    retried: int
+    p95_run_seconds: Optional[float] = None
+    p95_claim_lag_seconds: Optional[float] = None
+
+
+class JobErrorCount(BaseModel):
+    job_type: str
+    error: str
+    count: int
+
+
+class JobRecentError(BaseModel):
+    id: str
+    job_type: str
+    status: str
+    attempts: int
+    max_attempts: int
+    error: str
+    updated_at: datetime
+
+
+class BackgroundJobQueueStats(BaseModel):
+    generated_at: datetime
+    window_minutes: int
+    oldest_runnable_age_seconds: Optional[float] = None
+    depth: List[JobQueueDepth]
+    throughput: List[JobTypeThroughput]
+    error_counts: List[JobErrorCount]
+    recent_errors: List[JobRecentError]
+
+
+class PeriodicTaskStatus(BaseModel):
+    name: str
+    leader_id: Optional[str] = None
+    last_status: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_ms: Optional[int] = None
+    last_error: Optional[str] = None
+    run_count: int
+    failure_count: int
+    overrun_count: int
+
+    class Config:
+        from_attributes = True
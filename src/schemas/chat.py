@@ -48,9 +48,17 @@ class ChatMessageResponse(BaseModel):
 class ChatHistoryResponse(BaseModel):
     """Paginated chat history"""
     messages: List[ChatMessageResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class ChatChangesResponse(BaseModel):
+    """Messages created or updated after a sync token"""
+    messages: List[ChatMessageResponse]
+    next_token: str
+    has_more: bool
 
 
 class SendMessageRequest(BaseModel):
@@ -60,9 +60,51 @@ class LeadResponse(BaseModel):
 class LeadListResponse(BaseModel):
     """Paginated lead list"""
     leads: List[LeadResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class LeadBoardCard(BaseModel):
+    """Fields a kanban card renders"""
+    id: uuid.UUID
+    status: LeadStatus
+    full_name: Optional[str] = None
+    username: Optional[str] = None
+    phone: Optional[str] = None
+    telegram_id: Optional[int] = None
+    avatar_url: Optional[str] = None
+    source: Optional[str] = None
+    ai_summary: Optional[str] = None
+    readiness_score: Optional[str] = None
+    telegram_lookup_status: Optional[str] = None
+    telegram_lookup_error: Optional[str] = None
+    unread_count: int = 0
+    last_message_at: Optional[datetime] = None
+    messengers: Dict[str, bool] = Field(default_factory=dict)
+    whatsapp_wa_id: Optional[str] = None
+
+
+class LeadBoardColumn(BaseModel):
+    """One kanban column: exact count plus the first cards"""
+    status: LeadStatus
+    total: int
+    leads: List[LeadBoardCard]
+    next_cursor: Optional[str] = None
+
+
+class LeadBoardResponse(BaseModel):
+    """Kanban board for every lead status"""
+    columns: List[LeadBoardColumn]
+    total: int
+
+
+class LeadChangesResponse(BaseModel):
+    """Leads created or updated after a sync token"""
+    leads: List[LeadResponse]
+    next_token: str
+    has_more: bool
 
 
 class LeadImportError(BaseModel):
@@ -1,17 +1,19 @@
 from dataclasses import dataclass
 import secrets
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Sequence
 import uuid
 
-from sqlalchemy import distinct, func, select
+from sqlalchemy import and_, case, distinct, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from src.models import FunnelEvent, FunnelSession
 from src.schemas.analytics import (
     AnalyticsEventItem,
     AnalyticsSummary,
     BreakdownItem,
+    FunnelEventBatchItem,
     FunnelSessionCreate,
     FunnelStepMetric,
     MessengerMetric,
@@ -19,6 +21,7 @@ from src.schemas.analytics import (
     QuizStepMetric,
 )
 from src.services.posthog_service import posthog_service
+from src.services.report_cache import report_cache
 
 
 QUIZ_STEP_LABELS = {
@@ -38,6 +41,16 @@ MESSENGER_CLICK_EVENTS: dict[str, tuple[str, ...]] = {
 }
 
 
+MESSENGER_LABELS = {"telegram": "Telegram", "whatsapp": "WhatsApp"}
+MESSENGER_INBOUND_EVENTS = {
+    "telegram": "telegram_message_received",
+    "whatsapp": "whatsapp_message_received",
+}
+
+# Per-step session counts reported for every quiz question
+QUIZ_STEP_EVENT_TYPES = ("quiz_step_viewed", "answer_selected", "quiz_step_hesitated", "quiz_step_back_clicked")
+
+
 def messenger_click_event_names(messenger: str) -> tuple[str, ...]:
     return MESSENGER_CLICK_EVENTS.get(messenger, (f"{messenger}_clicked",))
 
@@ -76,6 +89,101 @@ FUNNEL_STEPS: list[FunnelStepDefinition] = [
 ]
 
 
+def first_touch_metrics() -> dict[tuple[str, str | None], Any]:
+    """Distinct-session metrics of the summary, keyed by (metric, step_id), with their event condition."""
+    metrics: dict[tuple[str, str | None], Any] = {}
+    for step in FUNNEL_STEPS:
+        condition = FunnelEvent.event_type.in_(step.event_types)
+        if step.step_id:
+            condition = condition & (FunnelEvent.step_id == step.step_id)
+        metrics[(step.key, None)] = condition
+    for messenger, inbound_event in MESSENGER_INBOUND_EVENTS.items():
+        metrics[(f"{messenger}_click", None)] = FunnelEvent.event_type.in_(messenger_click_event_names(messenger))
+        metrics[(f"{messenger}_inbound", None)] = FunnelEvent.event_type == inbound_event
+    for event_type in QUIZ_STEP_EVENT_TYPES:
+        for step_id in QUIZ_STEP_LABELS:
+            metrics[(event_type, step_id)] = (FunnelEvent.event_type == event_type) & (FunnelEvent.step_id == step_id)
+    return metrics
+
+
+def first_touch_subquery(filters: list[Any], *columns: Any) -> tuple[Any, dict[tuple[str, str | None], Any]]:
+    """Events joined to their session, reduced to the first event time per session and metric.
+
+    Returns the subquery (grouped by session and `columns`) and the first-time column of every
+    metric, plus "<messenger>_click_inbound": the moment both a click and an inbound message
+    had happened. Counting sessions by the day of that first time makes days additive.
+    """
+    metrics = first_touch_metrics()
+    names = {key: f"first_{index}" for index, key in enumerate(metrics)}
+    per_session = (
+        select(
+            FunnelEvent.session_id,
+            *columns,
+            *(func.min(FunnelEvent.created_at).filter(condition).label(names[key]) for key, condition in metrics.items()),
+        )
+        .join(FunnelSession, FunnelSession.id == FunnelEvent.session_id)
+        .where(*filters)
+        .group_by(FunnelEvent.session_id, *columns)
+        .subquery()
+    )
+    first_times = {key: per_session.c[names[key]] for key in metrics}
+    for messenger in MESSENGER_INBOUND_EVENTS:
+        clicked = first_times[(f"{messenger}_click", None)]
+        wrote = first_times[(f"{messenger}_inbound", None)]
+        first_times[(f"{messenger}_click_inbound", None)] = case(
+            (and_(clicked.is_not(None), wrote.is_not(None)), func.greatest(clicked, wrote))
+        )
+    return per_session, first_times
+
+
+def session_count_select(filters: list[Any], *columns: Any):
+    """Session counts by source/campaign/channel (and `columns`)."""
+    dimensions = (
+        FunnelSession.source.label("source"),
+        FunnelSession.utm_campaign.label("campaign"),
+        FunnelSession.channel.label("channel"),
+    )
+    return (
+        select(
+            *columns,
+            *dimensions,
+            func.count(FunnelSession.id).label("sessions"),
+            func.count(FunnelSession.id).filter(FunnelSession.status == "completed").label("completed"),
+            func.count(FunnelSession.id).filter(FunnelSession.status == "abandoned").label("abandoned"),
+        )
+        .where(*filters)
+        .group_by(*columns, *dimensions)
+    )
+
+
+def answer_option_select(filters: list[Any], *columns: Any):
+    """Quiz answer events per step and option (and `columns`), with time-on-step sums."""
+    value_expr = FunnelEvent.event_data["value"].as_string()
+    label_expr = FunnelEvent.event_data["label"].as_string()
+    time_expr = func.coalesce(
+        FunnelEvent.event_data["time_on_step_ms"].as_integer(),
+        FunnelEvent.event_data["time_to_action_ms"].as_integer(),
+    )
+    return (
+        select(
+            *columns,
+            FunnelEvent.step_id,
+            value_expr.label("value"),
+            label_expr.label("label"),
+            func.count(FunnelEvent.id).label("events"),
+            func.sum(time_expr).label("time_sum_ms"),
+            func.count(time_expr).label("time_count"),
+        )
+        .join(FunnelSession, FunnelSession.id == FunnelEvent.session_id)
+        .where(
+            *filters,
+            FunnelEvent.event_type == "answer_selected",
+            FunnelEvent.step_id.in_(list(QUIZ_STEP_LABELS)),
+        )
+        .group_by(*columns, FunnelEvent.step_id, value_expr, label_expr)
+    )
+
+
 class AnalyticsService:
     async def create_session(
         self,
@@ -117,6 +225,24 @@ class AnalyticsService:
         step_id: str | None = None,
         event_data: dict[str, Any] | None = None,
     ) -> FunnelEvent:
+        events = await self.record_events(
+            db,
+            session_token=session_token,
+            events=[FunnelEventBatchItem(event_type=event_type, step_id=step_id, event_data=event_data)],
+        )
+        return events[0]
+
+    async def record_events(
+        self,
+        db: AsyncSession,
+        session_token: str,
+        events: Sequence[FunnelEventBatchItem],
+    ) -> list[FunnelEvent]:
+        """Append a session's events, in order, with one multi-row insert and one commit.
+
+        The stage engine runs once for the whole batch; PostHog forwarding happens in the
+        background after the commit.
+        """
         result = await db.execute(
             select(FunnelSession).where(FunnelSession.session_token == session_token)
         )
@@ -125,35 +251,31 @@ class AnalyticsService:
             raise ValueError("Funnel session not found")
 
         now = datetime.now(timezone.utc)
-        event = FunnelEvent(
-            org_id=session.org_id,
-            session_id=session.id,
-            lead_id=session.lead_id,
-            event_type=event_type,
-            step_id=step_id,
-            event_data=event_data,
-        )
-        db.add(event)
-
-        session.last_event_at = now
-        if step_id:
-            session.current_step = step_id
-        if event_type == "quiz_completed":
-            session.status = "completed"
-            session.completed_at = now
-        elif event_type == "quiz_abandoned":
-            session.status = "abandoned"
-            session.abandoned_at = now
-        elif event_type == "lead_created" and event_data and event_data.get("lead_id"):
-            try:
-                session.lead_id = uuid.UUID(str(event_data["lead_id"]))
-                event.lead_id = session.lead_id
-            except Exception:
-                pass
+        rows = []
+        for item in events:
+            lead_id = self._advance_session(session, item, now)
+            rows.append(
+                {
+                    "org_id": session.org_id,
+                    "session_id": session.id,
+                    "lead_id": lead_id,
+                    "event_type": item.event_type,
+                    "step_id": item.step_id,
+                    "event_data": item.event_data,
+                }
+            )
+        result = await db.execute(insert(FunnelEvent).returning(FunnelEvent, sort_by_parameter_order=True), rows)
+        recorded = list(result.scalars().all())
 
         await db.flush()
         if session.lead_id:
-            from src.services.lead_stage_engine_service import lead_stage_engine_service
+            from src.services.lead_stage_engine_service import HUMAN_LOCK_OVERRIDE_EVENTS, lead_stage_engine_service
+
+            # A lock-lifting event anywhere in the batch counts, as it would have one at a time
+            event_type = next(
+                (item.event_type for item in reversed(events) if item.event_type in HUMAN_LOCK_OVERRIDE_EVENTS),
+                events[-1].event_type,
+            )
             await lead_stage_engine_service.apply_for_session(
                 db=db,
                 session=session,
@@ -162,13 +284,33 @@ class AnalyticsService:
             )
 
         await db.commit()
-        await db.refresh(event)
-        await posthog_service.capture(
-            distinct_id=session.session_token,
-            event=event_type,
-            properties=self._posthog_properties(session, event, step_id, event_data),
-        )
-        return event
+        await report_cache.bump(session.org_id)
+        for event, item in zip(recorded, events):
+            posthog_service.capture_in_background(
+                distinct_id=session.session_token,
+                event=item.event_type,
+                properties=self._posthog_properties(session, event, item.step_id, item.event_data),
+            )
+        return recorded
+
+    @staticmethod
+    def _advance_session(session: FunnelSession, item: FunnelEventBatchItem, now: datetime) -> uuid.UUID | None:
+        """Apply one event to the session's state; returns the lead the event is recorded for."""
+        session.last_event_at = now
+        if item.step_id:
+            session.current_step = item.step_id
+        if item.event_type == "quiz_completed":
+            session.status = "completed"
+            session.completed_at = now
+        elif item.event_type == "quiz_abandoned":
+            session.status = "abandoned"
+            session.abandoned_at = now
+        elif item.event_type == "lead_created" and item.event_data and item.event_data.get("lead_id"):
+            try:
+                session.lead_id = uuid.UUID(str(item.event_data["lead_id"]))
+            except Exception:
+                pass
+        return session.lead_id
 
     async def get_summary(
         self,
@@ -179,6 +321,8 @@ class AnalyticsService:
         source: str | None = None,
         campaign: str | None = None,
     ) -> AnalyticsSummary:
+        from src.services.funnel_rollup_service import ANSWER_METRIC, funnel_rollup_service
+
         session_filters = [FunnelSession.org_id == org_id]
         event_filters = [FunnelEvent.org_id == org_id]
         if date_from:
@@ -191,63 +335,138 @@ class AnalyticsService:
             session_filters.append(FunnelSession.source == source)
         if campaign:
             session_filters.append(FunnelSession.utm_campaign == campaign)
-
-        session_ids_stmt = select(FunnelSession.id).where(*session_filters)
-        event_filters.append(FunnelEvent.session_id.in_(session_ids_stmt))
-
-        sessions_total = await self._scalar_count(db, select(func.count(FunnelSession.id)).where(*session_filters))
-        sessions_completed = await self._scalar_count(
-            db, select(func.count(FunnelSession.id)).where(*session_filters, FunnelSession.status == "completed")
-        )
-        sessions_abandoned = await self._scalar_count(
-            db, select(func.count(FunnelSession.id)).where(*session_filters, FunnelSession.status == "abandoned")
-        )
-        leads_linked = await self._scalar_count(
-            db, select(func.count(distinct(FunnelSession.lead_id))).where(*session_filters, FunnelSession.lead_id.isnot(None))
+        # Event queries join each event to its session
+        event_filters.extend(session_filters)
+
+        # Closed, compacted days come from the daily rollups; the raw tables are only
+        # scanned for the rest of the range (today, and the partial day date_from falls in)
+        window = await funnel_rollup_service.window(db, date_from=date_from, date_to=date_to)
+        raw_session_filters = list(session_filters)
+        first_touch_filters = list(event_filters)
+        answer_filters = list(event_filters)
+        first_touch_from = None
+        if window is not None:
+            recent = aliased(FunnelEvent)
+            recent_sessions = select(recent.session_id).where(
+                recent.org_id == org_id,
+                recent.created_at >= window.tail_start,
+                *([recent.created_at <= date_to] if date_to else []),
+            )
+            tail_sessions = FunnelSession.created_at >= window.tail_start
+            tail_events = FunnelEvent.created_at >= window.tail_start
+            first_touch_sessions = FunnelEvent.session_id.in_(recent_sessions)
+            if window.cohort_start is not None:
+                # Sessions started before the first rollup day are kept out of the rollups
+                boundary = FunnelSession.created_at < window.cohort_start
+                tail_sessions = or_(boundary, tail_sessions)
+                tail_events = or_(boundary, tail_events)
+                first_touch_sessions = or_(boundary, first_touch_sessions)
+            raw_session_filters.append(tail_sessions)
+            first_touch_filters.append(first_touch_sessions)
+            answer_filters.append(tail_events)
+            first_touch_from = window.tail_start
+
+        session_rows = list((await db.execute(session_count_select(raw_session_filters))).mappings().all())
+        leads_linked = (
+            await db.execute(select(func.count(distinct(FunnelSession.lead_id))).where(*session_filters))
+        ).scalar_one()
+        metric_counts = await self._first_touch_counts(
+            db,
+            first_touch_filters,
+            counted_from=first_touch_from,
+            cohort_start=window.cohort_start if window is not None else None,
         )
-
-        funnel = await self._build_funnel(db, event_filters)
-        sources = await self._breakdown(db, FunnelSession.source, session_filters)
-        campaigns = await self._breakdown(db, FunnelSession.utm_campaign, session_filters)
-        channels = await self._breakdown(db, FunnelSession.channel, session_filters)
-        quiz_answers = await self._quiz_answers(db, event_filters)
-        quiz_steps = await self._quiz_steps(db, event_filters)
-        messenger_metrics = await self._messenger_metrics(db, event_filters)
+        answer_rows = list((await db.execute(answer_option_select(answer_filters))).mappings().all())
+        if window is not None:
+            session_rows += await funnel_rollup_service.read_sessions(db, org_id, window, source=source, campaign=campaign)
+            for row in await funnel_rollup_service.read_metrics(db, org_id, window, source=source, campaign=campaign):
+                if row["metric"] == ANSWER_METRIC:
+                    answer_rows.append(row)
+                else:
+                    key = (row["metric"], row["step_id"])
+                    metric_counts[key] = metric_counts.get(key, 0) + int(row["sessions"] or 0)
         recent_events = await self._recent_events(db, event_filters)
 
+        totals, breakdowns = self._session_totals(session_rows)
+        quiz_answers, step_times = self._quiz_answers(answer_rows)
+        sessions_total = totals["total"]
+        sessions_completed = totals["completed"]
+        funnel = self._build_funnel(metric_counts)
         completion_rate = round((sessions_completed / sessions_total) * 100, 1) if sessions_total else 0.0
         return AnalyticsSummary(
             sessions_total=sessions_total,
             sessions_completed=sessions_completed,
-            sessions_abandoned=sessions_abandoned,
-            leads_linked=leads_linked,
+            sessions_abandoned=totals["abandoned"],
+            leads_linked=int(leads_linked or 0),
             completion_rate=completion_rate,
             funnel=funnel,
-            sources=sources,
-            campaigns=campaigns,
-            channels=channels,
+            sources=breakdowns["source"],
+            campaigns=breakdowns["campaign"],
+            channels=breakdowns["channel"],
             quiz_answers=quiz_answers,
-            quiz_steps=quiz_steps,
-            messenger_metrics=messenger_metrics,
+            quiz_steps=self._quiz_steps(metric_counts, step_times, start_count=funnel[0].count),
+            messenger_metrics=self._messenger_metrics(metric_counts),
             recent_events=recent_events,
         )
 
-    async def _scalar_count(self, db: AsyncSession, stmt) -> int:
-        result = await db.execute(stmt)
-        return int(result.scalar() or 0)
+    @staticmethod
+    def _session_totals(rows: list[Any]) -> tuple[dict[str, int], dict[str, list[BreakdownItem]]]:
+        """Session totals and the top source/campaign/channel breakdowns from per-dimension counts."""
+        totals = {"total": 0, "completed": 0, "abandoned": 0}
+        counts: dict[str, dict[Any, int]] = {name: {} for name in ("source", "campaign", "channel")}
+        for row in rows:
+            sessions = int(row["sessions"] or 0)
+            totals["total"] += sessions
+            totals["completed"] += int(row["completed"] or 0)
+            totals["abandoned"] += int(row["abandoned"] or 0)
+            for name, dimension_counts in counts.items():
+                dimension_counts[row[name]] = dimension_counts.get(row[name], 0) + sessions
+        breakdowns = {
+            name: [
+                BreakdownItem(key=str(key or "unknown"), label=str(key or "Не указано"), count=count)
+                for key, count in sorted(items.items(), key=lambda item: item[1], reverse=True)[:12]
+            ]
+            for name, items in counts.items()
+        }
+        return totals, breakdowns
 
-    async def _build_funnel(self, db: AsyncSession, filters: list[Any]) -> list[FunnelStepMetric]:
+    async def _first_touch_counts(
+        self,
+        db: AsyncSession,
+        filters: list[Any],
+        counted_from: datetime | None = None,
+        cohort_start: datetime | None = None,
+    ) -> dict[tuple[str, str | None], int]:
+        """Distinct sessions per funnel step, messenger outcome and quiz step event, from one pass.
+
+        Each session is reduced to the time of its first event per metric. With `counted_from`
+        only sessions whose first event falls at or after it are counted (earlier ones are in
+        the rollups), except sessions started before `cohort_start`, which rollups leave out.
+        """
+        per_session, first_times = first_touch_subquery(
+            filters, FunnelSession.created_at.label("session_created_at")
+        )
+        counts = {}
+        for key, first_at in first_times.items():
+            counted = first_at.is_not(None) if counted_from is None else first_at >= counted_from
+            if cohort_start is not None:
+                counted = or_(
+                    counted,
+                    and_(first_at.is_not(None), per_session.c.session_created_at < cohort_start),
+                )
+            counts[key] = func.count().filter(counted)
+        names = {key: f"m{index}" for index, key in enumerate(counts)}
+        result = await db.execute(select(*(count.label(names[key]) for key, count in counts.items())))
+        row = result.mappings().one()
+        return {key: int(row[names[key]] or 0) for key in counts}
+
+    @staticmethod
+    def _build_funnel(metric_counts: dict[tuple[str, str | None], int]) -> list[FunnelStepMetric]:
         previous = None
         start = None
         rows: list[FunnelStepMetric] = []
         for step in FUNNEL_STEPS:
-            event_filter = FunnelEvent.event_type.in_(step.event_types)
-            if step.step_id:
-                event_filter = event_filter & (FunnelEvent.step_id == step.step_id)
-            count = await self._scalar_count(
-                db,
-                select(func.count(distinct(FunnelEvent.session_id))).where(*filters, event_filter),
-            )
+            count = metric_counts.get((step.key, None), 0)
             if start is None:
                 start = count
             rows.append(
@@ -262,54 +481,46 @@ class AnalyticsService:
             previous = count
         return rows
 
-    async def _breakdown(self, db: AsyncSession, column, filters: list[Any]) -> list[BreakdownItem]:
-        result = await db.execute(
-            select(column, func.count(FunnelSession.id))
-            .where(*filters)
-            .group_by(column)
-            .order_by(func.count(FunnelSession.id).desc())
-            .limit(12)
-        )
-        return [
-            BreakdownItem(key=str(key or "unknown"), label=str(key or "Не указано"), count=int(count or 0))
-            for key, count in result.all()
-        ]
-
-    async def _quiz_answers(self, db: AsyncSession, filters: list[Any]) -> list[QuizAnswerBreakdown]:
-        items: list[QuizAnswerBreakdown] = []
-        for step_id, label in QUIZ_STEP_LABELS.items():
-            value_expr = FunnelEvent.event_data["value"].as_string()
-            label_expr = FunnelEvent.event_data["label"].as_string()
-            result = await db.execute(
-                select(
-                    value_expr,
-                    label_expr,
-                    func.count(FunnelEvent.id),
-                )
-                .where(*filters, FunnelEvent.event_type == "answer_selected", FunnelEvent.step_id == step_id)
-                .group_by(value_expr, label_expr)
-                .order_by(func.count(FunnelEvent.id).desc())
-                .limit(10)
+    @staticmethod
+    def _quiz_answers(rows: list[Any]) -> tuple[list[QuizAnswerBreakdown], dict[str, int]]:
+        """Top answer options per quiz step and the average answer time per step."""
+        answers: dict[str, dict[tuple[Any, Any], int]] = {step_id: {} for step_id in QUIZ_STEP_LABELS}
+        times: dict[str, list[int]] = {}
+        for row in rows:
+            step_id = row["step_id"]
+            if step_id not in answers:
+                continue
+            option = (row["value"], row["label"])
+            answers[step_id][option] = answers[step_id].get(option, 0) + int(row["events"] or 0)
+            step_time = times.setdefault(step_id, [0, 0])
+            step_time[0] += int(row["time_sum_ms"] or 0)
+            step_time[1] += int(row["time_count"] or 0)
+        quiz_answers = [
+            QuizAnswerBreakdown(
+                step_id=step_id,
+                label=label,
+                options=[
+                    BreakdownItem(key=str(value or "unknown"), label=str(option_label or value or "Не указано"), count=count)
+                    for (value, option_label), count in sorted(
+                        answers[step_id].items(), key=lambda item: item[1], reverse=True
+                    )[:10]
+                ],
             )
-            options = [
-                BreakdownItem(key=str(value or "unknown"), label=str(option_label or value or "Не указано"), count=int(count or 0))
-                for value, option_label, count in result.all()
-            ]
-            items.append(QuizAnswerBreakdown(step_id=step_id, label=label, options=options))
-        return items
-
-    async def _quiz_steps(self, db: AsyncSession, filters: list[Any]) -> list[QuizStepMetric]:
-        start_count = await self._scalar_count(
-            db,
-            select(func.count(distinct(FunnelEvent.session_id))).where(*filters, FunnelEvent.event_type == "quiz_opened"),
-        )
+            for step_id, label in QUIZ_STEP_LABELS.items()
+        ]
+        step_times = {step_id: int(total / count) for step_id, (total, count) in times.items() if count}
+        return quiz_answers, step_times
+
+    @staticmethod
+    def _quiz_steps(
+        step_counts: dict[tuple[str, str | None], int],
+        step_times: dict[str, int],
+        start_count: int,
+    ) -> list[QuizStepMetric]:
         rows: list[QuizStepMetric] = []
         for index, (step_id, label) in enumerate(QUIZ_STEP_LABELS.items(), start=1):
-            viewed = await self._count_step_sessions(db, filters, "quiz_step_viewed", step_id)
-            answered = await self._count_step_sessions(db, filters, "answer_selected", step_id)
-            hesitations = await self._count_step_sessions(db, filters, "quiz_step_hesitated", step_id)
-            back_clicks = await self._count_step_sessions(db, filters, "quiz_step_back_clicked", step_id)
-            avg_time = await self._avg_step_time(db, filters, step_id)
+            viewed = step_counts.get(("quiz_step_viewed", step_id), 0)
+            answered = step_counts.get(("answer_selected", step_id), 0)
             rows.append(
                 QuizStepMetric(
                     step_id=step_id,
@@ -320,62 +531,19 @@ class AnalyticsService:
                     dropoffs_after_view=max(viewed - answered, 0),
                     answer_rate=round((answered / viewed) * 100, 1) if viewed else 0.0,
                     conversion_from_start=round((viewed / start_count) * 100, 1) if start_count else None,
-                    hesitations=hesitations,
-                    back_clicks=back_clicks,
-                    avg_time_on_step_ms=avg_time,
+                    hesitations=step_counts.get(("quiz_step_hesitated", step_id), 0),
+                    back_clicks=step_counts.get(("quiz_step_back_clicked", step_id), 0),
+                    avg_time_on_step_ms=step_times.get(step_id),
                 )
             )
         return rows
 
-    async def _count_step_sessions(self, db: AsyncSession, filters: list[Any], event_type: str, step_id: str) -> int:
-        return await self._scalar_count(
-            db,
-            select(func.count(distinct(FunnelEvent.session_id))).where(
-                *filters,
-                FunnelEvent.event_type == event_type,
-                FunnelEvent.step_id == step_id,
-            ),
-        )
-
-    async def _avg_step_time(self, db: AsyncSession, filters: list[Any], step_id: str) -> int | None:
-        time_expr = func.coalesce(
-            FunnelEvent.event_data["time_on_step_ms"].as_integer(),
-            FunnelEvent.event_data["time_to_action_ms"].as_integer(),
-        )
-        result = await db.execute(
-            select(func.avg(time_expr)).where(
-                *filters,
-                FunnelEvent.event_type == "answer_selected",
-                FunnelEvent.step_id == step_id,
-                time_expr.isnot(None),
-            )
-        )
-        value = result.scalar()
-        return int(value) if value is not None else None
-
-    async def _messenger_metrics(self, db: AsyncSession, filters: list[Any]) -> list[MessengerMetric]:
+    @staticmethod
+    def _messenger_metrics(metric_counts: dict[tuple[str, str | None], int]) -> list[MessengerMetric]:
         rows: list[MessengerMetric] = []
-        configs = [
-            ("telegram", "Telegram", messenger_click_event_names("telegram"), "telegram_message_received"),
-            ("whatsapp", "WhatsApp", messenger_click_event_names("whatsapp"), "whatsapp_message_received"),
-        ]
-        for messenger, label, click_events, inbound_event in configs:
-            clicked_session_ids = select(FunnelEvent.session_id).where(*filters, FunnelEvent.event_type.in_(click_events))
-            clicks = await self._scalar_count(
-                db,
-                select(func.count(distinct(FunnelEvent.session_id))).where(
-                    *filters,
-                    FunnelEvent.event_type.in_(click_events),
-                ),
-            )
-            inbound = await self._scalar_count(
-                db,
-                select(func.count(distinct(FunnelEvent.session_id))).where(
-                    *filters,
-                    FunnelEvent.event_type == inbound_event,
-                    FunnelEvent.session_id.in_(clicked_session_ids),
-                ),
-            )
+        for messenger, label in MESSENGER_LABELS.items():
+            clicks = metric_counts.get((f"{messenger}_click", None), 0)
+            inbound = metric_counts.get((f"{messenger}_click_inbound", None), 0)
             rows.append(
                 MessengerMetric(
                     messenger=messenger,
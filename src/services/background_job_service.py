@@ -2,20 +2,97 @@ import asyncio
 import json
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, case, delete, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import AsyncSessionLocal
+from src.database import AsyncSessionLocal, engine
 from src.models import BackgroundJob
 
 logger = logging.getLogger(__name__)
 
+BACKGROUND_JOBS_CHANNEL = "background_jobs"
+ARCHIVE_JOB_TYPE = "background_jobs_archive"
+
+# Inlined literals (not bind params) so the planner matches the partial indexes
+RUNNABLE_FILTER = text("background_jobs.status IN ('queued', 'retry')")
+RUNNING_FILTER = text("background_jobs.status = 'running'")
+
+
+class RescheduleJob(Exception):
+    """Raised by a job handler to run the same job again at `run_at` instead of finishing it."""
+
+    def __init__(self, run_at: datetime, payload: dict[str, Any] | None = None) -> None:
+        super().__init__(f"rescheduled to {run_at.isoformat()}")
+        self.run_at = run_at
+        self.payload = payload
+
+
+class BackgroundJobWakeup:
+    """LISTENs on the job channel so the loop wakes as soon as a job is enqueued."""
+
+    def __init__(self, channel: str = BACKGROUND_JOBS_CHANNEL) -> None:
+        self.channel = channel
+        self.event = asyncio.Event()
+        self._connection = None
+        self._driver_connection = None
+
+    @property
+    def listening(self) -> bool:
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    async def start(self) -> bool:
+        if self.listening:
+            return True
+        await self.close()
+        try:
+            connection = await engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self._on_notify)
+        except Exception as exc:
+            logger.warning("Background job LISTEN unavailable, falling back to polling: %s", exc)
+            return False
+        self._connection = connection
+        self._driver_connection = driver_connection
+        logger.info("Background job loop listening on channel %s", self.channel)
+        return True
+
+    def _on_notify(self, _connection, _pid, _channel, _payload) -> None:
+        self.event.set()
+
+    async def wait(self, stop_event: asyncio.Event, timeout: float) -> None:
+        if timeout <= 0 or self.event.is_set() or stop_event.is_set():
+            return
+        waiters = [asyncio.ensure_future(stop_event.wait()), asyncio.ensure_future(self.event.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def close(self) -> None:
+        connection, self._connection, self._driver_connection = self._connection, None, None
+        if connection is None:
+            return
+        try:
+            await connection.close()
+        except Exception as exc:
+            logger.debug("Failed to close background job listener connection: %s", exc)
+
 
 class BackgroundJobService:
+    STATS_CACHE_SECONDS = 5
+
+    def __init__(self) -> None:
+        self._stats_cache: dict[tuple[int, int], tuple[float, Any]] = {}
+
     async def enqueue(
         self,
         db: AsyncSession,
@@ -23,17 +100,83 @@ class BackgroundJobService:
         payload: dict[str, Any],
         max_attempts: int = 3,
         run_at: datetime | None = None,
+        dedup_key: str | None = None,
+        replace_existing: bool = False,
     ) -> BackgroundJob:
-        job = BackgroundJob(
+        """Queue a job; a job with the same dedup_key is not queued twice.
+
+        With replace_existing, a duplicate carrying a different payload re-arms the
+        existing row (new payload/run_at, attempts reset) unless it is running now.
+        """
+        now = datetime.now(timezone.utc)
+        run_at = run_at or now
+        if not dedup_key:
+            job = BackgroundJob(
+                job_type=job_type,
+                payload=payload,
+                max_attempts=max(1, max_attempts),
+                run_at=run_at,
+            )
+            db.add(job)
+            if job.run_at <= now:
+                # Delivered on commit; delayed jobs are picked up by the scheduled wake-up
+                await db.execute(select(func.pg_notify(BACKGROUND_JOBS_CHANNEL, job_type)))
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+        stmt = pg_insert(BackgroundJob).values(
+            id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
             job_type=job_type,
+            status="queued",
             payload=payload,
+            attempts=0,
             max_attempts=max(1, max_attempts),
-            run_at=run_at or datetime.now(timezone.utc),
+            run_at=run_at,
+            dedup_key=dedup_key,
         )
-        db.add(job)
+        conflict_target = {
+            "index_elements": [BackgroundJob.dedup_key],
+            "index_where": BackgroundJob.dedup_key.isnot(None),
+        }
+        if replace_existing:
+            stmt = stmt.on_conflict_do_update(
+                **conflict_target,
+                set_={
+                    "job_type": stmt.excluded.job_type,
+                    "status": "queued",
+                    "payload": stmt.excluded.payload,
+                    "attempts": 0,
+                    "max_attempts": stmt.excluded.max_attempts,
+                    "run_at": stmt.excluded.run_at,
+                    "locked_at": None,
+                    "finished_at": None,
+                    "last_error": None,
+                    "updated_at": now,
+                },
+                where=and_(
+                    BackgroundJob.status != "running",
+                    BackgroundJob.payload.is_distinct_from(stmt.excluded.payload),
+                ),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(**conflict_target)
+        result = await db.execute(stmt.returning(BackgroundJob.id))
+        written_id = result.scalar_one_or_none()
+        if written_id is None:
+            logger.info("Background job %s deduplicated: key=%s", job_type, dedup_key)
+        elif run_at <= now:
+            await db.execute(select(func.pg_notify(BACKGROUND_JOBS_CHANNEL, job_type)))
         await db.commit()
-        await db.refresh(job)
-        return job
+
+        existing = await db.execute(
+            select(BackgroundJob)
+            .where(BackgroundJob.dedup_key == dedup_key)
+            .execution_options(populate_existing=True)
+        )
+        return existing.scalar_one()
 
     async def enqueue_knowledge_index(
         self,
@@ -56,38 +199,18 @@ class BackgroundJobService:
             },
         )
 
-    async def claim_jobs(self, db: AsyncSession, batch_size: int) -> list[BackgroundJob]:
-        from src.config import settings
-
+    async def claim_jobs(
+        self,
+        db: AsyncSession,
+        batch_size: int,
+        exclude_types: list[str] | None = None,
+    ) -> list[BackgroundJob]:
         now = datetime.now(timezone.utc)
-        stale_before = now - timedelta(seconds=max(60, settings.background_job_lock_timeout_seconds))
-        await db.execute(
-            update(BackgroundJob)
-            .where(
-                BackgroundJob.status == "running",
-                BackgroundJob.locked_at.isnot(None),
-                BackgroundJob.locked_at < stale_before,
-                BackgroundJob.attempts < BackgroundJob.max_attempts,
-            )
-            .values(status="retry", locked_at=None, run_at=now)
-        )
-        await db.execute(
-            update(BackgroundJob)
-            .where(
-                BackgroundJob.status == "running",
-                BackgroundJob.locked_at.isnot(None),
-                BackgroundJob.locked_at < stale_before,
-                BackgroundJob.attempts >= BackgroundJob.max_attempts,
-            )
-            .values(status="failed", locked_at=None, finished_at=now, last_error="Job lock expired")
-        )
-
+        claim_stmt = select(BackgroundJob).where(RUNNABLE_FILTER, BackgroundJob.run_at <= now)
+        if exclude_types:
+            claim_stmt = claim_stmt.where(BackgroundJob.job_type.notin_(exclude_types))
         result = await db.execute(
-            select(BackgroundJob)
-            .where(
-                BackgroundJob.status.in_(["queued", "retry"]),
-                BackgroundJob.run_at <= now,
-            )
+            claim_stmt
             .order_by(BackgroundJob.run_at.asc(), BackgroundJob.created_at.asc())
             .limit(batch_size)
             .with_for_update(skip_locked=True)
@@ -101,6 +224,273 @@ class BackgroundJobService:
         await db.commit()
         return jobs
 
+    async def next_run_at(self, db: AsyncSession, exclude_types: list[str] | None = None) -> datetime | None:
+        """Earliest run_at among jobs the loop could claim; saturated types wait for a free slot."""
+        stmt = select(func.min(BackgroundJob.run_at)).where(RUNNABLE_FILTER)
+        if exclude_types:
+            stmt = stmt.where(BackgroundJob.job_type.notin_(exclude_types))
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def recover_stale_jobs(self, db: AsyncSession) -> int:
+        """Requeue (or fail, when out of attempts) jobs whose worker lock expired."""
+        from src.config import settings
+
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=max(60, settings.background_job_lock_timeout_seconds))
+        exhausted = BackgroundJob.attempts >= BackgroundJob.max_attempts
+        result = await db.execute(
+            update(BackgroundJob)
+            .where(RUNNING_FILTER, BackgroundJob.locked_at < stale_before)
+            .values(
+                status=case((exhausted, "failed"), else_="retry"),
+                locked_at=None,
+                run_at=case((exhausted, BackgroundJob.run_at), else_=now),
+                finished_at=case((exhausted, now), else_=BackgroundJob.finished_at),
+                last_error=case((exhausted, "Job lock expired"), else_=BackgroundJob.last_error),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+    async def archive_finished_jobs(self, db: AsyncSession, batch_size: int, retention_days: int) -> int:
+        """Move one batch of old done/failed jobs into background_jobs_archive.
+
+        An id already in the archive takes the deleted live row's values, so no row is lost.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max(0, retention_days))
+        result = await db.execute(
+            text(
+                """
+                WITH moved AS (
+                    DELETE FROM background_jobs
+                    WHERE id IN (
+                        SELECT id FROM background_jobs
+                        WHERE status IN ('done', 'failed') AND finished_at < :cutoff
+                        ORDER BY finished_at
+                        LIMIT :batch_size
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, created_at, updated_at, job_type, status, payload, attempts,
+                              max_attempts, run_at, locked_at, finished_at, last_error, dedup_key
+                )
+                INSERT INTO background_jobs_archive (
+                    id, created_at, updated_at, job_type, status, payload, attempts,
+                    max_attempts, run_at, locked_at, finished_at, last_error, dedup_key
+                )
+                SELECT * FROM moved
+                ON CONFLICT (id) DO UPDATE SET
+                    created_at = EXCLUDED.created_at, updated_at = EXCLUDED.updated_at,
+                    job_type = EXCLUDED.job_type, status = EXCLUDED.status, payload = EXCLUDED.payload,
+                    attempts = EXCLUDED.attempts, max_attempts = EXCLUDED.max_attempts,
+                    run_at = EXCLUDED.run_at, locked_at = EXCLUDED.locked_at,
+                    finished_at = EXCLUDED.finished_at, last_error = EXCLUDED.last_error,
+                    dedup_key = EXCLUDED.dedup_key
+                """
+            ),
+            {"cutoff": cutoff, "batch_size": max(1, batch_size)},
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+    async def purge_archive(self, db: AsyncSession, retention_days: int) -> int:
+        from src.models import BackgroundJobArchive
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max(1, retention_days))
+        result = await db.execute(delete(BackgroundJobArchive).where(BackgroundJobArchive.finished_at < cutoff))
+        await db.commit()
+        return result.rowcount or 0
+
+    async def ensure_archive_job(self, db: AsyncSession) -> None:
+        pending = await db.execute(
+            select(BackgroundJob.id)
+            .where(RUNNABLE_FILTER, BackgroundJob.job_type == ARCHIVE_JOB_TYPE)
+            .limit(1)
+        )
+        if pending.first() is None:
+            await self.enqueue(db=db, job_type=ARCHIVE_JOB_TYPE, payload={}, max_attempts=1)
+
+    async def release_jobs(self, db: AsyncSession, job_ids: list[uuid.UUID]) -> int:
+        """Return claimed but unfinished jobs to the queue without consuming an attempt."""
+        if not job_ids:
+            return 0
+        result = await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id.in_(job_ids), BackgroundJob.status == "running")
+            .values(
+                status="retry",
+                locked_at=None,
+                run_at=datetime.now(timezone.utc),
+                attempts=func.greatest(BackgroundJob.attempts - 1, 0),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+    async def cancel_job(self, db: AsyncSession, dedup_key: str) -> int:
+        """Drop a pending job by dedup key; a running one finishes and re-checks its state.
+
+        Does not commit, so callers can cancel within their own transaction.
+        """
+        result = await db.execute(
+            delete(BackgroundJob)
+            .where(BackgroundJob.dedup_key == dedup_key, RUNNABLE_FILTER)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    async def reschedule(self, db: AsyncSession, job: BackgroundJob, reschedule: RescheduleJob) -> None:
+        job.status = "queued"
+        job.run_at = reschedule.run_at
+        job.locked_at = None
+        job.attempts = 0
+        job.last_error = None
+        if reschedule.payload is not None:
+            job.payload = reschedule.payload
+        await db.commit()
+
+    async def get_queue_stats(
+        self,
+        db: AsyncSession,
+        window_minutes: int = 60,
+        recent_errors_limit: int = 20,
+    ):
+        """Queue depth, throughput and errors; every query is served by a partial index."""
+        from src.schemas.background_job import (
+            BackgroundJobQueueStats,
+            JobErrorCount,
+            JobQueueDepth,
+            JobRecentError,
+            JobTypeThroughput,
+        )
+
+        window_minutes = max(1, min(window_minutes, 24 * 60))
+        cache_key = (window_minutes, recent_errors_limit)
+        cached = self._stats_cache.get(cache_key)
+        loop_time = asyncio.get_running_loop().time()
+        if cached and loop_time - cached[0] < self.STATS_CACHE_SECONDS:
+            return cached[1]
+
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(minutes=window_minutes)
+
+        depth_result = await db.execute(
+            select(
+                BackgroundJob.job_type,
+                BackgroundJob.status,
+                func.count(BackgroundJob.id),
+                func.count(BackgroundJob.id).filter(BackgroundJob.run_at <= now),
+                func.min(BackgroundJob.run_at),
+            )
+            .where(or_(RUNNABLE_FILTER, RUNNING_FILTER))
+            .group_by(BackgroundJob.job_type, BackgroundJob.status)
+            .order_by(BackgroundJob.job_type, BackgroundJob.status)
+        )
+        depth = [
+            JobQueueDepth(job_type=job_type, status=status, count=count, due=due, oldest_run_at=oldest_run_at)
+            for job_type, status, count, due, oldest_run_at in depth_result.all()
+        ]
+        due_run_ats = [
+            row.oldest_run_at
+            for row in depth
+            if row.status in ("queued", "retry") and row.oldest_run_at and row.oldest_run_at <= now
+        ]
+        oldest_runnable_age = (now - min(due_run_ats)).total_seconds() if due_run_ats else None
+
+        is_done = BackgroundJob.status == "done"
+        run_seconds = func.extract("epoch", BackgroundJob.finished_at - BackgroundJob.locked_at)
+        claim_lag_seconds = func.extract("epoch", BackgroundJob.locked_at - BackgroundJob.run_at)
+        throughput_result = await db.execute(
+            select(
+                BackgroundJob.job_type,
+                func.count(BackgroundJob.id).filter(is_done),
+                func.count(BackgroundJob.id).filter(BackgroundJob.status == "failed"),
+                func.count(BackgroundJob.id).filter(BackgroundJob.attempts > 1),
+                func.percentile_cont(0.95).within_group(case((is_done, run_seconds))),
+                func.percentile_cont(0.95).within_group(case((is_done, claim_lag_seconds))),
+            )
+            .where(text("background_jobs.status IN ('done', 'failed')"), BackgroundJob.finished_at >= since)
+            .group_by(BackgroundJob.job_type)
+            .order_by(BackgroundJob.job_type)
+        )
+        throughput = [
+            JobTypeThroughput(
+                job_type=job_type,
+                done=done,
+                failed=failed,
+                retried=retried,
+                p95_run_seconds=round(float(p95_run), 3) if p95_run is not None else None,
+                p95_claim_lag_seconds=round(float(p95_lag), 3) if p95_lag is not None else None,
+            )
+            for job_type, done, failed, retried, p95_run, p95_lag in throughput_result.all()
+        ]
+
+        error_filter = or_(
+            and_(text("background_jobs.status = 'failed'"), BackgroundJob.finished_at >= since),
+            and_(text("background_jobs.status = 'retry'"), BackgroundJob.last_error.isnot(None)),
+        )
+        errors = (
+            select(BackgroundJob.job_type, self._error_signature_expr().label("error"))
+            .where(error_filter)
+            .subquery()
+        )
+        error_counts_result = await db.execute(
+            select(errors.c.job_type, errors.c.error, func.count().label("count"))
+            .group_by(errors.c.job_type, errors.c.error)
+            .order_by(func.count().desc(), errors.c.job_type)
+        )
+        error_rows = []
+        if recent_errors_limit > 0:
+            errors_result = await db.execute(
+                select(
+                    BackgroundJob.id,
+                    BackgroundJob.job_type,
+                    BackgroundJob.status,
+                    BackgroundJob.attempts,
+                    BackgroundJob.max_attempts,
+                    BackgroundJob.last_error,
+                    BackgroundJob.updated_at,
+                )
+                .where(error_filter)
+                .order_by(BackgroundJob.updated_at.desc())
+                .limit(recent_errors_limit)
+            )
+            error_rows = errors_result.all()
+
+        stats = BackgroundJobQueueStats(
+            generated_at=now,
+            window_minutes=window_minutes,
+            oldest_runnable_age_seconds=round(oldest_runnable_age, 3) if oldest_runnable_age is not None else None,
+            depth=depth,
+            throughput=throughput,
+            error_counts=[
+                JobErrorCount(job_type=job_type, error=error, count=count)
+                for job_type, error, count in error_counts_result.all()
+            ],
+            recent_errors=[
+                JobRecentError(
+                    id=str(row.id),
+                    job_type=row.job_type,
+                    status=row.status,
+                    attempts=row.attempts,
+                    max_attempts=row.max_attempts,
+                    error=str(row.last_error or "")[:1000],
+                    updated_at=row.updated_at,
+                )
+                for row in error_rows
+            ],
+        )
+        self._stats_cache[cache_key] = (loop_time, stats)
+        return stats
+
+    @staticmethod
+    def _error_signature_expr():
+        """First line of last_error, cut to 160 characters, so errors group by their message."""
+        first_line = func.rtrim(func.split_part(func.btrim(BackgroundJob.last_error), "\n", 1), "\r")
+        return func.coalesce(func.nullif(func.left(first_line, 160), ""), "unknown")
+
     async def mark_done(self, db: AsyncSession, job: BackgroundJob) -> None:
         job.status = "done"
         job.finished_at = datetime.now(timezone.utc)
@@ -128,8 +518,33 @@ class BackgroundJobService:
         if job.job_type == "measurement_telegram_reminder":
             await self._process_measurement_telegram_reminder(db, job.payload)
             return
+        if job.job_type == ARCHIVE_JOB_TYPE:
+            await self._process_archive(db)
+            return
+        if job.job_type == "knowledge_reembed":
+            from src.services.knowledge_reembedding_service import knowledge_reembedding_service
+
+            await knowledge_reembedding_service.process_batch(db, job.payload)
+            return
+        if job.job_type == "lead_followup":
+            from src.services.followup_service import process_lead_followup_job
+
+            await process_lead_followup_job(db, job.payload)
+            return
         raise ValueError(f"Unknown background job type: {job.job_type}")
 
+    async def _process_archive(self, db: AsyncSession) -> None:
+        from src.config import settings
+
+        batch_size = max(1, settings.background_job_archive_batch_size)
+        moved = await self.archive_finished_jobs(db, batch_size, settings.background_job_retention_days)
+        if moved >= batch_size:
+            # More history left: continue in a fresh job so one run never holds locks for long
+            await self.enqueue(db=db, job_type=ARCHIVE_JOB_TYPE, payload={}, max_attempts=1)
+            return
+        purged = await self.purge_archive(db, settings.background_job_archive_retention_days)
+        logger.info("Background job retention: archived=%s purged_from_archive=%s", moved, purged)
+
     async def _process_knowledge_index(self, db: AsyncSession, payload: dict[str, Any]) -> None:
         from src.services.knowledge_service import knowledge_service
 
@@ -143,7 +558,7 @@ class BackgroundJobService:
         )
 
     async def _process_quiz_abandoned_telegram_followup(self, db: AsyncSession, payload: dict[str, Any]) -> None:
-        from src.models import ChatMessage, FunnelEvent, FunnelSession, Lead, MessageStatus, MessageTransport
+        from src.models import FunnelEvent, FunnelSession, Lead, MessageStatus, MessageTransport
         from src.services.chat_service import chat_service
         from src.services.user_bot_service import user_bot_service
 
@@ -182,13 +597,6 @@ class BackgroundJobService:
             logger.info("Skipping quiz abandoned follow-up: session %s already reached Telegram/completion", session_token)
             return
 
-        history_result = await db.execute(select(ChatMessage).where(ChatMessage.lead_id == lead.id))
-        for message in history_result.scalars().all():
-            metadata = message.ai_metadata if isinstance(message.ai_metadata, dict) else {}
-            if metadata.get("type") == "quiz_abandoned_telegram_followup" and metadata.get("session_token") == session_token:
-                logger.info("Skipping quiz abandoned follow-up: already sent for session %s", session_token)
-                return
-
         client_name = (lead.full_name or "").strip()
         greeting = f"{client_name}, здравствуйте!" if client_name else "Здравствуйте!"
         text = (
@@ -287,38 +695,247 @@ class BackgroundJobService:
 background_job_service = BackgroundJobService()
 
 
+def render_queue_metrics(stats) -> str:
+    """Prometheus text exposition of BackgroundJobService.get_queue_stats()."""
+
+    def label(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+    lines = [
+        "# HELP background_jobs_depth Jobs waiting or running by type and status.",
+        "# TYPE background_jobs_depth gauge",
+    ]
+    for row in stats.depth:
+        lines.append(f'background_jobs_depth{{job_type="{label(row.job_type)}",status="{row.status}"}} {row.count}')
+    lines += [
+        "# HELP background_jobs_due Queued jobs whose run_at has passed, i.e. the backlog not yet claimed.",
+        "# TYPE background_jobs_due gauge",
+    ]
+    for row in stats.depth:
+        if row.status in ("queued", "retry"):
+            lines.append(f'background_jobs_due{{job_type="{label(row.job_type)}",status="{row.status}"}} {row.due}')
+    lines += [
+        "# HELP background_jobs_oldest_runnable_age_seconds Age of the oldest due job not yet claimed.",
+        "# TYPE background_jobs_oldest_runnable_age_seconds gauge",
+        f"background_jobs_oldest_runnable_age_seconds {stats.oldest_runnable_age_seconds or 0}",
+        f"# HELP background_jobs_finished Jobs finished in the last {stats.window_minutes} minutes.",
+        "# TYPE background_jobs_finished gauge",
+    ]
+    for row in stats.throughput:
+        job_type = label(row.job_type)
+        lines.append(f'background_jobs_finished{{job_type="{job_type}",status="done"}} {row.done}')
+        lines.append(f'background_jobs_finished{{job_type="{job_type}",status="failed"}} {row.failed}')
+    lines += [
+        f"# HELP background_jobs_retried Jobs finished in the last {stats.window_minutes} minutes after more than one attempt.",
+        "# TYPE background_jobs_retried gauge",
+    ]
+    for row in stats.throughput:
+        lines.append(f'background_jobs_retried{{job_type="{label(row.job_type)}"}} {row.retried}')
+    lines += [
+        "# HELP background_jobs_run_seconds_p95 95th percentile run time of jobs done in the window.",
+        "# TYPE background_jobs_run_seconds_p95 gauge",
+    ]
+    for row in stats.throughput:
+        if row.p95_run_seconds is not None:
+            lines.append(f'background_jobs_run_seconds_p95{{job_type="{label(row.job_type)}"}} {row.p95_run_seconds}')
+    lines += [
+        "# HELP background_jobs_claim_lag_seconds_p95 95th percentile delay between run_at and claim of jobs done in the window.",
+        "# TYPE background_jobs_claim_lag_seconds_p95 gauge",
+    ]
+    for row in stats.throughput:
+        if row.p95_claim_lag_seconds is not None:
+            lines.append(
+                f'background_jobs_claim_lag_seconds_p95{{job_type="{label(row.job_type)}"}} {row.p95_claim_lag_seconds}'
+            )
+    lines += [
+        "# HELP background_jobs_errors Failed jobs in the window and pending retries, by first error line.",
+        "# TYPE background_jobs_errors gauge",
+    ]
+    for row in stats.error_counts:
+        lines.append(
+            f'background_jobs_errors{{job_type="{label(row.job_type)}",error="{label(row.error[:80])}"}} {row.count}'
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_job_type_limits(raw_value: str | None) -> dict[str, int]:
+    """Parse "job_type:N,other_type:M" settings into a mapping."""
+    limits: dict[str, int] = {}
+    for item in str(raw_value or "").split(","):
+        job_type, _, value = item.strip().partition(":")
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            continue
+        if job_type.strip() and limit > 0:
+            limits[job_type.strip()] = limit
+    return limits
+
+
+class BackgroundJobExecutor:
+    """Runs claimed jobs concurrently, each on its own session, within per-type limits."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        type_limits: dict[str, int] | None = None,
+        default_timeout_seconds: float = 300,
+        type_timeouts: dict[str, int] | None = None,
+        on_slot_freed=None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.type_limits = type_limits or {}
+        self.default_timeout_seconds = default_timeout_seconds
+        self.type_timeouts = type_timeouts or {}
+        self.on_slot_freed = on_slot_freed
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+        self._running_by_type: dict[str, int] = defaultdict(int)
+
+    @property
+    def free_slots(self) -> int:
+        return max(0, self.max_concurrency - len(self._tasks))
+
+    def saturated_types(self) -> list[str]:
+        return [job_type for job_type, limit in self.type_limits.items() if self._running_by_type[job_type] >= limit]
+
+    def submit(self, jobs: list[BackgroundJob]) -> list[BackgroundJob]:
+        """Start jobs that fit the limits and return the overflow to be released."""
+        overflow: list[BackgroundJob] = []
+        for job in jobs:
+            limit = self.type_limits.get(job.job_type)
+            if self.free_slots == 0 or (limit is not None and self._running_by_type[job.job_type] >= limit):
+                overflow.append(job)
+                continue
+            self._running_by_type[job.job_type] += 1
+            task = asyncio.create_task(self._run(job.id, job.job_type))
+            self._tasks[job.id] = task
+            task.add_done_callback(partial(self._on_done, job.id, job.job_type))
+        return overflow
+
+    def _on_done(self, job_id: uuid.UUID, job_type: str, _task: asyncio.Task) -> None:
+        self._tasks.pop(job_id, None)
+        self._running_by_type[job_type] = max(0, self._running_by_type[job_type] - 1)
+        if self.on_slot_freed:
+            self.on_slot_freed()
+
+    async def _run(self, job_id: uuid.UUID, job_type: str) -> None:
+        timeout = self.type_timeouts.get(job_type, self.default_timeout_seconds)
+        async with AsyncSessionLocal() as db:
+            job = await db.get(BackgroundJob, job_id)
+            if job is None:
+                return
+            try:
+                await asyncio.wait_for(background_job_service.process_job(db, job), timeout=max(1, timeout))
+                await background_job_service.mark_done(db, job)
+                logger.info("Background job %s (%s) completed", job.id, job.job_type)
+            except asyncio.CancelledError:
+                raise
+            except RescheduleJob as reschedule:
+                await db.rollback()
+                await db.refresh(job)
+                await background_job_service.reschedule(db, job, reschedule)
+                logger.info("Background job %s (%s) rescheduled to %s", job.id, job.job_type, reschedule.run_at)
+            except Exception as exc:
+                if isinstance(exc, asyncio.TimeoutError):
+                    exc = TimeoutError(f"Background job timed out after {timeout}s")
+                logger.error("Background job %s failed: %s", job_id, exc, exc_info=True)
+                try:
+                    await db.rollback()
+                    await db.refresh(job)
+                    await background_job_service.mark_failed(db, job, exc)
+                except Exception as mark_exc:
+                    logger.error("Failed to record background job %s failure: %s", job_id, mark_exc)
+
+    async def shutdown(self, grace_seconds: float) -> None:
+        """Let running jobs finish within the grace period, then release the rest."""
+        if not self._tasks:
+            return
+        await asyncio.wait(list(self._tasks.values()), timeout=max(0, grace_seconds))
+        unfinished = dict(self._tasks)
+        if not unfinished:
+            return
+        for task in unfinished.values():
+            task.cancel()
+        await asyncio.gather(*unfinished.values(), return_exceptions=True)
+        async with AsyncSessionLocal() as db:
+            released = await background_job_service.release_jobs(db, list(unfinished))
+        logger.info("Released %s unfinished background jobs on shutdown", released)
+
+
 async def start_background_job_loop(stop_event: asyncio.Event | None = None) -> None:
     from src.config import settings
 
     stop_event = stop_event or asyncio.Event()
+    wakeup = BackgroundJobWakeup()
+    executor = BackgroundJobExecutor(
+        max_concurrency=settings.background_job_max_concurrency,
+        type_limits=parse_job_type_limits(settings.background_job_type_concurrency),
+        default_timeout_seconds=settings.background_job_timeout_seconds,
+        type_timeouts=parse_job_type_limits(settings.background_job_type_timeouts),
+        on_slot_freed=wakeup.event.set,
+    )
     logger.info(
-        "Background job loop started (batch=%s interval=%ss)",
+        "Background job loop started (batch=%s concurrency=%s type_limits=%s interval=%ss safety_interval=%ss)",
         settings.background_job_batch_size,
+        executor.max_concurrency,
+        executor.type_limits,
         settings.background_job_poll_interval_seconds,
+        settings.background_job_safety_poll_interval_seconds,
     )
 
-    while not stop_event.is_set():
-        async with AsyncSessionLocal() as db:
-            try:
-                jobs = await background_job_service.claim_jobs(
-                    db=db,
-                    batch_size=max(1, settings.background_job_batch_size),
-                )
-                for job in jobs:
+    loop = asyncio.get_running_loop()
+    next_stale_check_at = 0.0
+    next_retention_at = loop.time() + 60
+
+    try:
+        while not stop_event.is_set():
+            listening = await wakeup.start()
+            wakeup.event.clear()
+            if loop.time() >= next_stale_check_at or loop.time() >= next_retention_at:
+                async with AsyncSessionLocal() as db:
                     try:
-                        await background_job_service.process_job(db, job)
-                        await background_job_service.mark_done(db, job)
-                        logger.info("Background job %s (%s) completed", job.id, job.job_type)
+                        if loop.time() >= next_stale_check_at:
+                            next_stale_check_at = loop.time() + max(10, settings.background_job_stale_check_interval_seconds)
+                            recovered = await background_job_service.recover_stale_jobs(db)
+                            if recovered:
+                                logger.warning("Recovered %s background jobs with expired locks", recovered)
+                        if loop.time() >= next_retention_at:
+                            next_retention_at = loop.time() + max(60, settings.background_job_retention_interval_seconds)
+                            await background_job_service.ensure_archive_job(db)
                     except Exception as exc:
-                        logger.error("Background job %s failed: %s", job.id, exc, exc_info=True)
-                        await background_job_service.mark_failed(db, job, exc)
-            except Exception as exc:
-                logger.error("Background job loop failed: %s", exc, exc_info=True)
-
-        try:
-            await asyncio.wait_for(
-                stop_event.wait(),
-                timeout=max(1, settings.background_job_poll_interval_seconds),
+                        logger.error("Background job maintenance failed: %s", exc, exc_info=True)
+            timeout = float(
+                max(1, settings.background_job_safety_poll_interval_seconds)
+                if listening
+                else max(1, settings.background_job_poll_interval_seconds)
             )
-        except asyncio.TimeoutError:
-            continue
+            batch_size = min(max(1, settings.background_job_batch_size), executor.free_slots)
+            if batch_size > 0:
+                async with AsyncSessionLocal() as db:
+                    try:
+                        jobs = await background_job_service.claim_jobs(
+                            db=db,
+                            batch_size=batch_size,
+                            exclude_types=executor.saturated_types(),
+                        )
+                        overflow = executor.submit(jobs)
+                        if overflow:
+                            await background_job_service.release_jobs(db, [job.id for job in overflow])
+                        if len(jobs) >= batch_size and not overflow:
+                            timeout = 0
+                        elif listening:
+                            # Due jobs of saturated types (including the overflow just released)
+                            # are left out: a finishing job frees their slot and sets the wakeup.
+                            next_run_at = await background_job_service.next_run_at(
+                                db, exclude_types=executor.saturated_types()
+                            )
+                            if next_run_at is not None:
+                                due_in = (next_run_at - datetime.now(timezone.utc)).total_seconds()
+                                timeout = min(timeout, max(0.5, due_in))
+                    except Exception as exc:
+                        logger.error("Background job loop failed: %s", exc, exc_info=True)
+
+            await wakeup.wait(stop_event, timeout)
+    finally:
+        await executor.shutdown(settings.background_job_shutdown_grace_seconds)
+        await wakeup.close()
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 
@@ -18,3 +18,14 @@ def is_business_hours(dt: datetime | None = None) -> bool:
     """
     current = dt.astimezone(BUSINESS_TIMEZONE) if dt else get_business_now()
     return BUSINESS_HOUR_START <= current.hour < BUSINESS_HOUR_END
+
+
+def next_business_time(dt: datetime | None = None) -> datetime:
+    """Return `dt` if it falls within business hours, otherwise the next opening time."""
+    current = dt.astimezone(BUSINESS_TIMEZONE) if dt else get_business_now()
+    if is_business_hours(current):
+        return current
+    opening = current.replace(hour=BUSINESS_HOUR_START, minute=0, second=0, microsecond=0)
+    if current.hour >= BUSINESS_HOUR_END:
+        opening += timedelta(days=1)
+    return opening
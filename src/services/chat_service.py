@@ -1,12 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update
+from sqlalchemy import select, func, update, tuple_
 from sqlalchemy.orm import selectinload
-from typing import Optional, List
+from typing import Any, Optional, List, Sequence
 from datetime import datetime
 import uuid
 
 from src.models import Lead, ChatMessage, MessageDirection, MessageStatus, MessageTransport
 from src.schemas.chat import ChatMessageCreate
+from src.services.crm_event_service import MESSAGE_CREATED, UNREAD_CHANGED, publish_crm_event
 from src.services.lead_followup_pause_service import lead_followup_pause_service
 
 
@@ -53,6 +54,8 @@ class ChatService:
         pause_decision = lead_followup_pause_service.build_decision(lead, content) if lead else None
         update_values = {
             "last_message_at": datetime.utcnow(),
+            "last_message_direction": MessageDirection.INBOUND,
+            "last_message_sender_name": sender_name,
             "unread_count": Lead.unread_count + 1,
             "followup_count": 0,
         }
@@ -67,11 +70,34 @@ class ChatService:
             update_values["next_followup_at"] = None
 
         # Update lead's last message time, increment unread count, and reset follow-up counter
-        await db.execute(
+        lead_result = await db.execute(
             update(Lead)
             .where(Lead.id == lead_id)
             .values(**update_values)
+            .returning(Lead.org_id, Lead.unread_count)
         )
+        lead_row = lead_result.one_or_none()
+        # The client replied: the pending follow-up is dropped in the same transaction
+        from src.services.followup_service import cancel_lead_followup
+        await cancel_lead_followup(db, lead_id)
+
+        if lead_row:
+            await db.flush()
+            await publish_crm_event(
+                db,
+                lead_row.org_id,
+                MESSAGE_CREATED,
+                lead_id=lead_id,
+                message_id=message.id,
+                direction=MessageDirection.INBOUND.value,
+            )
+            await publish_crm_event(
+                db,
+                lead_row.org_id,
+                UNREAD_CHANGED,
+                lead_id=lead_id,
+                unread_count=lead_row.unread_count,
+            )
         
         await db.commit()
         await db.refresh(message)
@@ -110,16 +136,48 @@ class ChatService:
         
         db.add(message)
         
-        # Update lead's last message time
-        await db.execute(
+        # Update lead's last message time and who sent it
+        lead_result = await db.execute(
             update(Lead)
             .where(Lead.id == lead_id)
-            .values(last_message_at=datetime.utcnow())
+            .values(
+                last_message_at=datetime.utcnow(),
+                last_message_direction=MessageDirection.OUTBOUND,
+                last_message_sender_name=sender_name,
+            )
+            .returning(Lead.org_id)
         )
+        lead_org_id = lead_result.scalar_one_or_none()
+        if lead_org_id:
+            await db.flush()
+            await publish_crm_event(
+                db,
+                lead_org_id,
+                MESSAGE_CREATED,
+                lead_id=lead_id,
+                message_id=message.id,
+                direction=MessageDirection.OUTBOUND.value,
+            )
         
         await db.commit()
         await db.refresh(message)
 
+        # Arm the next follow-up after an automated message, cancel it after an operator's one
+        try:
+            from src.services.followup_service import schedule_lead_followup
+
+            lead_result = await db.execute(
+                select(Lead).where(Lead.id == lead_id).execution_options(populate_existing=True)
+            )
+            lead = lead_result.scalar_one_or_none()
+            if lead:
+                await schedule_lead_followup(db, lead)
+        except Exception as e:
+            # The hourly reconcile picks up leads whose scheduling failed
+            await db.rollback()
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to schedule follow-up for lead {lead_id}: {e}")
+
         # Index CRM messages into knowledge base for long-term memory
         # Only index if it's explicitly from CRM or marked as admin
         is_crm = ai_metadata and ai_metadata.get("source") == "CRM"
@@ -154,43 +212,76 @@ class ChatService:
         page: int = 1,
         page_size: int = 50,
         transport: MessageTransport | None = None,
-    ) -> tuple[List[ChatMessage], int]:
+        cursor: Optional[tuple[datetime, uuid.UUID]] = None,
+        include_total: bool = True,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[List[Any], Optional[int]]:
         """
         Get paginated chat history for a lead.
-        Returns (messages, total_count).
+        Returns (messages, total_count); total_count is None when include_total is False.
+
+        A cursor is the `(created_at, id)` of the oldest message already loaded;
+        the next page continues strictly after it instead of using OFFSET.
+        With `columns` only those are selected and rows come back instead of ChatMessage objects.
         """
         # Get total count
-        count_query = select(func.count(ChatMessage.id)).where(ChatMessage.lead_id == lead_id)
-        if transport:
-            count_query = count_query.where(ChatMessage.transport == transport)
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        total = None
+        if include_total:
+            count_query = select(func.count(ChatMessage.id)).where(ChatMessage.lead_id == lead_id)
+            if transport:
+                count_query = count_query.where(ChatMessage.transport == transport)
+            count_result = await db.execute(count_query)
+            total = count_result.scalar_one()
         
         # Get messages (ordered by created_at DESC for latest first)
-        offset = (page - 1) * page_size
         messages_query = (
-            select(ChatMessage)
+            (select(*columns) if columns else select(ChatMessage))
             .where(ChatMessage.lead_id == lead_id)
-            .order_by(ChatMessage.created_at.desc())
-            .offset(offset)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
             .limit(page_size)
         )
         if transport:
             messages_query = messages_query.where(ChatMessage.transport == transport)
+        if cursor is not None:
+            messages_query = messages_query.where(
+                tuple_(ChatMessage.created_at, ChatMessage.id) < tuple_(*cursor)
+            )
+        else:
+            messages_query = messages_query.offset((page - 1) * page_size)
         result = await db.execute(messages_query)
-        messages = result.scalars().all()
+        messages = result.all() if columns else result.scalars().all()
         
         return list(messages), total
     
     @staticmethod
     async def mark_messages_as_read(
         db: AsyncSession,
-        lead_id: uuid.UUID
+        lead_id: uuid.UUID,
+        unread_count: Optional[int] = None,
     ) -> int:
         """
         Mark all unread messages from a lead as read.
         Returns count of updated messages.
+
+        Writes only while the lead has unread messages. Pass the lead's loaded
+        `unread_count` to skip the database entirely when it is 0; otherwise the guarded
+        counter reset decides, so polling an already read chat changes no rows.
         """
+        if unread_count == 0:
+            return 0
+
+        # Reset lead's unread count first: the row lock orders this against a concurrent
+        # inbound message, whose increment is then either reset here or seen next time.
+        lead_result = await db.execute(
+            update(Lead)
+            .where(Lead.id == lead_id, Lead.unread_count > 0)
+            .values(unread_count=0)
+            .returning(Lead.org_id)
+        )
+        lead_org_id = lead_result.scalar_one_or_none()
+        if lead_org_id is None:
+            return 0
+
         result = await db.execute(
             update(ChatMessage)
             .where(
@@ -200,13 +291,7 @@ class ChatService:
             )
             .values(is_read=True)
         )
-        
-        # Reset lead's unread count
-        await db.execute(
-            update(Lead)
-            .where(Lead.id == lead_id)
-            .values(unread_count=0)
-        )
+        await publish_crm_event(db, lead_org_id, UNREAD_CHANGED, lead_id=lead_id, unread_count=0)
         
         await db.commit()
         
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(fn: Callable[..., T], *args: Any) -> tuple[float, T]:
+    return time.time(), fn(*args)
+
+
+class CpuExecutor:
+    """Process pool lane for CPU-bound work that would otherwise stall the event loop.
+
+    The pool is created lazily with the spawn start method, so forking a process that
+    holds asyncpg/httpx connections and threads is never an issue. With zero workers
+    configured, calls fall back to a thread.
+    """
+
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+        self._workers = 0
+        self._in_flight = 0
+        self._stats: dict[str, dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "failures": 0, "wait_seconds": 0.0, "run_seconds": 0.0, "max_wait_seconds": 0.0}
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor | None:
+        from src.config import settings
+
+        if self._pool is None:
+            self._workers = max(0, settings.cpu_pool_workers)
+            if self._workers == 0:
+                return None
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("CPU process pool started: workers=%s", self._workers)
+        return self._pool
+
+    async def run_cpu(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) in the process pool and await its result."""
+        name = getattr(fn, "__qualname__", repr(fn))
+        stats = self._stats[name]
+        submitted_at = time.time()
+        self._in_flight += 1
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                started_at, result = await asyncio.to_thread(_timed_call, fn, *args)
+            else:
+                started_at, result = await asyncio.wrap_future(pool.submit(_timed_call, fn, *args))
+        except BrokenProcessPool:
+            stats["failures"] += 1
+            logger.error("CPU process pool is broken, recreating it on next call")
+            self._discard_pool()
+            raise
+        except Exception:
+            stats["failures"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        finished_at = time.time()
+        wait_seconds = max(0.0, started_at - submitted_at)
+        stats["calls"] += 1
+        stats["wait_seconds"] += wait_seconds
+        stats["run_seconds"] += max(0.0, finished_at - started_at)
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait_seconds)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self._workers) if self._workers else 0,
+            "tasks": {
+                name: {
+                    "calls": int(item["calls"]),
+                    "failures": int(item["failures"]),
+                    "avg_wait_seconds": round(item["wait_seconds"] / item["calls"], 4) if item["calls"] else 0.0,
+                    "avg_run_seconds": round(item["run_seconds"] / item["calls"], 4) if item["calls"] else 0.0,
+                    "max_wait_seconds": round(item["max_wait_seconds"], 4),
+                }
+                for name, item in self._stats.items()
+            },
+        }
+
+    def _discard_pool(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+cpu_executor = CpuExecutor()
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    return await cpu_executor.run_cpu(fn, *args)
+
+
+def render_cpu_pool_metrics(snapshot: dict[str, Any]) -> str:
+    lines = [
+        "# HELP cpu_pool_in_flight CPU tasks submitted and not finished in this process.",
+        "# TYPE cpu_pool_in_flight gauge",
+        f"cpu_pool_in_flight {snapshot['in_flight']}",
+        "# HELP cpu_pool_queued CPU tasks waiting for a free worker.",
+        "# TYPE cpu_pool_queued gauge",
+        f"cpu_pool_queued {snapshot['queued']}",
+    ]
+    series = [
+        ("cpu_pool_calls_total", "counter", "CPU tasks completed, by task name.", "calls"),
+        ("cpu_pool_failures_total", "counter", "CPU tasks that raised, by task name.", "failures"),
+        ("cpu_pool_wait_seconds_max", "gauge", "Longest wait for a free worker, by task name.", "max_wait_seconds"),
+        ("cpu_pool_run_seconds_avg", "gauge", "Average run time in the worker, by task name.", "avg_run_seconds"),
+    ]
+    for metric, metric_type, help_text, key in series:
+        lines.extend([f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"])
+        for name, item in snapshot["tasks"].items():
+            lines.append(f'{metric}{{task="{name}"}} {item[key]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,36 @@
+"""CPU-bound helpers executed in the process pool (see cpu_executor).
+
+Functions here must be importable top-level callables with picklable arguments
+and results, and must not touch the database or the event loop.
+"""
+import base64
+import io
+
+
+def extract_pdf_text(file_content: bytes) -> str:
+    import fitz
+
+    pdf_doc = fitz.open(stream=file_content, filetype="pdf")
+    text_blocks = []
+    for page in pdf_doc:
+        # 'blocks' extraction preserves structural reading order
+        blocks = page.get_text("blocks")
+        # b[6] == 0 means it's a text block
+        page_text = "\n\n".join([b[4].strip() for b in blocks if b[6] == 0])
+        if page_text:
+            text_blocks.append(page_text)
+    return "\n\n".join(text_blocks)
+
+
+def read_file_base64(path: str) -> str:
+    with open(path, "rb") as source:
+        return base64.b64encode(source.read()).decode("utf-8")
+
+
+def render_qr_png(code: str) -> bytes:
+    import qrcode
+
+    image = qrcode.make(code)
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database import engine
+from src.models import Lead
+
+logger = logging.getLogger(__name__)
+
+CRM_EVENTS_CHANNEL = "crm_events"
+
+MESSAGE_CREATED = "message.created"
+LEAD_UPDATED = "lead.updated"
+LEAD_DELETED = "lead.deleted"
+UNREAD_CHANGED = "unread.changed"
+# Sent to subscribers when events may have been lost (listener reconnect, slow consumer)
+RESYNC = "resync"
+
+
+async def publish_crm_event(
+    db: AsyncSession,
+    org_id: uuid.UUID | str,
+    event_type: str,
+    **data: Any,
+) -> None:
+    """Queue a NOTIFY in the caller's transaction for writes the flush hook cannot see.
+
+    It reaches listeners only on commit.
+
+    Payloads carry ids and a few small fields (NOTIFY caps them at 8000 bytes), clients
+    refetch the rows they display.
+    """
+    await db.execute(_notify_statement(org_id, event_type, **data))
+
+
+def _notify_statement(org_id: uuid.UUID | str, event_type: str, **data: Any):
+    payload = json.dumps({"type": event_type, "org_id": str(org_id), **data}, default=str)
+    return select(func.pg_notify(CRM_EVENTS_CHANNEL, payload))
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_lead_changes(session: Session, _flush_context) -> None:
+    """Publish lead.updated / lead.deleted for every ORM write to a lead.
+
+    Lead fields are assigned directly in many handlers, so the flush is the one place
+    that sees them all. Core UPDATE statements bypass this and publish explicitly.
+    Postgres folds identical NOTIFYs within a transaction, so repeated flushes are cheap.
+    """
+    events: dict[tuple[str, Any], Lead] = {}
+    for lead in session.new:
+        if isinstance(lead, Lead):
+            events[(LEAD_UPDATED, lead.id)] = lead
+    for lead in session.dirty:
+        if isinstance(lead, Lead) and session.is_modified(lead, include_collections=False):
+            events[(LEAD_UPDATED, lead.id)] = lead
+    for lead in session.deleted:
+        if isinstance(lead, Lead):
+            events[(LEAD_DELETED, lead.id)] = lead
+    if not events:
+        return
+    connection = session.connection()
+    for (event_type, lead_id), lead in events.items():
+        data = {"lead_id": lead_id}
+        if event_type == LEAD_UPDATED:
+            data["status"] = lead.status
+        connection.execute(_notify_statement(lead.org_id, event_type, **data))
+
+
+class CrmEventHub:
+    """Fans CRM NOTIFY events out to this process's stream subscribers, per org.
+
+    One LISTEN connection per API process is opened with the first subscriber and
+    closed with the last; every replica receives every commit's events.
+    """
+
+    def __init__(self, channel: str = CRM_EVENTS_CHANNEL, queue_size: int = 200) -> None:
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._connection = None
+        self._driver_connection = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def listening(self) -> bool:
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def subscribe(self, org_id: uuid.UUID | str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        async with self._lock:
+            self._subscribers[str(org_id)].add(queue)
+            if self._supervisor is None or self._supervisor.done():
+                await self._listen()
+                self._supervisor = asyncio.create_task(self._supervise())
+        return queue
+
+    async def unsubscribe(self, org_id: uuid.UUID | str, queue: asyncio.Queue) -> None:
+        key = str(org_id)
+        async with self._lock:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    self._subscribers.pop(key, None)
+            if not self._subscribers:
+                await self.close()
+
+    async def _listen(self) -> bool:
+        await self._close_connection()
+        try:
+            connection = await engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self._on_notify)
+        except Exception as exc:
+            logger.warning("CRM event LISTEN unavailable: %s", exc)
+            return False
+        self._connection = connection
+        self._driver_connection = driver_connection
+        logger.info("CRM event hub listening on channel %s", self.channel)
+        return True
+
+    async def _supervise(self) -> None:
+        """Reopen a dropped LISTEN connection and tell clients to resync what they missed."""
+        from src.config import settings
+
+        while self._subscribers:
+            await asyncio.sleep(max(1, settings.crm_events_reconnect_seconds))
+            if self.listening:
+                continue
+            if await self._listen():
+                self.broadcast({"type": RESYNC})
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.warning("Dropping malformed CRM event payload: %r", payload)
+            return
+        for queue in list(self._subscribers.get(str(event.get("org_id")), ())):
+            self._offer(queue, event)
+
+    def broadcast(self, event: dict[str, Any]) -> None:
+        for queues in list(self._subscribers.values()):
+            for queue in list(queues):
+                self._offer(queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client gets one resync instead of an unbounded backlog
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": RESYNC})
+
+    async def _close_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        driver_connection, self._driver_connection = self._driver_connection, None
+        if connection is None:
+            return
+        try:
+            # Pooled connections are reused, so the listener must not outlive the hub
+            if not driver_connection.is_closed():
+                await driver_connection.remove_listener(self.channel, self._on_notify)
+            await connection.close()
+        except Exception as exc:
+            logger.debug("Failed to close CRM event listener connection: %s", exc)
+
+    async def close(self) -> None:
+        supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None and supervisor is not asyncio.current_task():
+            supervisor.cancel()
+        await self._close_connection()
+
+
+crm_event_hub = CrmEventHub()
@@ -1,7 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, cast, Date
 from datetime import datetime, timedelta, date, timezone
-import json
 import uuid
 from typing import List
 
@@ -176,31 +175,32 @@ class DashboardService:
 
     @staticmethod
     async def _estimate_speed_metrics(db: AsyncSession, org_id: uuid.UUID) -> dict[str, float | int | None]:
+        # Generated columns only: the extracted_data documents are never loaded
         result = await db.execute(
-            select(Lead.extracted_data).where(
+            select(
+                Lead.estimate_duration_minutes,
+                Lead.estimate_requested_at,
+                Lead.estimate_prepared_at,
+                Lead.estimate_sla_met,
+                Lead.estimate_sla_hours,
+            ).where(
                 Lead.org_id == org_id,
-                Lead.extracted_data.is_not(None),
+                (Lead.estimate_requested_at.is_not(None)) | (Lead.estimate_duration_minutes.is_not(None)),
             )
         )
         durations: list[float] = []
         sla_values: list[bool] = []
-        for raw_data in result.scalars().all():
-            estimate_request = DashboardService._estimate_request(raw_data)
-            if not estimate_request:
-                continue
-            duration = estimate_request.get("duration_minutes")
+        for row in result.all():
+            duration = row.estimate_duration_minutes
             if duration is None:
-                duration = DashboardService._duration_minutes(
-                    estimate_request.get("requested_at"),
-                    estimate_request.get("prepared_at") or estimate_request.get("final_uploaded_at"),
-                )
+                duration = DashboardService._duration_minutes(row.estimate_requested_at, row.estimate_prepared_at)
             if duration is None:
                 continue
             durations.append(float(duration))
-            if estimate_request.get("sla_met") is not None:
-                sla_values.append(bool(estimate_request.get("sla_met")))
+            if row.estimate_sla_met is not None:
+                sla_values.append(row.estimate_sla_met)
             else:
-                sla_hours = int(estimate_request.get("sla_hours") or 24)
+                sla_hours = int(row.estimate_sla_hours or 24)
                 sla_values.append(duration <= sla_hours * 60)
 
         if not durations:
@@ -210,17 +210,6 @@ class DashboardService:
         sla_met_rate = round((sum(1 for value in sla_values if value) / len(sla_values)) * 100, 1) if sla_values else None
         return {"avg_hours": avg_hours, "sla_met_rate": sla_met_rate, "count": len(durations)}
 
-    @staticmethod
-    def _estimate_request(raw_data: str | dict | None) -> dict | None:
-        if not raw_data:
-            return None
-        try:
-            data = json.loads(raw_data) if isinstance(raw_data, str) else raw_data
-        except json.JSONDecodeError:
-            return None
-        estimate_request = data.get("estimate_request") if isinstance(data, dict) else None
-        return estimate_request if isinstance(estimate_request, dict) else None
-
     @staticmethod
     def _duration_minutes(start_value: str | None, end_value: str | None) -> int | None:
         start = DashboardService._parse_datetime(start_value)
@@ -0,0 +1,143 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Generic, List, Optional, TypeVar
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import ChatMessage, Lead, MessageTransport
+from src.services.pagination import encode_cursor
+from src.services.report_cache import report_cache
+
+T = TypeVar("T")
+
+NIL_UUID = uuid.UUID(int=0)
+
+
+@dataclass
+class ChangeBatch(Generic[T]):
+    rows: List[T]
+    next_token: str
+    has_more: bool
+
+
+class DeltaSyncService:
+    """Change feeds and cheap validators for the CRM's polling endpoints.
+
+    A sync token is the `(updated_at, id)` of the last row a client has seen. `updated_at`
+    is stamped at flush time, so a transaction can commit after a later-stamped one was
+    already served; the token therefore never moves past `now - delta_sync_settle_seconds`
+    and rows inside that window are re-sent. Clients upsert by id. Deletes are not
+    reported, so clients still reload the full list occasionally.
+    """
+
+    def _settled_token(
+        self,
+        since: Optional[tuple[datetime, uuid.UUID]],
+        last: Optional[tuple[datetime, uuid.UUID]],
+    ) -> tuple[datetime, uuid.UUID]:
+        from src.config import settings
+
+        horizon = (
+            datetime.now(timezone.utc) - timedelta(seconds=max(0, settings.delta_sync_settle_seconds)),
+            NIL_UUID,
+        )
+        if last is not None and last <= horizon:
+            return last
+        if since is not None and since > horizon:
+            return since
+        return horizon
+
+    async def _changes(
+        self,
+        db: AsyncSession,
+        model,
+        scope,
+        since: Optional[tuple[datetime, uuid.UUID]],
+        limit: int,
+    ) -> ChangeBatch:
+        if since is None:
+            # No token yet: hand out a starting point, the caller loads the full list itself.
+            return ChangeBatch(rows=[], next_token=encode_cursor(*self._settled_token(None, None)), has_more=False)
+
+        result = await db.execute(
+            select(model)
+            .where(*scope, tuple_(model.updated_at, model.id) > tuple_(*since))
+            .order_by(model.updated_at.asc(), model.id.asc())
+            .limit(limit)
+        )
+        rows = list(result.scalars().all())
+        last = (rows[-1].updated_at, rows[-1].id) if rows else None
+        next_key = self._settled_token(since, last)
+        return ChangeBatch(
+            rows=rows,
+            next_token=encode_cursor(*next_key),
+            has_more=len(rows) == limit and next_key != since,
+        )
+
+    async def lead_changes(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        since: Optional[tuple[datetime, uuid.UUID]],
+        limit: int = 200,
+    ) -> ChangeBatch[Lead]:
+        return await self._changes(db, Lead, (Lead.org_id == org_id,), since, limit)
+
+    async def message_changes(
+        self,
+        db: AsyncSession,
+        lead_id: uuid.UUID,
+        since: Optional[tuple[datetime, uuid.UUID]],
+        limit: int = 200,
+        transport: MessageTransport | None = None,
+    ) -> ChangeBatch[ChatMessage]:
+        scope = [ChatMessage.lead_id == lead_id]
+        if transport:
+            scope.append(ChatMessage.transport == transport)
+        return await self._changes(db, ChatMessage, scope, since, limit)
+
+    @staticmethod
+    def _etag(*parts: Any) -> str:
+        digest = hashlib.sha1("|".join("" if p is None else str(p) for p in parts).encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    async def leads_etag(self, db: AsyncSession, org_id: uuid.UUID, *params: Any) -> Optional[str]:
+        """Validator for org lead lists: any insert, update or delete in the org changes it.
+
+        Inserts and updates move `max(updated_at)`, one probe of ix_leads_org_updated_at_id.
+        Deletes do not, so the org's report_cache version, which every lead delete bumps,
+        is part of the tag. None when that version is unavailable: serve without a validator.
+        """
+        version = await report_cache.version(org_id)
+        if version is None:
+            return None
+        result = await db.execute(select(func.max(Lead.updated_at)).where(Lead.org_id == org_id))
+        return self._etag("leads", org_id, version, result.scalar_one_or_none(), *params)
+
+    async def messages_etag(
+        self,
+        db: AsyncSession,
+        lead_id: uuid.UUID,
+        transport: MessageTransport | None,
+        *params: Any,
+    ) -> str:
+        query = select(func.count(ChatMessage.id), func.max(ChatMessage.updated_at)).where(
+            ChatMessage.lead_id == lead_id
+        )
+        if transport:
+            query = query.where(ChatMessage.transport == transport)
+        count, max_updated_at = (await db.execute(query)).one()
+        return self._etag("messages", lead_id, transport, count, max_updated_at, *params)
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = {value.strip() for value in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+delta_sync_service = DeltaSyncService()
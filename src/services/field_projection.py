@@ -0,0 +1,42 @@
+"""Sparse fieldsets for list endpoints.
+
+`?fields=id,full_name,status` narrows both the SELECT and the response body to the
+named fields of the endpoint's response schema. Omitting `fields` keeps the full shape.
+"""
+from typing import Any, Iterable, Optional, Sequence
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when `fields` names something the response schema does not have."""
+
+
+def parse_fields(
+    fields: Optional[str],
+    schema: type[BaseModel],
+    always: Sequence[str] = ("id",),
+) -> Optional[list[str]]:
+    """Validate a comma separated `fields` value against `schema`.
+
+    `always` lists fields the endpoint needs itself (row id, cursor sort key); they are
+    selected and returned even when not requested. Returns None for the full shape.
+    """
+    if fields is None:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(schema.model_fields))
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys([*always, *requested]))
+
+
+def schema_columns(model: Any, schema: type[BaseModel], names: Optional[Iterable[str]] = None) -> list:
+    """Mapped columns of `model` for the given schema fields (all schema fields by default)."""
+    return [getattr(model, name) for name in (names if names is not None else schema.model_fields)]
+
+
+def dump_json(payload: Any) -> bytes:
+    """Serialize a projected payload (rows as plain dicts) in pydantic-core, no model validation."""
+    return to_json(payload)
@@ -2,21 +2,23 @@
 Follow-Up Service: sends contextual AI-generated follow-up messages
 to leads who haven't responded for a while.
 """
-import asyncio
-import json
 import logging
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import String, and_, cast, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import AsyncSessionLocal
-from src.models import Lead, LeadStatus, ChatMessage, MessageDirection
+from src.models import Lead, LeadStatus, MessageDirection
+from src.models.lead_data import lead_data
 from src.services.chat_service import chat_service
 from src.services.lead_stage_context_service import lead_stage_context_service
 from src.services.openrouter_service import openrouter_service
 from src.services.prompts import FOLLOWUP_PROMPT, STAGE_FOLLOWUP_PROMPT
-from src.services.business_hours import is_business_hours, get_business_now
+from src.services.business_hours import next_business_time
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +29,7 @@ FOLLOWUP_THRESHOLDS = {
     2: 168,  # 3rd follow-up: 7 days after 2nd follow-up
 }
 
-MAX_FOLLOWUPS = 3
+MAX_FOLLOWUPS = 3  # also in the ix_leads_followup_candidates index predicate
 MAX_FOLLOWUP_AGE_DAYS = 21
 AUTO_COOL_AFTER_FINAL_FOLLOWUP = True
 AUTOMATED_OUTBOUND_SENDERS = {"AI", "AI Agent", "Bot"}
@@ -122,113 +124,171 @@ STAGE_SCENARIOS = {
     ),
 }
 
-# How often to run the check (seconds)
-CHECK_INTERVAL = 300  # 5 minutes
+FOLLOWUP_JOB_TYPE = "lead_followup"
+# Cadence of the per-process follow-up report (that of the former five-minute sweep)
+FOLLOWUP_REPORT_INTERVAL_SECONDS = 300
 
 
-async def get_leads_needing_followup(db: AsyncSession) -> list[Lead]:
+# Predicate of the ix_leads_followup_candidates partial index, inlined (not bind params)
+# so generic prepared plans still match the index
+FOLLOWUP_CANDIDATE_INDEX_FILTER = text(
+    f"leads.last_message_direction = 'OUTBOUND' AND leads.telegram_id IS NOT NULL "
+    f"AND leads.followup_count < {MAX_FOLLOWUPS}"
+)
+
+
+def followup_job_key(lead_id) -> str:
+    return f"{FOLLOWUP_JOB_TYPE}:{lead_id}"
+
+
+def _followup_candidate_filter():
+    """SQL twin of _is_followup_candidate.
+
+    `do_not_contact` matches only a JSON `true`; other truthy values are still caught by
+    the Python check.
+    """
+    return and_(
+        FOLLOWUP_CANDIDATE_INDEX_FILTER,
+        Lead.last_message_sender_name.in_(AUTOMATED_OUTBOUND_SENDERS),
+        Lead.last_message_at.isnot(None),
+        Lead.status.in_([status.value for status in FOLLOWUP_STATUSES]),
+        Lead.do_not_contact.is_(False),
+    )
+
+
+def _is_followup_candidate(lead: Lead) -> bool:
     """
-    Find leads that need a follow-up message.
-    
     Criteria:
-    - Last message was OUTBOUND (we sent the last message, client didn't reply)
-    - Enough time has passed since last activity
-    - Follow-up window is not older than MAX_FOLLOWUP_AGE_DAYS
-    - Status is not WON/LOST/SPAM
+    - Last message was OUTBOUND from the AI/bot (client didn't reply, no operator took over)
+    - Status is one of FOLLOWUP_STATUSES
     - followup_count < MAX_FOLLOWUPS
     - Has a telegram_id (can receive messages)
+    - Not marked do_not_contact
     """
-    now = datetime.now(timezone.utc)
-    
-    latest_message_subquery = (
-        select(
-            ChatMessage.lead_id,
-            ChatMessage.direction,
-            ChatMessage.sender_name,
-            func.row_number()
-            .over(
-                partition_by=ChatMessage.lead_id,
-                order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc()),
-            )
-            .label("row_number"),
-        )
-        .subquery()
+    status = getattr(lead.status, "value", lead.status)
+    return bool(
+        lead.last_message_direction == MessageDirection.OUTBOUND
+        and lead.last_message_sender_name in AUTOMATED_OUTBOUND_SENDERS
+        and lead.telegram_id
+        and lead.last_message_at
+        and (lead.followup_count or 0) < MAX_FOLLOWUPS
+        and status in {item.value for item in FOLLOWUP_STATUSES}
+        and not _lead_has_do_not_contact_flag(lead)
     )
 
-    result = await db.execute(
-        select(Lead)
-        .join(
-            latest_message_subquery,
-            and_(
-                latest_message_subquery.c.lead_id == Lead.id,
-                latest_message_subquery.c.row_number == 1,
-                latest_message_subquery.c.direction == MessageDirection.OUTBOUND,
-                latest_message_subquery.c.sender_name.in_(AUTOMATED_OUTBOUND_SENDERS),
-            ),
-        )
-        .where(
-            and_(
-                Lead.telegram_id.isnot(None),
-                Lead.last_message_at.isnot(None),
-                Lead.followup_count < MAX_FOLLOWUPS,
-                Lead.status.in_([status.value for status in FOLLOWUP_STATUSES]),
-            )
-        )
+
+def _earliest_due_at(lead: Lead) -> datetime:
+    """Due time under the loosest stage threshold; the job narrows it down when it runs."""
+    scheduled_followup_at = _get_next_followup_at(lead)
+    if scheduled_followup_at:
+        return scheduled_followup_at
+    hours = _threshold_bounds(min).get(lead.followup_count or 0, 0)
+    return _get_reference_time(lead) + timedelta(hours=hours)
+
+
+async def schedule_lead_followup(db: AsyncSession, lead: Lead) -> None:
+    """
+    Arm or re-arm the lead's follow-up job after an automated outbound message.
+    A lead that is no longer a candidate has its pending job cancelled instead.
+    """
+    from src.services.background_job_service import background_job_service
+
+    key = followup_job_key(lead.id)
+    if not _is_followup_candidate(lead):
+        if await background_job_service.cancel_job(db, key):
+            await db.commit()
+        return
+
+    await background_job_service.enqueue(
+        db=db,
+        job_type=FOLLOWUP_JOB_TYPE,
+        payload={
+            "lead_id": str(lead.id),
+            "followup_count": lead.followup_count or 0,
+            "reference_at": _get_reference_time(lead).isoformat(),
+        },
+        run_at=_earliest_due_at(lead),
+        dedup_key=key,
+        replace_existing=True,
     )
-    leads = result.scalars().unique().all()
-    
-    eligible = []
-    for lead in leads:
-        if _lead_has_do_not_contact_flag(lead):
-            continue
-        try:
-            scenario_key, _, _ = await _build_stage_context(db, lead)
-            setattr(lead, "_stage_context", {"next_action": scenario_key})
-        except Exception as exc:
-            logger.warning("[FOLLOWUP] Could not build stage context for lead %s: %s", lead.id, exc)
-
-        # Determine the reference time: last_followup_at if we already sent one, 
-        # otherwise last_message_at
-        scheduled_followup_at = _get_next_followup_at(lead)
-        if scheduled_followup_at:
-            if now < scheduled_followup_at:
-                continue
-            reference_time = scheduled_followup_at
-            threshold_hours = 0
-        elif lead.followup_count > 0 and lead.last_followup_at:
-            reference_time = lead.last_followup_at
-            threshold_hours = _get_threshold_hours(lead)
-        else:
-            reference_time = lead.last_message_at
 
-            threshold_hours = _get_threshold_hours(lead)
 
-        if threshold_hours is None:
-            continue
-        
-        # Ensure reference_time is timezone-aware
-        if reference_time.tzinfo is None:
-            reference_time = reference_time.replace(tzinfo=timezone.utc)
+async def cancel_lead_followup(db: AsyncSession, lead_id) -> int:
+    """Drop the pending follow-up job when the client replies. Does not commit."""
+    from src.services.background_job_service import background_job_service
 
-        if _is_followup_too_old(now, reference_time):
-            await _cool_down_stale_followup(db, lead, reason="followup_window_expired")
-            continue
-        
-        time_since = now - reference_time
-        if time_since >= timedelta(hours=threshold_hours):
-            eligible.append(lead)
-    
-    return eligible
+    return await background_job_service.cancel_job(db, followup_job_key(lead_id))
 
 
-def _lead_has_do_not_contact_flag(lead: Lead) -> bool:
-    if not lead.extracted_data:
-        return False
+async def evaluate_lead_followup(
+    db: AsyncSession,
+    lead: Lead,
+    now: datetime | None = None,
+) -> tuple[str, datetime | None]:
+    """
+    Decide what to do with a lead's follow-up right now.
+
+    Returns ("skip", None), ("stale", None), ("due", None) or ("wait", due_at).
+    Stage context is only built when the lead is due under some stage thresholds
+    but not under all of them.
+    """
+    now = now or datetime.now(timezone.utc)
+    if not _is_followup_candidate(lead):
+        return "skip", None
+
+    reference_time = _get_reference_time(lead)
+    if _is_followup_too_old(now, reference_time):
+        return "stale", None
+
+    scheduled_followup_at = _get_next_followup_at(lead)
+    if scheduled_followup_at:
+        return ("due", None) if now >= scheduled_followup_at else ("wait", scheduled_followup_at)
+
+    count = lead.followup_count or 0
+    earliest_due_at = reference_time + timedelta(hours=_threshold_bounds(min).get(count, 0))
+    if now < earliest_due_at:
+        return "wait", earliest_due_at
+    if now >= reference_time + timedelta(hours=_threshold_bounds(max).get(count, 0)):
+        # Due whatever the stage is
+        return "due", None
+
     try:
-        data = json.loads(lead.extracted_data)
-    except json.JSONDecodeError:
-        return False
-    return bool(isinstance(data, dict) and data.get("do_not_contact"))
+        scenario_key, _, _ = await _build_stage_context(db, lead)
+        setattr(lead, "_stage_context", {"next_action": scenario_key})
+    except Exception as exc:
+        logger.warning("[FOLLOWUP] Could not build stage context for lead %s: %s", lead.id, exc)
+
+    threshold_hours = _get_threshold_hours(lead)
+    if threshold_hours is None:
+        return "skip", None
+    due_at = reference_time + timedelta(hours=threshold_hours)
+    return ("due", None) if now >= due_at else ("wait", due_at)
+
+
+def _threshold_bounds(pick) -> dict[int, int]:
+    """Loosest (min) or strictest (max) threshold hours per follow-up count across stages."""
+    bounds: dict[int, int] = {}
+    for thresholds in (FOLLOWUP_THRESHOLDS, *STAGE_FOLLOWUP_THRESHOLDS.values()):
+        for count, hours in thresholds.items():
+            bounds[count] = pick(bounds[count], hours) if count in bounds else hours
+    return bounds
+
+
+def _get_reference_time(lead: Lead) -> datetime:
+    # last_followup_at if we already sent one, otherwise last_message_at
+    reference_time = _get_next_followup_at(lead)
+    if reference_time is None:
+        if lead.followup_count > 0 and lead.last_followup_at:
+            reference_time = lead.last_followup_at
+        else:
+            reference_time = lead.last_message_at
+    if reference_time.tzinfo is None:
+        reference_time = reference_time.replace(tzinfo=timezone.utc)
+    return reference_time
+
+
+def _lead_has_do_not_contact_flag(lead: Lead) -> bool:
+    return bool(lead_data(lead).get("do_not_contact"))
 
 
 def _is_followup_too_old(now: datetime, reference_time: datetime) -> bool:
@@ -276,10 +336,10 @@ async def generate_followup_message(db: AsyncSession, lead: Lead) -> tuple[str |
     """
     try:
         # Get recent conversation history
-        history_msgs, _ = await chat_service.get_chat_history(db, lead.id, page_size=10)
+        history_msgs, _ = await chat_service.get_chat_history(db, lead.id, page_size=10, include_total=False)
         
         if not history_msgs:
-            return None
+            return None, None
         
         # Format history for the prompt
         history_lines = []
@@ -400,79 +460,183 @@ async def send_followup(db: AsyncSession, lead: Lead, message: str) -> bool:
         return False
 
 
-async def _cool_down_stale_followup(db: AsyncSession, lead: Lead, reason: str) -> None:
+async def _cool_down_stale_followups(db: AsyncSession, lead_ids: list, reason: str) -> None:
     from sqlalchemy import update as sql_update
 
     await db.execute(
         sql_update(Lead)
-        .where(Lead.id == lead.id)
+        .where(Lead.id.in_(lead_ids))
         .values(
             followup_count=MAX_FOLLOWUPS,
             status=LeadStatus.FOLLOW_UP.value,
         )
     )
     await db.commit()
-    logger.info("[FOLLOWUP] Cooled stale lead %s: %s", lead.id, reason)
+    logger.info("[FOLLOWUP] Cooled %s stale leads: %s", len(lead_ids), reason)
 
 
-async def check_and_send_followups():
-    """
-    Main function: check all leads and send follow-ups where needed.
-    """
-    logger.info("[FOLLOWUP] Running follow-up check...")
+async def _still_waiting_for_reply(db: AsyncSession, lead: Lead) -> bool:
+    """The client may have replied, or an operator written, while the text was generated."""
+    result = await db.execute(
+        select(Lead.last_message_direction, Lead.last_message_sender_name, Lead.followup_count)
+        .where(Lead.id == lead.id)
+    )
+    row = result.one_or_none()
+    return bool(
+        row
+        and row.last_message_direction == MessageDirection.OUTBOUND
+        and row.last_message_sender_name in AUTOMATED_OUTBOUND_SENDERS
+        and row.followup_count == lead.followup_count
+    )
+
+
+@dataclass
+class FollowupReport:
+    """Follow-up job outcomes of this worker process since the last report."""
+
+    started: float = field(default_factory=time.monotonic)
+    due: int = 0
+    generated: int = 0
+    sent: int = 0
+    generation_failed: int = 0
+    send_failed: int = 0
+    superseded: int = 0
+
+    @property
+    def sent_per_minute(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.sent * 60 / elapsed if elapsed > 0 else 0.0
+
+
+followup_report = FollowupReport()
+
+
+async def _count_followup_backlog(db: AsyncSession) -> int:
+    """Due follow-up jobs no worker has claimed yet (served by the runnable partial index)."""
+    from src.models import BackgroundJob
+    from src.services.background_job_service import RUNNABLE_FILTER
 
-    if not is_business_hours():
-        logger.info("[FOLLOWUP] Outside business hours at %s, skipping sends.", get_business_now().isoformat())
+    result = await db.execute(
+        select(func.count(BackgroundJob.id)).where(
+            RUNNABLE_FILTER,
+            BackgroundJob.job_type == FOLLOWUP_JOB_TYPE,
+            BackgroundJob.run_at <= datetime.now(timezone.utc),
+        )
+    )
+    return int(result.scalar_one() or 0)
+
+
+async def _log_followup_report(db: AsyncSession) -> None:
+    """Log and reset the report once FOLLOWUP_REPORT_INTERVAL_SECONDS have passed."""
+    global followup_report
+
+    report = followup_report
+    elapsed = time.monotonic() - report.started
+    if elapsed < FOLLOWUP_REPORT_INTERVAL_SECONDS:
         return
-    
-    async with AsyncSessionLocal() as db:
-        try:
-            leads = await get_leads_needing_followup(db)
-            
-            if not leads:
-                logger.info("[FOLLOWUP] No leads need follow-up right now.")
-                return
-            
-            logger.info(f"[FOLLOWUP] Found {len(leads)} leads needing follow-up.")
-            
-            for lead in leads:
-                # Generate contextual message
-                message, scenario_key = await generate_followup_message(db, lead)
-                
-                if message:
-                    setattr(lead, "_followup_variant", scenario_key)
-                    await send_followup(db, lead, message)
-                    # Small delay between sends to avoid rate limits
-                    await asyncio.sleep(2)
-                else:
-                    logger.warning(f"[FOLLOWUP] Could not generate message for lead {lead.id}")
-                    
-        except Exception as e:
-            logger.error(f"[FOLLOWUP] Error during follow-up check: {e}", exc_info=True)
-
-
-async def start_followup_loop(stop_event: asyncio.Event | None = None):
-    """
-    Background asyncio loop that periodically checks for leads needing follow-ups.
-    Started once at application startup.
-    """
-    logger.info(f"[FOLLOWUP] Follow-up loop started (check every {CHECK_INTERVAL}s)")
-    
-    # Wait a bit on startup to let everything initialize
-    stop_event = stop_event or asyncio.Event()
+    followup_report = FollowupReport()
     try:
-        await asyncio.wait_for(stop_event.wait(), timeout=30)
+        backlog = await _count_followup_backlog(db)
+    except Exception as exc:
+        logger.warning("[FOLLOWUP] Could not count follow-up backlog: %s", exc)
+        backlog = None
+    logger.info(
+        "[FOLLOWUP] Last %.0fs: due=%s generated=%s sent=%s (%.1f/min) "
+        "generation_failed=%s send_failed=%s superseded=%s backlog=%s",
+        elapsed,
+        report.due,
+        report.generated,
+        report.sent,
+        report.sent_per_minute,
+        report.generation_failed,
+        report.send_failed,
+        report.superseded,
+        backlog,
+    )
+
+
+async def process_lead_followup_job(db: AsyncSession, payload: dict) -> None:
+    """Background job handler: send the lead's follow-up if it is due, otherwise reschedule."""
+    from src.services.background_job_service import RescheduleJob
+
+    await _log_followup_report(db)
+    lead = await db.get(Lead, uuid.UUID(str(payload["lead_id"])))
+    if lead is None:
         return
-    except asyncio.TimeoutError:
-        pass
-    
-    while not stop_event.is_set():
-        try:
-            await check_and_send_followups()
-        except Exception as e:
-            logger.error(f"[FOLLOWUP] Unhandled error in follow-up loop: {e}", exc_info=True)
-        
-        try:
-            await asyncio.wait_for(stop_event.wait(), timeout=CHECK_INTERVAL)
-        except asyncio.TimeoutError:
-            continue
+
+    now = datetime.now(timezone.utc)
+    decision, due_at = await evaluate_lead_followup(db, lead, now)
+    if decision == "skip":
+        return
+    if decision == "stale":
+        await _cool_down_stale_followups(db, [lead.id], reason="followup_window_expired")
+        return
+    if decision == "wait":
+        raise RescheduleJob(due_at)
+
+    opening = next_business_time(now)
+    if opening > now:
+        logger.info("[FOLLOWUP] Lead %s is due outside business hours, moving to %s", lead.id, opening.isoformat())
+        raise RescheduleJob(opening)
+
+    followup_report.due += 1
+    message, scenario_key = await generate_followup_message(db, lead)
+    if not message:
+        followup_report.generation_failed += 1
+        raise ValueError(f"Could not generate follow-up for lead {lead.id}")
+    followup_report.generated += 1
+    if not await _still_waiting_for_reply(db, lead):
+        followup_report.superseded += 1
+        logger.info("[FOLLOWUP] Lead %s replied while the follow-up was generated, skipping", lead.id)
+        return
+
+    setattr(lead, "_followup_variant", scenario_key)
+    if not await send_followup(db, lead, message):
+        followup_report.send_failed += 1
+        raise RuntimeError(f"Failed to send follow-up to lead {lead.id}")
+    followup_report.sent += 1
+
+    # Saving the follow-up could not re-arm this job while it runs, so arm the next attempt here
+    await db.refresh(lead)
+    if _is_followup_candidate(lead):
+        raise RescheduleJob(
+            _earliest_due_at(lead),
+            payload={
+                "lead_id": str(lead.id),
+                "followup_count": lead.followup_count,
+                "reference_at": _get_reference_time(lead).isoformat(),
+            },
+        )
+
+
+async def reconcile_followup_jobs(limit: int = 500) -> int:
+    """
+    Safety net for leads waiting on a reply without a follow-up job, e.g. rows that
+    existed before event-driven scheduling or whose enqueue failed. Uses the
+    follow-up candidate partial index, so it stays cheap.
+    """
+    from src.models import BackgroundJob
+    from src.services.background_job_service import RUNNABLE_FILTER, RUNNING_FILTER
+
+    pending_job = (
+        select(BackgroundJob.id)
+        .where(
+            BackgroundJob.dedup_key == func.concat(FOLLOWUP_JOB_TYPE + ":", cast(Lead.id, String)),
+            or_(RUNNABLE_FILTER, RUNNING_FILTER),
+        )
+        .exists()
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Lead)
+            .where(_followup_candidate_filter(), ~pending_job)
+            .order_by(Lead.last_message_at.asc())
+            .limit(limit)
+        )
+        leads = result.scalars().all()
+        for lead in leads:
+            await schedule_lead_followup(db, lead)
+
+    if leads:
+        logger.info("[FOLLOWUP] Reconciled follow-up jobs for %s leads", len(leads))
+    return len(leads)
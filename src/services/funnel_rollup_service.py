@@ -0,0 +1,255 @@
+"""Daily funnel rollups, so the analytics summary does not rescan the whole event history.
+
+A periodic worker task compacts each closed UTC day from the raw funnel tables into
+`funnel_daily_sessions` and `funnel_daily_metrics`, replacing the day's rows, and marks the
+day in `funnel_rollup_days`. Distinct-session metrics count a session on the day of its
+first matching event, so summing days never counts a session twice; sessions are split by
+the day they started so a date range can leave out sessions that began before it.
+
+The last `analytics_rollup_lookback_days` days are rebuilt on every run to pick up session
+status changes (completed/abandoned) that land after the day closed.
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.config import settings
+from src.database import AsyncSessionLocal
+from src.models import FunnelDailyMetric, FunnelDailySessions, FunnelEvent, FunnelRollupDay, FunnelSession
+from src.services.analytics_service import answer_option_select, first_touch_subquery, session_count_select
+
+logger = logging.getLogger(__name__)
+
+# `funnel_daily_metrics.metric` of answer option rows; other rows hold first-touch session counts
+ANSWER_METRIC = "answer_option"
+# Bounds the backfill done by one compaction run
+MAX_DAYS_PER_RUN = 31
+
+SESSION_DAY = cast(func.timezone("UTC", FunnelSession.created_at), Date)
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class RollupWindow:
+    """Compacted days a summary reads from rollups; None as first_day means from the start."""
+
+    first_day: date | None
+    last_day: date
+
+    @property
+    def cohort_start(self) -> datetime | None:
+        """Sessions started before this are left out of the rollup reads and counted raw."""
+        return day_start(self.first_day) if self.first_day else None
+
+    @property
+    def tail_start(self) -> datetime:
+        """Events from this moment on are read from the raw tables."""
+        return day_start(self.last_day + timedelta(days=1))
+
+
+class FunnelRollupService:
+    async def window(
+        self,
+        db: AsyncSession,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> RollupWindow | None:
+        """Whole compacted days inside the range, or None when the range has none."""
+        result = await db.execute(select(func.max(FunnelRollupDay.day)))
+        last_day = result.scalar_one_or_none()
+        if last_day is None:
+            return None
+        if date_to:
+            last_day = min(last_day, _as_utc(date_to).date() - timedelta(days=1))
+        first_day = None
+        if date_from:
+            start = _as_utc(date_from)
+            first_day = start.date()
+            if start != day_start(first_day):
+                first_day += timedelta(days=1)
+            if last_day < first_day:
+                return None
+        return RollupWindow(first_day=first_day, last_day=last_day)
+
+    async def read_sessions(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        window: RollupWindow,
+        source: str | None = None,
+        campaign: str | None = None,
+    ) -> list[Any]:
+        filters = self._filters(FunnelDailySessions, org_id, window, source, campaign)
+        result = await db.execute(
+            select(
+                FunnelDailySessions.source,
+                FunnelDailySessions.campaign,
+                FunnelDailySessions.channel,
+                func.sum(FunnelDailySessions.sessions).label("sessions"),
+                func.sum(FunnelDailySessions.completed).label("completed"),
+                func.sum(FunnelDailySessions.abandoned).label("abandoned"),
+            )
+            .where(*filters)
+            .group_by(FunnelDailySessions.source, FunnelDailySessions.campaign, FunnelDailySessions.channel)
+        )
+        return list(result.mappings().all())
+
+    async def read_metrics(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        window: RollupWindow,
+        source: str | None = None,
+        campaign: str | None = None,
+    ) -> list[Any]:
+        filters = self._filters(FunnelDailyMetric, org_id, window, source, campaign)
+        if window.first_day:
+            filters.append(FunnelDailyMetric.session_day >= window.first_day)
+        group = (FunnelDailyMetric.metric, FunnelDailyMetric.step_id, FunnelDailyMetric.value, FunnelDailyMetric.label)
+        result = await db.execute(
+            select(
+                *group,
+                func.sum(FunnelDailyMetric.sessions).label("sessions"),
+                func.sum(FunnelDailyMetric.events).label("events"),
+                func.sum(FunnelDailyMetric.time_sum_ms).label("time_sum_ms"),
+                func.sum(FunnelDailyMetric.time_count).label("time_count"),
+            )
+            .where(*filters)
+            .group_by(*group)
+        )
+        return list(result.mappings().all())
+
+    @staticmethod
+    def _filters(model: Any, org_id: uuid.UUID, window: RollupWindow, source: str | None, campaign: str | None) -> list[Any]:
+        filters = [model.org_id == org_id, model.day <= window.last_day]
+        if window.first_day:
+            filters.append(model.day >= window.first_day)
+        if source:
+            filters.append(model.source == source)
+        if campaign:
+            filters.append(model.campaign == campaign)
+        return filters
+
+    async def pending_days(self, db: AsyncSession, today: date) -> list[date]:
+        """Closed days to (re)compact: the lookback window plus a bounded backfill."""
+        yesterday = today - timedelta(days=1)
+        compacted = (await db.execute(select(func.max(FunnelRollupDay.day)))).scalar_one_or_none()
+        if compacted is None:
+            first_session = (await db.execute(select(func.min(FunnelSession.created_at)))).scalar_one_or_none()
+            if first_session is None:
+                return []
+            start = _as_utc(first_session).date()
+        else:
+            lookback_start = yesterday - timedelta(days=max(1, settings.analytics_rollup_lookback_days) - 1)
+            start = min(compacted + timedelta(days=1), lookback_start)
+        days = []
+        day = start
+        while day <= yesterday and len(days) < MAX_DAYS_PER_RUN:
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    async def compact_day(self, db: AsyncSession, day: date) -> None:
+        """Rebuild every organization's rollup rows for one UTC day."""
+        start, end = day_start(day), day_start(day + timedelta(days=1))
+        await db.execute(delete(FunnelDailySessions).where(FunnelDailySessions.day == day))
+        await db.execute(delete(FunnelDailyMetric).where(FunnelDailyMetric.day == day))
+
+        sessions = await db.execute(
+            session_count_select(
+                [FunnelSession.created_at >= start, FunnelSession.created_at < end],
+                FunnelSession.org_id.label("org_id"),
+            )
+        )
+        session_rows = [{**row, "day": day} for row in sessions.mappings().all()]
+        if session_rows:
+            await db.execute(insert(FunnelDailySessions), session_rows)
+
+        dimensions = (
+            FunnelSession.org_id.label("org_id"),
+            SESSION_DAY.label("session_day"),
+            FunnelSession.source.label("source"),
+            FunnelSession.utm_campaign.label("campaign"),
+            FunnelSession.channel.label("channel"),
+        )
+        touched = aliased(FunnelEvent)
+        per_session, first_times = first_touch_subquery(
+            [
+                FunnelEvent.created_at < end,
+                FunnelEvent.session_id.in_(
+                    select(touched.session_id).where(touched.created_at >= start, touched.created_at < end)
+                ),
+            ],
+            *dimensions,
+        )
+        names = {key: f"sessions_{index}" for index, key in enumerate(first_times)}
+        group = [per_session.c[column.name] for column in dimensions]
+        result = await db.execute(
+            select(
+                *group,
+                *(func.count().filter(first_at >= start).label(names[key]) for key, first_at in first_times.items()),
+            ).group_by(*group)
+        )
+        metric_rows: list[dict[str, Any]] = []
+        for row in result.mappings().all():
+            dimension_values = {column.name: row[column.name] for column in dimensions}
+            for (metric, step_id), name in names.items():
+                if row[name]:
+                    metric_rows.append(
+                        {**dimension_values, "day": day, "metric": metric, "step_id": step_id, "sessions": row[name]}
+                    )
+
+        answers = await db.execute(
+            answer_option_select([FunnelEvent.created_at >= start, FunnelEvent.created_at < end], *dimensions)
+        )
+        for row in answers.mappings().all():
+            metric_rows.append(
+                {
+                    **row,
+                    "day": day,
+                    "metric": ANSWER_METRIC,
+                    "time_sum_ms": int(row["time_sum_ms"] or 0),
+                }
+            )
+        if metric_rows:
+            defaults = {"step_id": None, "value": None, "label": None, "sessions": 0, "events": 0, "time_sum_ms": 0, "time_count": 0}
+            await db.execute(insert(FunnelDailyMetric), [{**defaults, **row} for row in metric_rows])
+
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            pg_insert(FunnelRollupDay)
+            .values(day=day, created_at=now, updated_at=now)
+            .on_conflict_do_update(index_elements=[FunnelRollupDay.day], set_={"updated_at": now})
+        )
+
+
+funnel_rollup_service = FunnelRollupService()
+
+
+async def compact_funnel_rollups() -> int:
+    """Periodic task: compact closed days into the funnel rollup tables."""
+    async with AsyncSessionLocal() as db:
+        days = await funnel_rollup_service.pending_days(db, datetime.now(timezone.utc).date())
+        for day in days:
+            await funnel_rollup_service.compact_day(db, day)
+            await db.commit()
+
+    if days:
+        logger.info("[ANALYTICS] Compacted funnel rollups for %s day(s) up to %s", len(days), days[-1])
+    return len(days)
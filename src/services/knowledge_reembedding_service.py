@@ -0,0 +1,251 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import BackgroundJob, KnowledgeItem
+
+logger = logging.getLogger(__name__)
+
+REEMBED_JOB_TYPE = "knowledge_reembed"
+
+
+@dataclass
+class ReembeddingProgress:
+    target_model: str
+    serving_model: Optional[str]
+    total: int
+    migrated: int
+    in_progress: bool
+    started_at: Optional[datetime] = None
+    processed: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.migrated)
+
+    @property
+    def rate_per_minute(self) -> Optional[float]:
+        if not self.started_at or self.processed <= 0:
+            return None
+        elapsed = (datetime.now(timezone.utc) - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return self.processed * 60 / elapsed
+
+    @property
+    def eta_seconds(self) -> Optional[int]:
+        if self.remaining == 0:
+            return 0
+        rate = self.rate_per_minute
+        if not rate:
+            return None
+        return int(self.remaining * 60 / rate)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "target_model": self.target_model,
+            "serving_model": self.serving_model,
+            "total": self.total,
+            "migrated": self.migrated,
+            "remaining": self.remaining,
+            "in_progress": self.in_progress,
+            "started_at": self.started_at,
+            "rate_per_minute": round(self.rate_per_minute, 1) if self.rate_per_minute else None,
+            "eta_seconds": self.eta_seconds,
+        }
+
+
+class KnowledgeReembeddingService:
+    """Re-embeds the knowledge base after the org switches embedding models.
+
+    New-model vectors are staged in `pending_embedding` by a throttled background job,
+    while search keeps using the old vectors. Once every row is staged, a single UPDATE
+    swaps them in, so queries never compare vectors of different models.
+    """
+
+    async def resolve_target_model(self, db: AsyncSession, org_id: uuid.UUID) -> str:
+        from src.services.openrouter_service import openrouter_service
+        from src.services.prompt_service import prompt_service
+
+        config = await prompt_service.get_active_config(db, org_id)
+        return openrouter_service.resolve_embedding_model(config.embedding_model if config else None)
+
+    def _needs_reembed(self, target_model: str):
+        return (
+            KnowledgeItem.embedding_model.is_distinct_from(target_model),
+            KnowledgeItem.pending_embedding_model.is_distinct_from(target_model),
+        )
+
+    async def get_progress(self, db: AsyncSession, org_id: uuid.UUID) -> ReembeddingProgress:
+        from src.services.knowledge_service import knowledge_service
+
+        target_model = await self.resolve_target_model(db, org_id)
+        counts = await db.execute(
+            select(
+                func.count(KnowledgeItem.id),
+                func.count(KnowledgeItem.id).filter(
+                    or_(
+                        KnowledgeItem.embedding_model == target_model,
+                        KnowledgeItem.pending_embedding_model == target_model,
+                    )
+                ),
+            ).where(KnowledgeItem.org_id == org_id)
+        )
+        total, migrated = counts.one()
+        job = await self._latest_job(db, org_id)
+        payload = job.payload if job and isinstance(job.payload, dict) else {}
+        started_at = None
+        if payload.get("target_model") == target_model and payload.get("started_at"):
+            try:
+                started_at = datetime.fromisoformat(str(payload["started_at"]))
+            except ValueError:
+                started_at = None
+        return ReembeddingProgress(
+            target_model=target_model,
+            serving_model=await knowledge_service.get_serving_model(db, org_id),
+            total=int(total or 0),
+            migrated=int(migrated or 0),
+            in_progress=bool(job and job.status in ("queued", "retry", "running")),
+            started_at=started_at,
+            processed=int(payload.get("processed") or 0) if started_at else 0,
+        )
+
+    async def _latest_job(self, db: AsyncSession, org_id: uuid.UUID) -> Optional[BackgroundJob]:
+        result = await db.execute(
+            select(BackgroundJob)
+            .where(
+                BackgroundJob.job_type == REEMBED_JOB_TYPE,
+                BackgroundJob.payload["org_id"].astext == str(org_id),
+            )
+            .order_by(BackgroundJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def start_if_needed(self, db: AsyncSession, org_id: uuid.UUID) -> ReembeddingProgress:
+        """Enqueue the backfill when rows are not on the target model yet."""
+        from src.services.background_job_service import background_job_service
+
+        progress = await self.get_progress(db, org_id)
+        if progress.in_progress:
+            return progress
+        has_stale_rows = progress.remaining > 0 or (
+            progress.serving_model is not None and progress.serving_model != progress.target_model
+        )
+        if not has_stale_rows:
+            return progress
+
+        now = datetime.now(timezone.utc)
+        await background_job_service.enqueue(
+            db=db,
+            job_type=REEMBED_JOB_TYPE,
+            payload={
+                "org_id": str(org_id),
+                "target_model": progress.target_model,
+                "started_at": now.isoformat(),
+                "processed": 0,
+            },
+            max_attempts=5,
+        )
+        logger.info(
+            "Knowledge re-embedding started: org_id=%s %s -> %s remaining=%s",
+            org_id,
+            progress.serving_model,
+            progress.target_model,
+            progress.remaining,
+        )
+        progress.in_progress = True
+        progress.started_at = now
+        return progress
+
+    async def process_batch(self, db: AsyncSession, payload: dict[str, Any]) -> None:
+        """Stage one batch of new-model vectors and schedule the next run or cut over."""
+        from src.config import settings
+        from src.services.background_job_service import background_job_service
+        from src.services.openrouter_service import openrouter_service
+
+        org_id = uuid.UUID(str(payload["org_id"]))
+        target_model = str(payload["target_model"])
+        current_target = await self.resolve_target_model(db, org_id)
+        if current_target != target_model:
+            logger.info(
+                "Knowledge re-embedding to %s superseded by %s for org %s", target_model, current_target, org_id
+            )
+            return
+
+        batch_size = max(1, settings.knowledge_reembed_batch_size)
+        result = await db.execute(
+            select(KnowledgeItem.id, KnowledgeItem.content)
+            .where(KnowledgeItem.org_id == org_id, *self._needs_reembed(target_model))
+            .order_by(KnowledgeItem.created_at.asc())
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if rows:
+            embeddings = await openrouter_service.generate_embeddings_batch(
+                [row.content for row in rows],
+                model=target_model,
+            )
+            for row, embedding in zip(rows, embeddings):
+                await db.execute(
+                    update(KnowledgeItem)
+                    .where(KnowledgeItem.id == row.id)
+                    .values(pending_embedding=embedding, pending_embedding_model=target_model)
+                )
+            await db.commit()
+
+        processed = int(payload.get("processed") or 0) + len(rows)
+        if len(rows) == batch_size:
+            await background_job_service.enqueue(
+                db=db,
+                job_type=REEMBED_JOB_TYPE,
+                payload={**payload, "processed": processed},
+                max_attempts=5,
+                run_at=datetime.now(timezone.utc)
+                + timedelta(seconds=max(0, settings.knowledge_reembed_batch_delay_seconds)),
+            )
+            return
+
+        await self.cut_over(db, org_id, target_model)
+        logger.info(
+            "Knowledge re-embedding finished: org_id=%s model=%s processed=%s",
+            org_id,
+            target_model,
+            processed,
+        )
+
+    async def cut_over(self, db: AsyncSession, org_id: uuid.UUID, target_model: str) -> int:
+        """Swap staged vectors in one statement once nothing is left on the old model."""
+        remaining = await db.execute(
+            select(func.count(KnowledgeItem.id)).where(
+                KnowledgeItem.org_id == org_id,
+                *self._needs_reembed(target_model),
+            )
+        )
+        if (remaining.scalar_one() or 0) > 0:
+            raise ValueError(f"Knowledge re-embedding for org {org_id} still has rows on the old model")
+
+        result = await db.execute(
+            update(KnowledgeItem)
+            .where(
+                KnowledgeItem.org_id == org_id,
+                KnowledgeItem.pending_embedding_model == target_model,
+            )
+            .values(
+                embedding=KnowledgeItem.pending_embedding,
+                embedding_model=KnowledgeItem.pending_embedding_model,
+                pending_embedding=None,
+                pending_embedding_model=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+
+knowledge_reembedding_service = KnowledgeReembeddingService()
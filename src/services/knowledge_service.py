@@ -1,10 +1,10 @@
 import uuid
-import fitz
-import io
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from src.models.knowledge import KnowledgeItem
+from src.services.cpu_executor import run_cpu
+from src.services.cpu_tasks import extract_pdf_text
 from src.services.openrouter_service import openrouter_service
 
 class KnowledgeService:
@@ -22,7 +22,11 @@ class KnowledgeService:
         embedding_model: Optional[str] = None
     ) -> KnowledgeItem:
         """Add an item to the knowledge base and generate its embedding"""
-        embedding = await openrouter_service.generate_embeddings(content, model=embedding_model)
+        if not embedding_model:
+            embedding_model = await KnowledgeService._active_embedding_model(db, org_id)
+        target_model = openrouter_service.resolve_embedding_model(embedding_model)
+        serving_model = await KnowledgeService.get_serving_model(db, org_id)
+        embedding = await openrouter_service.generate_embeddings(content, model=target_model)
         
         item = KnowledgeItem(
             org_id=org_id,
@@ -31,13 +35,40 @@ class KnowledgeService:
             category=category,
             title=title,
             embedding=embedding,
+            embedding_model=target_model,
             metadata_json=metadata_json
         )
+        if serving_model and serving_model != target_model:
+            # Re-embedding is in progress: keep the live vector on the serving model
+            # and stage the new-model vector for the cut-over.
+            item.pending_embedding = embedding
+            item.pending_embedding_model = target_model
+            item.embedding = await openrouter_service.generate_embeddings(content, model=serving_model)
+            item.embedding_model = serving_model
         db.add(item)
         await db.commit()
         await db.refresh(item)
         return item
 
+    @staticmethod
+    async def _active_embedding_model(db: AsyncSession, org_id: uuid.UUID) -> Optional[str]:
+        from src.services.prompt_service import prompt_service
+
+        config = await prompt_service.get_active_config(db, org_id)
+        return config.embedding_model if config else None
+
+    @staticmethod
+    async def get_serving_model(db: AsyncSession, org_id: uuid.UUID) -> Optional[str]:
+        """Model of the live vectors that queries are embedded with (None for legacy rows)"""
+        result = await db.execute(
+            select(KnowledgeItem.embedding_model)
+            .where(KnowledgeItem.org_id == org_id, KnowledgeItem.embedding.isnot(None))
+            .group_by(KnowledgeItem.embedding_model)
+            .order_by(func.count(KnowledgeItem.id).desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def search_knowledge(
         db: AsyncSession,
@@ -53,37 +84,44 @@ class KnowledgeService:
         """Perform semantic search in the knowledge base"""
         from sqlalchemy import or_
 
-        exists_stmt = select(func.count(KnowledgeItem.id)).where(KnowledgeItem.org_id == org_id)
+        scope_stmt = select(KnowledgeItem.id).where(KnowledgeItem.org_id == org_id)
         if lead_id:
-            exists_stmt = exists_stmt.where(
+            scope_stmt = scope_stmt.where(
                 or_(
                     KnowledgeItem.lead_id == None,
                     KnowledgeItem.lead_id == lead_id
                 )
             )
         else:
-            exists_stmt = exists_stmt.where(KnowledgeItem.lead_id == None)
+            scope_stmt = scope_stmt.where(KnowledgeItem.lead_id == None)
         if category:
-            exists_stmt = exists_stmt.where(KnowledgeItem.category == category)
+            scope_stmt = scope_stmt.where(KnowledgeItem.category == category)
 
-        exists_result = await db.execute(exists_stmt)
-        if (exists_result.scalar_one() or 0) == 0:
+        scope_result = await db.execute(scope_stmt.limit(1))
+        if scope_result.first() is None:
             return []
 
+        # Only vectors of one model are comparable: embed the query with the same org-wide
+        # model that indexing and the re-embedding backfill resolve.
+        serving_model = await KnowledgeService.get_serving_model(db, org_id)
+
         # Langfuse Tracing
         span = None
         if openrouter_service.langfuse and trace_id:
             trace = openrouter_service.langfuse.trace(id=trace_id, user_id=user_id)
             span = trace.span(name="knowledge-base-search", input=query)
 
-        query_embedding = await openrouter_service.generate_embeddings(query, model=embedding_model)
+        query_embedding = await openrouter_service.generate_embeddings(query, model=serving_model or embedding_model)
         
         # 1. Vector Search
         # We search for items that:
         # a) Belong to the organization AND have NO lead_id (general knowledge)
         # b) OR belong to the organization AND match the specific lead_id (this lead's history)
         vec_stmt = select(KnowledgeItem).where(
-            KnowledgeItem.org_id == org_id
+            KnowledgeItem.org_id == org_id,
+            KnowledgeItem.embedding_model == serving_model
+            if serving_model
+            else KnowledgeItem.embedding_model.is_(None)
         )
         
         if lead_id:
@@ -219,16 +257,7 @@ class KnowledgeService:
             logger = logging.getLogger(__name__)
             logger.info(f"Processing PDF: {filename} ({len(file_content)} bytes)")
             try:
-                pdf_doc = fitz.open(stream=file_content, filetype="pdf")
-                text_blocks = []
-                for page in pdf_doc:
-                    # 'blocks' extraction preserves structural reading order
-                    blocks = page.get_text("blocks")
-                    # b[6] == 0 means it's a text block
-                    page_text = "\n\n".join([b[4].strip() for b in blocks if b[6] == 0])
-                    if page_text:
-                        text_blocks.append(page_text)
-                text = "\n\n".join(text_blocks)
+                text = await run_cpu(extract_pdf_text, file_content)
                 logger.info(f"Extracted {len(text)} characters from PDF")
             except Exception as e:
                 logger.error(f"Failed to extract text from PDF: {e}")
@@ -259,6 +288,19 @@ class KnowledgeService:
         
         return count
 
+    @staticmethod
+    async def list_items(db: AsyncSession, org_id: uuid.UUID, columns: list) -> list:
+        """Knowledge rows of an organization, newest first.
+
+        Always a column select: loading whole items would read both embedding vectors.
+        """
+        result = await db.execute(
+            select(*columns)
+            .where(KnowledgeItem.org_id == org_id)
+            .order_by(KnowledgeItem.created_at.desc())
+        )
+        return list(result.all())
+
     @staticmethod
     async def clear_knowledge(db: AsyncSession, org_id: uuid.UUID) -> int:
         """Delete all knowledge items for an organization"""
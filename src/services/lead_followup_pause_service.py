@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from src.models import Lead, LeadStatus
+from src.models.lead_data import lead_data
 
 
 @dataclass(frozen=True)
@@ -101,9 +102,7 @@ class LeadFollowupPauseService:
         if not getattr(lead, "next_followup_at", None):
             return False
 
-        data = self._parse_json(getattr(lead, "extracted_data", None))
-        pause = data.get("followup_pause")
-        if not isinstance(pause, dict):
+        if not lead_data(lead).section("followup_pause"):
             return False
 
         return bool(self._ACKNOWLEDGEMENT_PATTERN.match(message_text or ""))
@@ -11,6 +11,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Lead, LeadStatus
+from src.services.cpu_executor import run_cpu
 from src.services.lead_service import lead_service
 from src.services.lead_audit_service import lead_audit_service
 
@@ -53,7 +54,8 @@ class LeadImportService:
         if not file_bytes:
             raise ValueError("Файл пустой.")
 
-        headers, raw_rows = LeadImportService._parse_file(filename=filename, file_bytes=file_bytes)
+        # openpyxl parsing of a large workbook holds the GIL for seconds; keep it off the event loop.
+        headers, raw_rows = await run_cpu(LeadImportService._parse_file, filename, file_bytes)
         mapping = LeadImportService._detect_column_mapping(headers)
         mapping = LeadImportService._enhance_mapping_with_value_heuristics(
             headers=headers,
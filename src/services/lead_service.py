@@ -1,17 +1,95 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from typing import Optional, List, Any
+from sqlalchemy import select, func, or_, tuple_, literal_column
+from typing import Optional, List, Any, Sequence
+import re
 import uuid
 import json
 from datetime import datetime, timedelta, timezone
 
 from src.models import Lead, LeadStatus
+from src.models.lead import canonical_phone_digits
 from src.schemas.lead import LeadCreate, LeadUpdate
+from src.services.report_cache import report_cache
 
 
 class LeadService:
     """Service for managing leads"""
 
+    # What a kanban card renders; the summary is cut to the card's preview length.
+    BOARD_CARD_COLUMNS = (
+        Lead.id,
+        Lead.status,
+        Lead.full_name,
+        Lead.username,
+        Lead.phone,
+        Lead.telegram_id,
+        Lead.avatar_url,
+        Lead.source,
+        func.left(Lead.ai_summary, 300).label("ai_summary"),
+        Lead.readiness_score,
+        Lead.telegram_lookup_status,
+        Lead.telegram_lookup_error,
+        Lead.unread_count,
+        Lead.last_message_at,
+        # Only read for the messenger badges, see board_card()
+        Lead.extracted_data,
+    )
+
+    # Fragments with fewer digits cannot use the phone_digits trigram index.
+    MIN_PHONE_SEARCH_DIGITS = 3
+    PHONE_SEARCH_RE = re.compile(r"^[\d\s()+\-.]+$")
+
+    @staticmethod
+    def phone_lookup_filter(phone: Optional[str]):
+        """
+        Indexed match on the generated `phone_digits` column: the same canonical digits,
+        or the same last 10 digits for numbers stored with another country prefix.
+        Returns None when the value has no usable digits.
+        """
+        digits = canonical_phone_digits(phone)
+        if not digits:
+            return None
+        if len(digits) < 10:
+            return Lead.phone_digits == digits
+        # The literal keeps the expression identical to ix_leads_org_phone_tail under
+        # prepared statements.
+        return or_(
+            Lead.phone_digits == digits,
+            func.right(Lead.phone_digits, literal_column("10")) == digits[-10:],
+        )
+
+    @staticmethod
+    def phone_search_fragments(digits: str) -> list[str]:
+        """
+        Digit patterns for a typed number or part of one: its canonical form and, for a
+        partial number typed with the 8 trunk prefix, the same digits with the stored 7.
+        """
+        fragments = [canonical_phone_digits(digits)]
+        if len(digits) < 11 and digits.startswith("8"):
+            fragments.append("7" + digits[1:])
+        return fragments
+
+    @classmethod
+    def search_filter(cls, search: str):
+        """
+        Name/username trigram match, plus a digit-fragment match on phone_digits for
+        phone-like input or a plain match on the stored phone for anything else.
+        """
+        search_pattern = f"%{search}%"
+        conditions = [
+            Lead.full_name.ilike(search_pattern),
+            Lead.username.ilike(search_pattern),
+        ]
+        if cls.PHONE_SEARCH_RE.match(search):
+            digits = re.sub(r"\D", "", search)
+            if len(digits) >= cls.MIN_PHONE_SEARCH_DIGITS:
+                conditions.extend(
+                    Lead.phone_digits.like(f"%{fragment}%") for fragment in cls.phone_search_fragments(digits)
+                )
+        else:
+            conditions.append(Lead.phone.ilike(search_pattern))
+        return or_(*conditions)
+
     @staticmethod
     async def resolve_contact_data(
         db: AsyncSession,
@@ -173,6 +251,7 @@ class LeadService:
             
             if updated:
                 await db.commit()
+                await report_cache.bump(lead.org_id)
                 await db.refresh(lead)
             return lead
         
@@ -189,6 +268,7 @@ class LeadService:
         
         db.add(lead)
         await db.commit()
+        await report_cache.bump(org_id)
         await db.refresh(lead)
         
         return lead
@@ -263,6 +343,7 @@ class LeadService:
                     updated = True
                 if updated:
                     await db.commit()
+                    await report_cache.bump(existing.org_id)
                     await db.refresh(existing)
                 return existing
 
@@ -288,6 +369,7 @@ class LeadService:
         
         db.add(lead)
         await db.commit()
+        await report_cache.bump(org_id)
         await db.refresh(lead)
         
         return lead
@@ -306,6 +388,7 @@ class LeadService:
         
         lead.status = status
         await db.commit()
+        await report_cache.bump(lead.org_id)
         await db.refresh(lead)
         
         return lead
@@ -331,6 +414,7 @@ class LeadService:
                 setattr(lead, key, value)
         
         await db.commit()
+        await report_cache.bump(lead.org_id)
         await db.refresh(lead)
         
         return lead
@@ -371,6 +455,27 @@ class LeadService:
         await db.refresh(lead)
         return True
     
+    @staticmethod
+    def list_filters(
+        org_id: uuid.UUID,
+        status: Optional[LeadStatus] = None,
+        source: Optional[str] = None,
+        search: Optional[str] = None,
+        created_since_hours: Optional[int] = None,
+    ) -> list:
+        """WHERE clauses shared by the lead list and the kanban board."""
+        conditions = [Lead.org_id == org_id]
+        if status:
+            conditions.append(Lead.status == status)
+        if source:
+            conditions.append(Lead.source == source)
+        if created_since_hours:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=created_since_hours)
+            conditions.append(Lead.created_at >= cutoff)
+        if search:
+            conditions.append(LeadService.search_filter(search.strip()))
+        return conditions
+
     @staticmethod
     async def get_leads_by_org(
         db: AsyncSession,
@@ -380,48 +485,115 @@ class LeadService:
         search: Optional[str] = None,
         created_since_hours: Optional[int] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> tuple[List[Lead], int]:
+        page_size: int = 20,
+        cursor: Optional[tuple[Optional[datetime], uuid.UUID]] = None,
+        include_total: bool = True,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[List[Any], Optional[int]]:
         """
         Get paginated leads for an organization with optional filters.
-        Returns (leads, total_count).
+        Returns (leads, total_count); total_count is None when include_total is False.
+
+        With a cursor (the `(last_message_at, id)` of the last lead already shown) the
+        page is read by keyset instead of OFFSET, so deep pages cost the same as the first.
+        With `columns` only those are selected and rows come back instead of Lead objects.
         """
-        # Build query
-        query = select(Lead).where(Lead.org_id == org_id)
-        
-        # Apply filters
-        if status:
-            query = query.where(Lead.status == status)
-            
-        if source:
-            query = query.where(Lead.source == source)        
-        if created_since_hours:
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=created_since_hours)
-            query = query.where(Lead.created_at >= cutoff)
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                or_(
-                    Lead.full_name.ilike(search_pattern),
-                    Lead.phone.ilike(search_pattern),
-                    Lead.username.ilike(search_pattern)
-                )
-            )
+        query = (select(*columns) if columns else select(Lead)).where(
+            *LeadService.list_filters(org_id, status, source, search, created_since_hours)
+        )
         
         # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        total = None
+        if include_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            count_result = await db.execute(count_query)
+            total = count_result.scalar_one()
         
-        # Get paginated results (ordered by last_message_at DESC)
-        offset = (page - 1) * page_size
-        query = query.order_by(Lead.last_message_at.desc().nullslast()).offset(offset).limit(page_size)
-        
-        result = await db.execute(query)
-        leads = result.scalars().all()
+        # Ordered by last_message_at DESC NULLS LAST, id DESC (ix_leads_org_last_message_at_id)
+        if cursor is None:
+            offset = (page - 1) * page_size
+            result = await db.execute(
+                query.order_by(Lead.last_message_at.desc().nullslast(), Lead.id.desc())
+                .offset(offset)
+                .limit(page_size)
+            )
+            return list(result.all() if columns else result.scalars().all()), total
+
+        # Leads that never exchanged a message sort last. They are read as a second range
+        # so each part stays a plain index scan instead of an OR the planner cannot seek.
+        last_message_at, last_id = cursor
+        leads: List[Any] = []
+        if last_message_at is not None:
+            result = await db.execute(
+                query.where(tuple_(Lead.last_message_at, Lead.id) < tuple_(last_message_at, last_id))
+                .order_by(Lead.last_message_at.desc(), Lead.id.desc())
+                .limit(page_size)
+            )
+            leads = list(result.all() if columns else result.scalars().all())
+        if len(leads) < page_size:
+            null_query = query.where(Lead.last_message_at.is_(None))
+            if last_message_at is None:
+                null_query = null_query.where(Lead.id < last_id)
+            result = await db.execute(
+                null_query.order_by(Lead.id.desc()).limit(page_size - len(leads))
+            )
+            leads.extend(result.all() if columns else result.scalars().all())
         
-        return list(leads), total
+        return leads, total
     
+    @staticmethod
+    async def get_board(
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        per_status: int = 20,
+        source: Optional[str] = None,
+        search: Optional[str] = None,
+        created_since_hours: Optional[int] = None,
+    ) -> tuple[dict[str, int], list[dict[str, Any]]]:
+        """
+        Kanban data in two statements: per-status counts from one GROUP BY and the first
+        `per_status` cards of every status from one windowed query, in list order.
+        Returns (counts_by_status, card_rows).
+        """
+        filters = LeadService.list_filters(org_id, None, source, search, created_since_hours)
+        counts_result = await db.execute(
+            select(Lead.status, func.count(Lead.id)).where(*filters).group_by(Lead.status)
+        )
+        counts = {str(status): int(count) for status, count in counts_result.all()}
+
+        rank = func.row_number().over(
+            partition_by=Lead.status,
+            order_by=(Lead.last_message_at.desc().nullslast(), Lead.id.desc()),
+        )
+        ranked = (
+            select(*LeadService.BOARD_CARD_COLUMNS, rank.label("rank"))
+            .where(*filters)
+            .subquery()
+        )
+        cards_result = await db.execute(
+            select(ranked).where(ranked.c.rank <= per_status).order_by(ranked.c.status, ranked.c.rank)
+        )
+        return counts, [LeadService.board_card(row) for row in cards_result.mappings().all()]
+
+    @staticmethod
+    def board_card(row) -> dict[str, Any]:
+        """Card payload: the extracted_data blob is reduced to the messenger badges."""
+        card = {key: value for key, value in row.items() if key not in ("extracted_data", "rank")}
+        data: dict = {}
+        if row["extracted_data"]:
+            try:
+                parsed = json.loads(row["extracted_data"])
+                data = parsed if isinstance(parsed, dict) else {}
+            except json.JSONDecodeError:
+                data = {}
+        messengers = data.get("messengers") if isinstance(data.get("messengers"), dict) else {}
+        card["messengers"] = {
+            "telegram": bool(messengers.get("telegram")),
+            "whatsapp": bool(messengers.get("whatsapp")),
+        }
+        card["whatsapp_wa_id"] = str(data["whatsapp_wa_id"]) if data.get("whatsapp_wa_id") else None
+        return card
+
     @staticmethod
     async def get_lead_by_id(
         db: AsyncSession,
@@ -447,8 +619,10 @@ class LeadService:
         if not lead:
             return False
         
+        org_id = lead.org_id
         await db.delete(lead)
         await db.commit()
+        await report_cache.bump(org_id)
         
         return True
 
@@ -479,6 +653,8 @@ class LeadService:
             deleted += 1
 
         await db.commit()
+        if deleted:
+            await report_cache.bump(org_id)
         return deleted
 
 
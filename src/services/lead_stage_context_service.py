@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any
-import json
 import re
 import uuid
 from datetime import datetime, timezone
@@ -13,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.models import ChatMessage, FunnelEvent, FunnelSession, Lead, LeadStatus
+from src.models.lead_data import lead_data
 from src.services.quiz_value_normalizer import normalize_quiz_design_answer
 
 
@@ -44,7 +44,7 @@ class LeadStageContextService:
         lead: Lead,
         personal_quiz_url: str | None = None,
     ) -> LeadStageContext:
-        extracted = self._parse_json(lead.extracted_data)
+        extracted = lead_data(lead).data
         followup_pause = extracted.get("followup_pause") if isinstance(extracted.get("followup_pause"), dict) else {}
         quiz = extracted.get("quiz") if isinstance(extracted.get("quiz"), dict) else {}
         answers = quiz.get("answers") if isinstance(quiz.get("answers"), dict) else {}
@@ -474,14 +474,5 @@ RESPONSE_POLICY:
     def _missing_quiz_fields(self, answers: dict[str, Any]) -> list[str]:
         return [key for key in QUIZ_ANSWER_LABELS if not answers.get(key)]
 
-    def _parse_json(self, value: str | None) -> dict[str, Any]:
-        if not value:
-            return {}
-        try:
-            parsed = json.loads(value)
-            return parsed if isinstance(parsed, dict) else {}
-        except json.JSONDecodeError:
-            return {}
-
 
 lead_stage_context_service = LeadStageContextService()
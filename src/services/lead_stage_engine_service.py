@@ -29,6 +29,14 @@ HUMAN_LOCKED_STATUSES = {
     LeadStatus.SPAM.value,
 }
 
+# Events that may still move a lead out of a human-locked status
+HUMAN_LOCK_OVERRIDE_EVENTS = {
+    "contract_signed",
+    "payment_received",
+    "keys_received",
+    "work_started",
+}
+
 ENGINE_MANAGED_STATUSES = {
     LeadStatus.NEW.value,
     LeadStatus.QUIZ_COMPLETED.value,
@@ -98,12 +106,7 @@ class LeadStageEngineService:
     ) -> StageDecision | None:
         if lead.status in TERMINAL_STATUSES:
             return None
-        if lead.status in HUMAN_LOCKED_STATUSES and event_type not in {
-            "contract_signed",
-            "payment_received",
-            "keys_received",
-            "work_started",
-        }:
+        if lead.status in HUMAN_LOCKED_STATUSES and event_type not in HUMAN_LOCK_OVERRIDE_EVENTS:
             return None
         if lead.status and lead.status not in ENGINE_MANAGED_STATUSES:
             return None
@@ -206,6 +206,9 @@ class MeasurementBookingService:
                 payload={"lead_id": str(lead.id), "start": start, "address": address, "booking_uid": booking_uid},
                 max_attempts=2,
                 run_at=run_at,
+                # One reminder per lead: a reschedule re-arms it, an identical resubmit is ignored
+                dedup_key=f"measurement_telegram_reminder:{lead.id}",
+                replace_existing=True,
             )
             logger.info("Measurement Telegram reminder enqueued: lead_id=%s run_at=%s booking_uid=%s", lead.id, run_at.isoformat(), booking_uid)
         except Exception:
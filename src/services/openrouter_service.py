@@ -536,16 +536,32 @@ class OpenRouterService:
         
         return False
     
+    @staticmethod
+    def resolve_embedding_model(model: Optional[str] = None) -> str:
+        """Normalize an embedding model name the way it is sent to OpenRouter."""
+        emb_model = str(model or "").strip() or getattr(settings, 'openrouter_embedding_model', 'openai/text-embedding-3-small')
+        # Ensure model has provider prefix for OpenRouter
+        if '/' not in emb_model:
+            emb_model = f"openai/{emb_model}"
+        return emb_model
+
     async def generate_embeddings(self, text: str, model: Optional[str] = None) -> List[float]:
         """
         Generate vector embeddings for text using OpenRouter API (direct HTTP)
         """
-        # Ensure model has provider prefix for OpenRouter
-        emb_model = model or getattr(settings, 'openrouter_embedding_model', 'openai/text-embedding-3-small')
-        if '/' not in emb_model:
-            emb_model = f"openai/{emb_model}"
-            
-        logger.info(f"Generating embeddings with model: {emb_model}")
+        embeddings = await self.generate_embeddings_batch([text], model=model)
+        return embeddings[0]
+
+    async def generate_embeddings_batch(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """
+        Generate vector embeddings for several texts in one OpenRouter request.
+        Results are returned in the same order as the input texts.
+        """
+        emb_model = self.resolve_embedding_model(model)
+        if not texts:
+            return []
+
+        logger.info(f"Generating embeddings with model: {emb_model} (batch={len(texts)})")
         
         try:
             # Prepare headers
@@ -562,7 +578,7 @@ class OpenRouterService:
                 headers=headers,
                 json={
                     "model": emb_model,
-                    "input": [text]  # Use list format which is more robust
+                    "input": list(texts)  # Use list format which is more robust
                 },
                 timeout=45.0
             )
@@ -585,22 +601,13 @@ class OpenRouterService:
             data = response.json()
             if not data or "data" not in data or not data["data"]:
                 raise ValueError(f"OpenRouter API returned empty data for model {emb_model}")
-                
-            embedding = data["data"][0]["embedding"]
-            
-            # Dimension Guard: ensure always 1536 dimensions for the database
-            target_dim = 1536
-            current_dim = len(embedding)
-            
-            if current_dim < target_dim:
-                logger.info(f"Padding embedding from {current_dim} to {target_dim} (zero-padding)")
-                embedding = list(embedding)
-                embedding.extend([0.0] * (target_dim - current_dim))
-            elif current_dim > target_dim:
-                logger.warning(f"Truncating embedding from {current_dim} to {target_dim}")
-                embedding = embedding[:target_dim]
-                
-            return embedding
+            if len(data["data"]) != len(texts):
+                raise ValueError(
+                    f"OpenRouter API returned {len(data['data'])} embeddings for {len(texts)} inputs (model {emb_model})"
+                )
+
+            ordered = sorted(data["data"], key=lambda item: item.get("index", 0))
+            return [self._fit_embedding_dimension(item["embedding"]) for item in ordered]
             
         except httpx.HTTPError as e:
             logger.error(f"HTTP error generating embeddings: {str(e)}")
@@ -609,6 +616,22 @@ class OpenRouterService:
             logger.error(f"Error generating embeddings: {str(e)}")
             raise ValueError(f"Ошибка OpenRouter: {str(e)}")
 
+    @staticmethod
+    def _fit_embedding_dimension(embedding: List[float]) -> List[float]:
+        # Dimension Guard: ensure always 1536 dimensions for the database
+        target_dim = 1536
+        current_dim = len(embedding)
+        
+        if current_dim < target_dim:
+            logger.info(f"Padding embedding from {current_dim} to {target_dim} (zero-padding)")
+            embedding = list(embedding)
+            embedding.extend([0.0] * (target_dim - current_dim))
+        elif current_dim > target_dim:
+            logger.warning(f"Truncating embedding from {current_dim} to {target_dim}")
+            embedding = embedding[:target_dim]
+            
+        return embedding
+
     async def close(self):
         """Close HTTP client"""
         await self.client.aclose()
@@ -0,0 +1,31 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row a client has seen, so the next page
+starts with an index range scan instead of skipping `OFFSET` rows.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that was not produced by `encode_cursor`."""
+
+
+def encode_cursor(sort_value: Optional[datetime], row_id: uuid.UUID) -> str:
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return (
+            datetime.fromisoformat(sort_value) if sort_value is not None else None,
+            uuid.UUID(str(row_id)),
+        )
+    except (ValueError, TypeError, UnicodeDecodeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
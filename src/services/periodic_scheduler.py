@@ -0,0 +1,382 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import AsyncSessionLocal, engine
+from src.models import PeriodicTaskState
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-int advisory lock form; keeps scheduler locks apart from any other user
+SCHEDULER_LOCK_NAMESPACE = 0x5C4ED
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed int32 lock key for a task name."""
+    value = zlib.crc32(name.encode("utf-8"))
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class PeriodicTask:
+    """A coroutine run every `interval_seconds` by exactly one worker replica."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    initial_delay_seconds: float = 0.0
+
+    @property
+    def lock_key(self) -> int:
+        return advisory_lock_key(self.name)
+
+
+@dataclass
+class PeriodicTaskStats:
+    runs: int = 0
+    failures: int = 0
+    overruns: int = 0
+    skipped_not_leader: int = 0
+    last_duration_seconds: float | None = None
+    max_duration_seconds: float = 0.0
+    last_error: str | None = None
+    history: list[dict[str, Any]] = field(default_factory=list)
+
+    def record(self, started_at: datetime, duration: float, error: str | None, overrun: bool, keep: int = 20) -> None:
+        self.runs += 1
+        self.failures += 1 if error else 0
+        self.overruns += 1 if overrun else 0
+        self.last_duration_seconds = duration
+        self.max_duration_seconds = max(self.max_duration_seconds, duration)
+        self.last_error = error
+        self.history.append(
+            {
+                "started_at": started_at.isoformat(),
+                "duration_seconds": round(duration, 3),
+                "status": "failed" if error else "done",
+                "overrun": overrun,
+            }
+        )
+        del self.history[:-keep]
+
+
+class AdvisoryLockLeader:
+    """Holds session-level advisory locks on one dedicated connection.
+
+    A replica is the leader of a task while it holds that task's lock. If the process
+    dies or its connection drops, Postgres releases the lock and another replica takes
+    over on its next attempt. Needs a direct (session) connection, not a transaction
+    pooler, since the lock lives as long as the session.
+    """
+
+    def __init__(self, namespace: int = SCHEDULER_LOCK_NAMESPACE) -> None:
+        self.namespace = namespace
+        self.held: set[int] = set()
+        self._connection = None
+        self._driver_connection = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    async def _ensure_connection(self) -> None:
+        if self.connected:
+            return
+        await self._close()
+        connection = await engine.connect()
+        raw_connection = await connection.get_raw_connection()
+        self._connection = connection
+        self._driver_connection = raw_connection.driver_connection
+
+    async def acquire(self, key: int) -> bool:
+        """Return True while this replica holds the lock for `key`."""
+        async with self._lock:
+            try:
+                await self._ensure_connection()
+                if key in self.held:
+                    # Cheap liveness check: a dead session means the lock is already gone
+                    await self._driver_connection.fetchval("SELECT 1")
+                    return True
+                acquired = await self._driver_connection.fetchval(
+                    "SELECT pg_try_advisory_lock($1, $2)", self.namespace, key
+                )
+            except Exception as exc:
+                logger.warning("Scheduler leader connection lost: %s", exc)
+                await self._close()
+                return False
+            if acquired:
+                self.held.add(key)
+            return bool(acquired)
+
+    async def _close(self) -> None:
+        connection, self._connection, self._driver_connection = self._connection, None, None
+        if self.held:
+            logger.warning("Scheduler lost leadership of %s task(s)", len(self.held))
+        self.held.clear()
+        if connection is None:
+            return
+        try:
+            # Invalidate instead of close: a pooled connection would keep holding the locks
+            await connection.invalidate()
+        except Exception:
+            logger.debug("Failed to close scheduler leader connection", exc_info=True)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close()
+
+
+class PeriodicScheduler:
+    """Runs declared periodic tasks on whichever worker replica holds each task's lock."""
+
+    def __init__(
+        self,
+        tasks: list[PeriodicTask],
+        leader: AdvisoryLockLeader | None = None,
+        worker_id: str | None = None,
+        lock_retry_seconds: float = 15.0,
+    ) -> None:
+        self.tasks = tasks
+        self.leader = leader or AdvisoryLockLeader()
+        self.worker_id = worker_id or default_worker_id()
+        self.lock_retry_seconds = lock_retry_seconds
+        self.stats: dict[str, PeriodicTaskStats] = {task.name: PeriodicTaskStats() for task in tasks}
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        logger.info(
+            "Periodic scheduler started: worker=%s tasks=%s",
+            self.worker_id,
+            ", ".join(f"{task.name}/{task.interval_seconds:g}s" for task in self.tasks),
+        )
+        runners = [asyncio.create_task(self._run_task(task, stop_event)) for task in self.tasks]
+        try:
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+            await self.leader.close()
+
+    async def _sleep(self, stop_event: asyncio.Event, seconds: float) -> bool:
+        """Sleep up to `seconds`; return True when the scheduler is stopping."""
+        if seconds <= 0:
+            return stop_event.is_set()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run_task(self, task: PeriodicTask, stop_event: asyncio.Event) -> None:
+        stats = self.stats[task.name]
+        loop = asyncio.get_running_loop()
+        if await self._sleep(stop_event, task.initial_delay_seconds):
+            return
+        leading = False
+        next_run_at = loop.time()
+
+        while not stop_event.is_set():
+            if await self._sleep(stop_event, next_run_at - loop.time()):
+                return
+            if not await self.leader.acquire(task.lock_key):
+                if leading:
+                    logger.warning("Scheduler task %s: leadership lost", task.name)
+                leading = False
+                stats.skipped_not_leader += 1
+                next_run_at = loop.time() + self.lock_retry_seconds
+                continue
+            if not leading:
+                leading = True
+                # Respect the previous leader's schedule instead of running again right away
+                due_in = await self._seconds_until_due(task)
+                logger.info("Scheduler task %s: leader is %s (due in %.0fs)", task.name, self.worker_id, due_in)
+                if due_in > 0:
+                    next_run_at = loop.time() + due_in
+                    continue
+
+            started_at = datetime.now(timezone.utc)
+            started = loop.time()
+            error = None
+            try:
+                await task.func()
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                logger.error("Scheduler task %s failed: %s", task.name, exc, exc_info=True)
+            duration = loop.time() - started
+            overrun = duration > task.interval_seconds
+            stats.record(started_at, duration, error, overrun)
+            if overrun:
+                logger.warning(
+                    "Scheduler task %s overran its interval: %.1fs > %ss",
+                    task.name,
+                    duration,
+                    task.interval_seconds,
+                )
+            await self._save_run(task, started_at, duration, error, overrun)
+
+            jitter = random.uniform(0, task.jitter_seconds) if task.jitter_seconds > 0 else 0.0
+            # An overrun skips missed ticks rather than running back to back
+            next_run_at = max(started + task.interval_seconds + jitter, loop.time())
+
+    async def _seconds_until_due(self, task: PeriodicTask) -> float:
+        try:
+            async with AsyncSessionLocal() as db:
+                state = await get_task_state(db, task.name)
+        except Exception as exc:
+            logger.warning("Failed to load scheduler state for %s: %s", task.name, exc)
+            return 0.0
+        if state is None or state.last_started_at is None:
+            return 0.0
+        due_at = state.last_started_at + timedelta(seconds=task.interval_seconds)
+        return max(0.0, (due_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def _save_run(
+        self,
+        task: PeriodicTask,
+        started_at: datetime,
+        duration: float,
+        error: str | None,
+        overrun: bool,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        values = {
+            "leader_id": self.worker_id,
+            "last_status": "failed" if error else "done",
+            "last_started_at": started_at,
+            "last_finished_at": now,
+            "last_duration_ms": int(duration * 1000),
+            "last_error": error[:2000] if error else None,
+            "updated_at": now,
+        }
+        stmt = pg_insert(PeriodicTaskState).values(
+            name=task.name,
+            run_count=1,
+            failure_count=1 if error else 0,
+            overrun_count=1 if overrun else 0,
+            created_at=now,
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PeriodicTaskState.name],
+            set_={
+                **values,
+                "run_count": PeriodicTaskState.run_count + 1,
+                "failure_count": PeriodicTaskState.failure_count + (1 if error else 0),
+                "overrun_count": PeriodicTaskState.overrun_count + (1 if overrun else 0),
+            },
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as exc:
+            logger.warning("Failed to save scheduler run of %s: %s", task.name, exc)
+
+
+async def get_task_state(db: AsyncSession, name: str) -> PeriodicTaskState | None:
+    result = await db.execute(select(PeriodicTaskState).where(PeriodicTaskState.name == name))
+    return result.scalar_one_or_none()
+
+
+async def list_task_states(db: AsyncSession) -> list[PeriodicTaskState]:
+    result = await db.execute(select(PeriodicTaskState).order_by(PeriodicTaskState.name.asc()))
+    return list(result.scalars().all())
+
+
+def render_scheduler_metrics(states: list[PeriodicTaskState]) -> str:
+    lines = [
+        "# HELP periodic_task_runs_total Scheduler task runs across all worker replicas.",
+        "# TYPE periodic_task_runs_total counter",
+    ]
+    for state in states:
+        lines.append(f'periodic_task_runs_total{{task="{state.name}"}} {state.run_count or 0}')
+    lines.extend(
+        [
+            "# HELP periodic_task_failures_total Scheduler task runs that raised.",
+            "# TYPE periodic_task_failures_total counter",
+        ]
+    )
+    for state in states:
+        lines.append(f'periodic_task_failures_total{{task="{state.name}"}} {state.failure_count or 0}')
+    lines.extend(
+        [
+            "# HELP periodic_task_overruns_total Scheduler task runs that took longer than their interval.",
+            "# TYPE periodic_task_overruns_total counter",
+        ]
+    )
+    for state in states:
+        lines.append(f'periodic_task_overruns_total{{task="{state.name}"}} {state.overrun_count or 0}')
+    lines.extend(
+        [
+            "# HELP periodic_task_last_duration_seconds Duration of the latest run.",
+            "# TYPE periodic_task_last_duration_seconds gauge",
+        ]
+    )
+    for state in states:
+        duration = (state.last_duration_ms or 0) / 1000
+        lines.append(f'periodic_task_last_duration_seconds{{task="{state.name}"}} {duration:g}')
+    lines.extend(
+        [
+            "# HELP periodic_task_last_success_timestamp_seconds Finish time of the latest run.",
+            "# TYPE periodic_task_last_success_timestamp_seconds gauge",
+        ]
+    )
+    for state in states:
+        if state.last_finished_at is not None and state.last_status == "done":
+            lines.append(
+                f'periodic_task_last_success_timestamp_seconds{{task="{state.name}"}} '
+                f"{int(state.last_finished_at.timestamp())}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def build_worker_scheduler() -> PeriodicScheduler:
+    """Periodic tasks of the CRM worker; each runs on a single replica at a time."""
+    from src.config import settings
+    from src.services.followup_service import reconcile_followup_jobs
+    from src.services.funnel_rollup_service import compact_funnel_rollups
+    from src.services.whatsapp.evolution_monitor_service import evolution_monitor_service
+
+    jitter = max(0, settings.scheduler_jitter_seconds)
+    return PeriodicScheduler(
+        tasks=[
+            PeriodicTask(
+                name="followup_reconcile",
+                func=reconcile_followup_jobs,
+                interval_seconds=max(60, settings.followup_reconcile_interval_seconds),
+                jitter_seconds=jitter,
+                # Let the rest of the worker initialize first
+                initial_delay_seconds=30,
+            ),
+            PeriodicTask(
+                name="evolution_monitor",
+                func=evolution_monitor_service.check_once,
+                interval_seconds=max(15, int(settings.evolution_monitor_interval_seconds)),
+                jitter_seconds=jitter,
+            ),
+            PeriodicTask(
+                name="funnel_rollup_compaction",
+                func=compact_funnel_rollups,
+                interval_seconds=max(60, settings.analytics_rollup_interval_seconds),
+                jitter_seconds=jitter,
+                initial_delay_seconds=60,
+            ),
+        ],
+        lock_retry_seconds=max(1, settings.scheduler_lock_retry_seconds),
+    )
@@ -1,4 +1,5 @@
 from typing import Any
+import asyncio
 import logging
 
 import httpx
@@ -25,6 +26,9 @@ SENSITIVE_KEYS = {
 
 
 class PostHogService:
+    def __init__(self) -> None:
+        self._pending: set[asyncio.Task] = set()
+
     def is_enabled(self) -> bool:
         return bool(settings.posthog_enabled and settings.posthog_project_api_key)
 
@@ -63,6 +67,20 @@ class PostHogService:
         except httpx.HTTPError as exc:
             logger.warning("PostHog capture failed for %s: %s", event, exc)
 
+    def capture_in_background(
+        self,
+        distinct_id: str,
+        event: str,
+        properties: dict[str, Any] | None = None,
+    ) -> None:
+        """Forward an event without making the caller wait for PostHog."""
+        if not self.is_enabled():
+            return
+        task = asyncio.create_task(self.capture(distinct_id=distinct_id, event=event, properties=properties))
+        # The loop keeps only weak references to tasks
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
     def _sanitize(self, value: Any) -> Any:
         if isinstance(value, dict):
             clean: dict[str, Any] = {}
@@ -0,0 +1,68 @@
+"""Short-lived cache of authenticated users for API requests.
+
+Entries are keyed by user id and the token's auth version (`ver` claim), so every
+polling request within the TTL resolves its user without a database round trip.
+Role changes bump `User.auth_version`: the process that made the change drops its
+entry at once, other API processes within `auth_principal_cache_ttl_seconds`,
+after which tokens minted before the change are refused and the client refreshes.
+"""
+import time
+import uuid
+from typing import Any, Optional
+
+from src.config import settings
+from src.models import User
+
+# Cached column values; the password hash is never needed to authorize a request
+_PRINCIPAL_COLUMNS = tuple(column.key for column in User.__table__.columns if column.key != "password_hash")
+
+
+class PrincipalCache:
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, int], tuple[float, dict[str, Any]]] = {}
+
+    def get(self, user_id: uuid.UUID | str, auth_version: int) -> Optional[User]:
+        """A fresh transient User for the cached principal, or None on a miss."""
+        key = (str(user_id), auth_version)
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        expires_at, values = cached
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        # Each request gets its own instance; nothing is shared between sessions
+        return User(**values)
+
+    def set(self, user: User) -> None:
+        ttl = settings.auth_principal_cache_ttl_seconds
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        values = {name: getattr(user, name) for name in _PRINCIPAL_COLUMNS}
+        self._entries[(str(user.id), user.auth_version or 0)] = (now + ttl, values)
+
+    def invalidate(self, user_id: uuid.UUID | str) -> None:
+        key = str(user_id)
+        for cached_key in [cached_key for cached_key in self._entries if cached_key[0] == key]:
+            self._entries.pop(cached_key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def revoke_principal(user: User) -> None:
+    """Retire the user's current tokens and cached principal after a permission change.
+
+    Call before committing the change; the new version is stored with it.
+    """
+    user.auth_version = (user.auth_version or 0) + 1
+    principal_cache.invalidate(user.id)
@@ -6,10 +6,9 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 import json
-import re
 import uuid
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Lead, LeadStatus
@@ -24,7 +23,6 @@ class QuizLeadUpsertResult:
 
 
 class QuizLeadDeduplicationService:
-    PHONE_DIGITS_RE = re.compile(r"\D+")
     TERMINAL_SKIP_STATUSES = {LeadStatus.SPAM.value}
 
     async def create_or_update(
@@ -189,10 +187,6 @@ class QuizLeadDeduplicationService:
     def clean_phone(cls, phone: str | None) -> str | None:
         return phone.strip() if phone and phone.strip() else None
 
-    @classmethod
-    def phone_digits(cls, phone: str | None) -> str:
-        return cls.PHONE_DIGITS_RE.sub("", phone or "")
-
     @staticmethod
     def clean_username(username: str | None) -> str | None:
         if not username:
@@ -256,8 +250,7 @@ class QuizLeadDeduplicationService:
             select(Lead)
             .where(
                 Lead.org_id == org_id,
-                Lead.extracted_data.is_not(None),
-                Lead.extracted_data.contains(session_token),
+                Lead.quiz_session_token == session_token,
                 Lead.status.notin_(self.TERMINAL_SKIP_STATUSES),
             )
             .order_by(Lead.created_at.desc())
@@ -279,12 +272,10 @@ class QuizLeadDeduplicationService:
         return result.scalar_one_or_none()
 
     async def _find_by_phone(self, *, db: AsyncSession, org_id: uuid.UUID, phone: str) -> Lead | None:
-        digits = self.phone_digits(phone)
         conditions = [Lead.phone == phone]
-        if digits:
-            conditions.append(func.regexp_replace(Lead.phone, r"\D", "", "g") == digits)
-        if len(digits) >= 10:
-            conditions.append(Lead.phone.ilike(f"%{digits[-10:]}%"))
+        digits_filter = lead_service.phone_lookup_filter(phone)
+        if digits_filter is not None:
+            conditions.append(digits_filter)
 
         result = await db.execute(
             select(Lead)
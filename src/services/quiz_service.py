@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import ChatMessage, FunnelSession, Lead, LeadStatus
 from src.models.funnel import FunnelEvent
-from src.schemas.analytics import FunnelSessionCreate
+from src.schemas.analytics import FunnelEventBatchItem, FunnelSessionCreate
 from src.schemas.quiz import QuizContactCaptureRequest, QuizSubmitRequest, MeasurementBookingRequest
 from src.services.analytics_service import analytics_service
 from src.services.cal_pro_service import cal_pro_service
@@ -60,38 +60,33 @@ class QuizService:
         session.last_event_at = session.completed_at
         await db.commit()
 
-        await analytics_service.record_event(
-            db=db,
-            session_token=session_token,
-            event_type="contact_submitted",
-            step_id="contact",
-            event_data={
-                "name": payload.contact.name,
-                "preferred_messenger": payload.contact.preferred_messenger,
-            },
-        )
-        await analytics_service.record_event(
-            db=db,
-            session_token=session_token,
-            event_type="lead_created" if lead_result.created else "lead_updated",
-            step_id="crm",
-            event_data={"lead_id": str(lead.id), "deduplicated": not lead_result.created},
-        )
+        events = [
+            FunnelEventBatchItem(
+                event_type="contact_submitted",
+                step_id="contact",
+                event_data={
+                    "name": payload.contact.name,
+                    "preferred_messenger": payload.contact.preferred_messenger,
+                },
+            ),
+            FunnelEventBatchItem(
+                event_type="lead_created" if lead_result.created else "lead_updated",
+                step_id="crm",
+                event_data={"lead_id": str(lead.id), "deduplicated": not lead_result.created},
+            ),
+        ]
         if payload.design_project_file_url:
-            await analytics_service.record_event(
-                db=db,
-                session_token=session_token,
-                event_type="design_file_uploaded",
-                step_id="design",
-                event_data={"url": payload.design_project_file_url},
+            events.append(
+                FunnelEventBatchItem(
+                    event_type="design_file_uploaded",
+                    step_id="design",
+                    event_data={"url": payload.design_project_file_url},
+                )
             )
-        await analytics_service.record_event(
-            db=db,
-            session_token=session_token,
-            event_type="quiz_completed",
-            step_id="complete",
-            event_data={"lead_id": str(lead.id)},
+        events.append(
+            FunnelEventBatchItem(event_type="quiz_completed", step_id="complete", event_data={"lead_id": str(lead.id)})
         )
+        await analytics_service.record_events(db=db, session_token=session_token, events=events)
         await self._notify_quiz_hot_lead_if_needed(db=db, lead=lead, payload=payload)
 
         slots = []
@@ -272,6 +267,8 @@ class QuizService:
                     not quiz_lead.last_message_at or telegram_lead.last_message_at > quiz_lead.last_message_at
                 ):
                     quiz_lead.last_message_at = telegram_lead.last_message_at
+                    quiz_lead.last_message_direction = telegram_lead.last_message_direction
+                    quiz_lead.last_message_sender_name = telegram_lead.last_message_sender_name
                 quiz_lead.unread_count = (quiz_lead.unread_count or 0) + (telegram_lead.unread_count or 0)
                 telegram_lead.telegram_id = None
                 telegram_lead.telegram_lookup_status = "not_checked"
@@ -398,6 +395,8 @@ class QuizService:
                     not lead.last_message_at or existing.last_message_at > lead.last_message_at
                 ):
                     lead.last_message_at = existing.last_message_at
+                    lead.last_message_direction = existing.last_message_direction
+                    lead.last_message_sender_name = existing.last_message_sender_name
                 lead.unread_count = (lead.unread_count or 0) + (existing.unread_count or 0)
                 existing.telegram_id = None
                 existing.telegram_lookup_status = "not_checked"
@@ -725,6 +724,8 @@ class QuizService:
                 },
                 max_attempts=2,
                 run_at=datetime.now(timezone.utc) + timedelta(minutes=delay),
+                # One follow-up per quiz session, however often the exit capture is resubmitted
+                dedup_key=f"quiz_abandoned_telegram_followup:{session.session_token}",
             )
         except Exception:
             import logging
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class AsyncRateLimiter:
+    """Keyed token buckets; `acquire` waits for a token instead of failing.
+
+    Limits are per process. Each key gets `rate` tokens per `per_seconds` with bursts
+    up to `burst` (defaults to `rate`). Keys whose bucket has refilled completely are
+    dropped every `sweep_interval_seconds`; a full bucket is what a new key starts with,
+    so per-chat keys do not accumulate for the life of the process.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per_seconds: float = 1.0,
+        burst: float | None = None,
+        sweep_interval_seconds: float = 60.0,
+    ) -> None:
+        self.rate = max(rate, 0.001) / max(per_seconds, 0.001)
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._buckets: dict[str, _Bucket] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_sweep = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _sweep(self, now: float) -> None:
+        self._last_sweep = now
+        for key, bucket in list(self._buckets.items()):
+            lock = self._locks.get(key)
+            if lock is not None and lock.locked():
+                continue
+            if bucket.tokens + (now - bucket.updated_at) * self.rate >= self.burst:
+                del self._buckets[key]
+                self._locks.pop(key, None)
+
+    def _refill(self, key: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(tokens=self.burst, updated_at=now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate)
+            bucket.updated_at = now
+        return bucket
+
+    async def acquire(self, key: str = "default") -> float:
+        """Take one token for `key`; returns the seconds spent waiting."""
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval_seconds:
+            self._sweep(now)
+        waited = 0.0
+        while True:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                if self._locks.get(key) is not lock:
+                    # Swept while this call waited for the lock; queue on the current one
+                    continue
+                while True:
+                    bucket = self._refill(key, time.monotonic())
+                    if bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        return waited
+                    delay = (1 - bucket.tokens) / self.rate
+                    waited += delay
+                    await asyncio.sleep(delay)
+
+    def penalize(self, key: str, seconds: float) -> None:
+        """Hold `key` back for `seconds`, e.g. after a FloodWait/RetryAfter from Telegram."""
+        bucket = self._refill(key, time.monotonic())
+        bucket.tokens = min(bucket.tokens, 0.0) - seconds * self.rate
@@ -0,0 +1,122 @@
+"""Short-lived cache of per-organization report results, shared across replicas via Redis.
+
+Keys embed the organization's data version, a Redis counter bumped by writes that change
+reports (funnel events, lead writes). A bump makes every cached result of the org
+unreachable at once; `report_cache_ttl_seconds` bounds staleness from writes that do not
+bump it, such as chat messages on the dashboard. Redis trouble never fails a request: the
+result is computed as if the cache were empty.
+
+The same version is the deletion signal of lead list ETags (delta_sync_service), so it is
+bumped even when the cache itself is disabled.
+"""
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import BaseModel
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+ReportT = TypeVar("ReportT", bound=BaseModel)
+
+KEY_PREFIX = "report_cache"
+# Outlives any cached result, so an expired counter can never resurrect an old entry
+VERSION_TTL_SECONDS = 86400
+
+
+class ReportCache:
+    def __init__(self) -> None:
+        self._client: Optional[redis_asyncio.Redis] = None
+
+    def _redis(self) -> redis_asyncio.Redis:
+        if self._client is None:
+            timeout = settings.report_cache_timeout_seconds
+            self._client = redis_asyncio.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout,
+            )
+        return self._client
+
+    @staticmethod
+    def _version_key(org_id: uuid.UUID | str) -> str:
+        return f"{KEY_PREFIX}:version:{org_id}"
+
+    @staticmethod
+    def _result_key(name: str, org_id: uuid.UUID | str, version: str, params: dict[str, Any]) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"{KEY_PREFIX}:{name}:{org_id}:{version}:{digest}"
+
+    async def get_or_compute(
+        self,
+        name: str,
+        org_id: uuid.UUID,
+        params: dict[str, Any],
+        model: type[ReportT],
+        compute: Callable[[], Awaitable[ReportT]],
+    ) -> ReportT:
+        """The cached report for this org and filter set, computing and storing it on a miss."""
+        ttl = settings.report_cache_ttl_seconds
+        if ttl <= 0:
+            return await compute()
+        key = None
+        try:
+            client = self._redis()
+            version = await client.get(self._version_key(org_id)) or "0"
+            key = self._result_key(name, org_id, version, params)
+            cached = await client.get(key)
+            if cached is not None:
+                return model.model_validate_json(cached)
+        except (RedisError, OSError, ValueError) as exc:
+            logger.warning("[REPORT_CACHE] Read of %s failed, computing: %s", name, exc)
+
+        result = await compute()
+        if key is not None:
+            try:
+                await self._redis().set(key, result.model_dump_json(), ex=ttl)
+            except (RedisError, OSError) as exc:
+                logger.warning("[REPORT_CACHE] Write of %s failed: %s", name, exc)
+        return result
+
+    async def version(self, org_id: uuid.UUID | str) -> Optional[str]:
+        """The org's data version, or None when Redis is unavailable.
+
+        A missing counter (never bumped, expired or evicted) is seeded with the current time
+        in milliseconds rather than starting again from zero, so a version is never reused.
+        """
+        try:
+            client = self._redis()
+            key = self._version_key(org_id)
+            version = await client.get(key)
+            if version is None:
+                await client.set(key, str(int(time.time() * 1000)), ex=VERSION_TTL_SECONDS, nx=True)
+                version = await client.get(key)
+            return version
+        except (RedisError, OSError) as exc:
+            logger.warning("[REPORT_CACHE] Version read for org %s failed: %s", org_id, exc)
+            return None
+
+    async def bump(self, org_id: uuid.UUID | str | None) -> None:
+        """Retire every cached report of the org; call after committing a write."""
+        if org_id is None:
+            return
+        try:
+            client = self._redis()
+            key = self._version_key(org_id)
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, VERSION_TTL_SECONDS)
+                await pipe.execute()
+        except (RedisError, OSError) as exc:
+            logger.warning("[REPORT_CACHE] Version bump for org %s failed: %s", org_id, exc)
+
+
+report_cache = ReportCache()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+from src.models.lead_data import lead_data
 from src.services.sales_intent_service import SalesIntent, sales_intent_service
 from src.services.sales_strategy_service import SalesStrategy, sales_strategy_service
 
@@ -60,7 +60,7 @@ class SalesOrchestrationService:
         data["conversation_mode"] = plan.intent.name
         data["conversation_mode_reason"] = source_text[:300]
         data["conversation_mode_updated_at"] = now
-        lead.extracted_data = json.dumps(data, ensure_ascii=False)
+        lead_data(lead).replace(data)
         return data
 
     def _prompt_block(self, *, intent: SalesIntent, strategy: SalesStrategy) -> str:
@@ -104,14 +104,7 @@ class SalesOrchestrationService:
         return None
 
     def _lead_data(self, lead) -> dict[str, Any]:
-        raw = getattr(lead, "extracted_data", None)
-        if not raw:
-            return {}
-        try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError:
-            return {}
-        return parsed if isinstance(parsed, dict) else {}
+        return lead_data(lead).copy()
 
 
 sales_orchestration_service = SalesOrchestrationService()
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import Any
 
+from src.models.lead_data import lead_data
 from src.services.sales_intent_service import SalesIntent
 
 
@@ -138,14 +138,7 @@ class SalesStrategyService:
         return price
 
     def _lead_data(self, lead) -> dict[str, Any]:
-        raw = getattr(lead, "extracted_data", None)
-        if not raw:
-            return {}
-        try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError:
-            return {}
-        return parsed if isinstance(parsed, dict) else {}
+        return lead_data(lead).data
 
     def _budget_fit(self, *, budget_rub: int | None, price_lo: int | None, price_hi: int | None) -> str:
         if not budget_rub:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from aiogram.types import Message
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.utils import get_default_org_id
@@ -65,18 +65,10 @@ class TelegramBusinessAuthorMessageService:
         if lead:
             return lead
 
-        chat_id_text = str(chat_id)
+        # chat_id is stored as a number or a string; the generated column holds its text
         result = await db.execute(
             select(Lead)
-            .where(
-                Lead.org_id == org_id,
-                Lead.extracted_data.isnot(None),
-                or_(
-                    Lead.extracted_data.contains(f'"chat_id": {chat_id_text}'),
-                    Lead.extracted_data.contains(f'"chat_id":"{chat_id_text}"'),
-                    Lead.extracted_data.contains(f'"chat_id": "{chat_id_text}"'),
-                ),
-            )
+            .where(Lead.org_id == org_id, Lead.telegram_business_chat_id == str(chat_id))
             .order_by(*ordering)
             .limit(1)
         )
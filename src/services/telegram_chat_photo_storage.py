@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import base64
 import os
 import tempfile
 
 from aiogram.types import Message
 
+from src.services.cpu_executor import run_cpu
+from src.services.cpu_tasks import read_file_base64
 from src.services.telegram_chat_media_storage import StoredTelegramChatMedia, telegram_chat_media_storage
 
 
@@ -28,8 +29,7 @@ class TelegramChatPhotoStorage:
                 temp_path = tmp.name
             await bot.download_file(file_info.file_path, destination=temp_path)
 
-            with open(temp_path, "rb") as photo_file:
-                image_base64 = base64.b64encode(photo_file.read()).decode("utf-8")
+            image_base64 = await run_cpu(read_file_base64, temp_path)
 
             media = telegram_chat_media_storage.save_photo_file(temp_path)
             return StoredTelegramPhoto(media, image_base64)
@@ -6,7 +6,9 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.models import Lead, MessageStatus
+from src.services.rate_limiter import AsyncRateLimiter
 from src.services.user_bot_service import user_bot_service
 
 
@@ -19,6 +21,43 @@ class TelegramDeliveryResult:
 
 
 class TelegramDeliveryService:
+    def __init__(self) -> None:
+        # Bot API: ~30 messages/s per bot overall and ~1 message/s per chat
+        self.bot_limiter = AsyncRateLimiter(max(1, settings.telegram_bot_max_messages_per_second))
+        self.chat_limiter = AsyncRateLimiter(1, per_seconds=1.0)
+        # User accounts hit FloodWait far sooner than bots do
+        self.userbot_limiter = AsyncRateLimiter(
+            max(1, settings.telegram_userbot_max_messages_per_minute),
+            per_seconds=60.0,
+            burst=3,
+        )
+
+    def channel_for(self, lead: Lead) -> str:
+        if self._business_chat_data(lead):
+            return "telegram_business_bot"
+        if lead.source in {"userbot", "CRM"}:
+            return "telegram_userbot"
+        return "telegram_bot"
+
+    async def _throttle(self, lead: Lead, channel: str) -> None:
+        if channel == "telegram_userbot":
+            await self.userbot_limiter.acquire(f"userbot:{lead.org_id}")
+        else:
+            await self.bot_limiter.acquire("bot")
+        await self.chat_limiter.acquire(f"chat:{lead.telegram_id}")
+
+    def _penalize_flood(self, lead: Lead, channel: str, exc: BaseException) -> None:
+        cause = exc
+        while cause is not None:
+            wait_seconds = getattr(cause, "retry_after", None) or getattr(cause, "seconds", None)
+            if wait_seconds and ("Flood" in type(cause).__name__ or "RetryAfter" in type(cause).__name__):
+                if channel == "telegram_userbot":
+                    self.userbot_limiter.penalize(f"userbot:{lead.org_id}", float(wait_seconds))
+                else:
+                    self.bot_limiter.penalize("bot", float(wait_seconds))
+                return
+            cause = cause.__cause__ or cause.__context__
+
     async def send_text(
         self,
         db: AsyncSession,
@@ -29,6 +68,21 @@ class TelegramDeliveryService:
         if not lead.telegram_id:
             raise ValueError("lead_has_no_telegram")
 
+        channel = self.channel_for(lead)
+        await self._throttle(lead, channel)
+        try:
+            return await self._send_text(db, lead=lead, text=text)
+        except Exception as exc:
+            self._penalize_flood(lead, channel, exc)
+            raise
+
+    async def _send_text(
+        self,
+        db: AsyncSession,
+        *,
+        lead: Lead,
+        text: str,
+    ) -> TelegramDeliveryResult:
         business_chat = self._business_chat_data(lead)
         if business_chat:
             message_id = await self._send_business_bot_text(
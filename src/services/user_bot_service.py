@@ -288,15 +288,14 @@ class UserBotService:
                 # Download and encode for vision
                 temp_path = None
                 try:
-                    import base64
                     import tempfile
                     import os
+                    from src.services.cpu_executor import run_cpu
+                    from src.services.cpu_tasks import read_file_base64
                     with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
                         temp_path = tmp.name
                     await client.download_media(event.message, file=temp_path)
-                    with open(temp_path, "rb") as f:
-                        image_bytes = f.read()
-                        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+                    image_base64 = await run_cpu(read_file_base64, temp_path)
                     from src.services.telegram_chat_media_storage import telegram_chat_media_storage
                     stored_media = telegram_chat_media_storage.save_photo_file(temp_path)
                     if stored_media:
@@ -477,7 +476,7 @@ class UserBotService:
                         logger.warning(f"RAG search failed (non-critical): {rag_err}")
                     
                     # 6. Get conversation history
-                    history_msgs, _ = await chat_service.get_chat_history(db, lead.id, page_size=20)
+                    history_msgs, _ = await chat_service.get_chat_history(db, lead.id, page_size=20, include_total=False)
                     
                     formatted_history = []
                     for m in reversed(history_msgs):
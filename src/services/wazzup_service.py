@@ -6,11 +6,12 @@ from dataclasses import dataclass
 from typing import Any, Optional
 
 import httpx
-from sqlalchemy import and_, desc, or_, select
+from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.models import ChatMessage, Lead, MessageDirection, MessageStatus, MessageTransport
+from src.services.lead_service import lead_service
 
 logger = logging.getLogger(__name__)
 
@@ -213,10 +214,7 @@ class WazzupService:
                 and_(
                     Lead.org_id == org_id,
                     Lead.phone.is_not(None),
-                    or_(
-                        Lead.phone.ilike(f"%{digits}%"),
-                        Lead.phone.ilike(f"%{tail10}%"),
-                    ),
+                    lead_service.phone_lookup_filter(digits),
                 )
             )
             .order_by(desc(Lead.updated_at))
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 import base64
-import io
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from src.config import settings
+from src.services.cpu_executor import run_cpu
+from src.services.cpu_tasks import render_qr_png
 from src.services.whatsapp.evolution_client import EvolutionError, evolution_client
 
 logger = logging.getLogger(__name__)
@@ -132,7 +132,7 @@ class EvolutionMonitorService:
             logger.warning("Evolution auth QR payload has no code: %s", payload)
             return payload
 
-        qr_png = self._render_qr_png(code)
+        qr_png = await self._render_qr_png(code)
         if not qr_png:
             return payload
         return {**payload, "qr_png": qr_png}
@@ -170,40 +170,12 @@ class EvolutionMonitorService:
                 return str(value)
         return None
 
-    def _render_qr_png(self, code: str) -> bytes | None:
+    async def _render_qr_png(self, code: str) -> bytes | None:
         try:
-            import qrcode
-
-            image = qrcode.make(code)
-            output = io.BytesIO()
-            image.save(output, format="PNG")
-            return output.getvalue()
+            return await run_cpu(render_qr_png, code)
         except Exception:
             logger.warning("Failed to render Evolution auth QR", exc_info=True)
             return None
 
 
 evolution_monitor_service = EvolutionMonitorService()
-
-
-async def start_evolution_monitor_loop(stop_event: asyncio.Event | None = None) -> None:
-    stop_event = stop_event or asyncio.Event()
-    logger.info(
-        "Evolution monitor loop started (enabled=%s interval=%ss)",
-        settings.evolution_monitor_enabled,
-        settings.evolution_monitor_interval_seconds,
-    )
-
-    while not stop_event.is_set():
-        try:
-            await evolution_monitor_service.check_once()
-        except Exception:
-            logger.error("Evolution monitor loop failed", exc_info=True)
-
-        try:
-            await asyncio.wait_for(
-                stop_event.wait(),
-                timeout=max(15, int(settings.evolution_monitor_interval_seconds)),
-            )
-        except asyncio.TimeoutError:
-            continue
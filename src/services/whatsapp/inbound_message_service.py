@@ -4,7 +4,7 @@ import json
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import and_, desc, or_, select
+from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.utils import get_default_org_id
@@ -13,6 +13,7 @@ from src.services.analytics_service import analytics_service
 from src.services.chat_service import chat_service
 from src.services.estimate_request_service import estimate_request_service
 from src.services.lead_audit_service import lead_audit_service
+from src.services.lead_service import lead_service
 from src.services.quiz_service import quiz_service
 from src.services.whatsapp.audio_transcription_service import whatsapp_audio_transcription_service
 from src.services.whatsapp.phone import normalize_phone, normalize_phone_digits
@@ -156,7 +157,7 @@ class WhatsAppInboundMessageService:
                 and_(
                     Lead.org_id == org_id,
                     Lead.phone.is_not(None),
-                    or_(Lead.phone.ilike(f"%{digits}%"), Lead.phone.ilike(f"%{tail10}%")),
+                    lead_service.phone_lookup_filter(digits),
                 )
             )
             .order_by(desc(Lead.updated_at))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import re
+from src.models.lead import canonical_phone_digits
 
 
 def normalize_phone(value: str | None) -> str | None:
@@ -18,13 +18,7 @@ def normalize_phone_digits(value: str | None) -> str | None:
     raw = str(value)
     if "@" in raw:
         raw = raw.split("@", 1)[0]
-    digits = re.sub(r"\D", "", raw)
-    if not digits:
-        return None
-    if len(digits) == 11 and digits.startswith("8"):
-        digits = "7" + digits[1:]
-    if len(digits) == 10:
-        digits = "7" + digits
-    if len(digits) < 10:
+    digits = canonical_phone_digits(raw)
+    if not digits or len(digits) < 10:
         return None
     return digits
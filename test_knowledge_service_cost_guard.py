@@ -3,6 +3,7 @@ import asyncio
 import uuid
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import AsyncMock
 
 
@@ -14,14 +15,16 @@ def _load_knowledge_service_class():
     ast.fix_missing_locations(module)
 
     namespace = {
+        "uuid": uuid,
         "List": list,
-        "Optional": object,
+        "Optional": Optional,
         "AsyncSession": object,
         "KnowledgeItem": SimpleNamespace(
             id="id",
             org_id="org_id",
             lead_id="lead_id",
             category="category",
+            embedding_model="embedding_model",
             embedding=SimpleNamespace(cosine_distance=lambda _embedding: 0),
             content="content",
         ),
@@ -46,13 +49,19 @@ class FakeStatement:
     def order_by(self, *args, **kwargs):
         return self
 
+    def group_by(self, *args, **kwargs):
+        return self
+
     def limit(self, *args, **kwargs):
         return self
 
 
 class FakeEmptyCountResult:
-    def scalar_one(self):
-        return 0
+    def all(self):
+        return []
+
+    def first(self):
+        return None
 
 
 class FakeDb:
@@ -10,6 +10,8 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock
 from zoneinfo import ZoneInfo
 
+from src.models.lead_data import lead_data
+
 
 def _load_quiz_value_normalizer():
     module_path = Path(__file__).parent / "src" / "services" / "quiz_value_normalizer.py"
@@ -39,6 +41,7 @@ def _load_lead_handler_functions():
     namespace = {
         "asyncio": asyncio,
         "json": json,
+        "lead_data": lead_data,
         "re": re,
         "datetime": datetime,
         "timezone": timezone,
@@ -27,7 +27,6 @@ def _load_followup_constant(name: str):
 
 PROMPTS = _load_prompts_module()
 MAX_FOLLOWUPS = _load_followup_constant("MAX_FOLLOWUPS")
-CHECK_INTERVAL = _load_followup_constant("CHECK_INTERVAL")
 STAGE_FOLLOWUP_THRESHOLDS = _load_followup_constant("STAGE_FOLLOWUP_THRESHOLDS")
 
 
@@ -75,10 +74,6 @@ def test_measurement_slot_followup_starts_without_stretching_deal():
     assert 2 <= first_followup_hours <= 3
 
 
-def test_followup_loop_checks_often_after_stage_threshold():
-    assert CHECK_INTERVAL <= 5 * 60
-
-
 def test_followup_contract_stops_after_three_touches():
     assert MAX_FOLLOWUPS == 3
 
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+from src.services.rate_limiter import AsyncRateLimiter
+
+
+def test_acquire_paces_calls_after_the_burst():
+    limiter = AsyncRateLimiter(20, per_seconds=1.0, burst=2)
+
+    async def scenario() -> float:
+        started = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire("bot")
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+
+    # two tokens from the burst, two more at 20/s
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_keys_are_independent_and_penalty_delays_only_its_key():
+    limiter = AsyncRateLimiter(100, per_seconds=1.0, burst=1)
+
+    async def scenario() -> tuple[float, float]:
+        limiter.penalize("userbot:org-1", 0.2)
+        started = time.monotonic()
+        await limiter.acquire("userbot:org-2")
+        other = time.monotonic() - started
+        await limiter.acquire("userbot:org-1")
+        return other, time.monotonic() - started
+
+    other, penalized = asyncio.run(scenario())
+
+    assert other < 0.05
+    assert penalized >= 0.19
+
+
+def test_idle_refilled_keys_are_swept():
+    limiter = AsyncRateLimiter(1000, per_seconds=1.0, burst=1, sweep_interval_seconds=0.05)
+
+    async def scenario() -> None:
+        for chat_id in range(50):
+            await limiter.acquire(f"chat:{chat_id}")
+        limiter.penalize("chat:held", 60)
+        await asyncio.sleep(0.06)
+        await limiter.acquire("chat:new")
+
+    asyncio.run(scenario())
+
+    # refilled chats are gone; the penalized one keeps its debt
+    assert len(limiter) == 2
+    assert limiter._buckets["chat:held"].tokens < 0